@@ -0,0 +1,61 @@
+import os
+import random
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame as pg  # noqa: E402
+
+from scripts.objects import BulletPool  # noqa: E402
+from scripts.utilities import load_image  # noqa: E402
+
+
+FRAMES = 120
+
+
+def bench(count: int, screen: pg.Surface, image: pg.Surface) -> tuple:
+    bounds = screen.get_rect()
+    pool = BulletPool(image, 4)
+    targets = [
+        pg.Rect(random.randrange(0, 1240), random.randrange(0, 660), 40, 60)
+        for _ in range(8)
+    ]
+
+    update = collide = draw = 0.0
+    for _ in range(FRAMES):
+        while len(pool) < count:
+            pool.spawn(
+                (random.uniform(200, 1080), random.uniform(150, 570)),
+                random.uniform(0, 360),
+            )
+
+        start = time.perf_counter()
+        pool.update(bounds, 1)
+        update += time.perf_counter() - start
+
+        start = time.perf_counter()
+        hits, _ = pool.collide(targets)
+        pool.kill(hits)
+        collide += time.perf_counter() - start
+
+        start = time.perf_counter()
+        pool.draw(screen)
+        draw += time.perf_counter() - start
+
+    return tuple(t / FRAMES * 1000 for t in (update, collide, draw))
+
+
+def main() -> None:
+    random.seed(0)
+    pg.init()
+    screen = pg.display.set_mode((1280, 720))
+    image = load_image("bullet.png", "white", scale=2)
+
+    print(f"{'bullets':>8} {'update':>8} {'collide':>8} {'draw':>8} (ms)")
+    for count in (100, 1000, 5000):
+        update, collide, draw = bench(count, screen, image)
+        print(f"{count:>8} {update:>8.3f} {collide:>8.3f} {draw:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import math  # noqa: E402
+import time  # noqa: E402
+
+import numpy as np  # noqa: E402
+import pygame as pg  # noqa: E402
+
+from scripts.game import Game  # noqa: E402
+from scripts.renderer import DirtyRenderer  # noqa: E402
+from scripts.utilities import load_image  # noqa: E402
+
+
+MATRIX_PATH = os.path.join("assets", "pathfinding_grid.npy")
+FRAMES = 200
+ENEMIES_PER_SCREEN = 40
+
+
+def unculled(game: Game, display: pg.Surface) -> list[pg.Rect]:
+    x, y = game.camera.offset
+    rects = []
+    for sprite in game.all_sprites:
+        rect = sprite.rect.move(x, y)
+        game.render_queue.add(sprite.image, rect)
+        rects.append(rect)
+
+    blits, bullet_rects = game.bullets.blits()
+    game.render_queue.extend(
+        [(image, (dx + x, dy + y)) for image, (dx, dy) in blits]
+    )
+    game.render_queue.flush(display)
+    return rects + bullet_rects
+
+
+def culled(game: Game, display: pg.Surface) -> list[pg.Rect]:
+    return game.render(display)
+
+
+def measure(
+    game: Game, renderer: DirtyRenderer, display: pg.Surface, render
+) -> float:
+    center = pg.Vector2(game.bg_rect.center)
+    radius = min(game.bg_rect.size) / 3
+    elapsed = 0.0
+    for frame in range(FRAMES):
+        angle = frame / FRAMES * math.tau
+        game.player.position.update(
+            center + pg.Vector2(radius, 0).rotate_rad(angle)
+        )
+        game.camera.follow(game.player.position)
+
+        start = time.perf_counter()
+        renderer.scroll_to(game.camera.viewport.topleft)
+        renderer.restore()
+        renderer.previous = render(game, display)
+        elapsed += time.perf_counter() - start
+    return elapsed / FRAMES
+
+
+def main() -> None:
+    pg.init()
+    screen = pg.display.set_mode((1280, 720))
+    matrix = np.load(MATRIX_PATH)
+    background = load_image("background.png", "white", scale=8)
+
+    print(
+        f"{'world':>11} {'enemies':>8} {'unculled':>10} {'culled':>8} "
+        f"{'speedup':>8}"
+    )
+    for repeat in (1, 2, 4, 8):
+        world_rect = pg.Rect(
+            0,
+            0,
+            background.get_width() * repeat,
+            background.get_height() * repeat,
+        )
+        game = Game(
+            np.tile(matrix, (repeat, repeat)),
+            32,
+            18,
+            40 * repeat,
+            40 * repeat,
+            screen,
+            -1000,
+            world_rect,
+        )
+        game.path_scheduler.stop()
+        game.spawn_enemies(ENEMIES_PER_SCREEN * repeat * repeat - 1)
+        for i in range(60 * repeat * repeat):
+            game.bullets.spawn(
+                game.walkability.random_position((0, 0), (1, 1), 0), i * 6
+            )
+
+        renderer = DirtyRenderer(screen, background)
+        old = measure(game, renderer, screen, unculled)
+        new = measure(game, renderer, screen, culled)
+        print(
+            f"{world_rect.w:>5}x{world_rect.h:<5} {len(game.enemies):>8} "
+            f"{old * 1000:>8.3f}ms {new * 1000:>6.3f}ms {old / new:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+import os
+import time
+
+import numpy as np
+import pygame as pg
+
+from pathfinding.core.grid import Grid
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.finder.a_star import AStarFinder
+
+from scripts.dstar_lite import DStarLite
+from scripts.pathfinder import Pathfinder
+from scripts.walkability import WalkabilityIndex
+
+
+MATRIX_PATH = os.path.join("assets", "pathfinding_grid.npy")
+TILE_X, TILE_Y = 32, 18
+FRAMES = 600
+PLAYER_STEP = 4
+ENEMY_STEP = 8
+
+
+def player_walk(matrix, walkability: WalkabilityIndex, frames: int) -> list:
+    finder = Pathfinder(matrix)
+    walk = []
+    while len(walk) < frames:
+        start, end = walkability.sample((1, 1), 2) // (TILE_X, TILE_Y)
+        for node in finder.find_path(tuple(start), tuple(end)):
+            walk += [tuple(node)] * PLAYER_STEP
+    return walk[:frames]
+
+
+def chase(matrix, enemies: np.ndarray, walk: list) -> tuple:
+    planners = [DStarLite(matrix) for _ in enemies]
+    tiles = [tuple(tile) for tile in enemies.tolist()]
+    queries = []
+
+    start = time.perf_counter()
+    for frame, goal in enumerate(walk):
+        for index, planner in enumerate(planners):
+            if planner.update(tiles[index], goal) or frame == 0:
+                queries.append((tiles[index], goal))
+            if frame % ENEMY_STEP == 0 and len(planner.path) > 1:
+                tiles[index] = tuple(planner.path[1])
+    elapsed = time.perf_counter() - start
+
+    return (
+        sum(planner.expansions for planner in planners),
+        sum(planner.resets for planner in planners),
+        elapsed,
+        queries,
+    )
+
+
+def bench_astar(matrix, queries: list) -> tuple[int, float]:
+    finder = AStarFinder(diagonal_movement=DiagonalMovement.always)
+    grid = Grid(matrix=matrix)
+
+    expansions = 0
+    start = time.perf_counter()
+    for (start_x, start_y), (end_x, end_y) in queries:
+        grid.cleanup()
+        finder.find_path(
+            grid.node(start_x, start_y), grid.node(end_x, end_y), grid
+        )
+        expansions += finder.runs
+    return expansions, time.perf_counter() - start
+
+
+def bench_pathfinder(matrix, queries: list) -> tuple[int, float]:
+    finder = Pathfinder(matrix, jump_point=False)
+
+    start = time.perf_counter()
+    for query in queries:
+        finder.find_path(*query)
+    return finder.expansions, time.perf_counter() - start
+
+
+def main() -> None:
+    matrix = np.load(MATRIX_PATH)
+    bounds = pg.Rect(0, 0, matrix.shape[1] * TILE_X, matrix.shape[0] * TILE_Y)
+    walkability = WalkabilityIndex(matrix, TILE_X, TILE_Y, bounds, seed=0)
+    walk = player_walk(matrix, walkability, FRAMES)
+
+    print(f"chasing a scripted walk for {FRAMES} frames")
+    print(
+        f"{'enemies':>8} {'replans':>8} {'astar':>9} {'a* (ours)':>10} "
+        f"{'d* lite':>9} {'resets':>7} {'astar':>9} {'a* (ours)':>10} "
+        f"{'d* lite':>9}"
+    )
+    for count in (1, 10, 50):
+        enemies = walkability.sample((1, 1), count) // (TILE_X, TILE_Y)
+        expanded, resets, elapsed, queries = chase(matrix, enemies, walk)
+        astar, astar_time = bench_astar(matrix, queries)
+        ours, ours_time = bench_pathfinder(matrix, queries)
+        print(
+            f"{count:>8} {len(queries):>8} {astar:>9} {ours:>10} "
+            f"{expanded:>9} {resets:>7} {astar_time * 1000:>7.1f}ms "
+            f"{ours_time * 1000:>8.1f}ms {elapsed * 1000:>7.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import os
+import time
+
+import numpy as np
+import pygame as pg
+
+from pathfinding.core.grid import Grid
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.finder.a_star import AStarFinder
+
+from scripts.flow_field import FlowField
+from scripts.walkability import WalkabilityIndex
+
+
+MATRIX_PATH = os.path.join("assets", "pathfinding_grid.npy")
+TILE_X, TILE_Y = 32, 18
+FRAMES = 60
+
+
+def player_walk(walkability: WalkabilityIndex, frames: int) -> np.ndarray:
+    waypoints = walkability.sample((1, 1), frames // 10 + 2)
+    steps = np.linspace(0, 1, 10, endpoint=False)
+    walk = [
+        start + (end - start) * t
+        for start, end in zip(waypoints[:-1], waypoints[1:])
+        for t in steps
+    ]
+    return np.array(walk[:frames])
+
+
+def bench_astar(matrix, enemies: np.ndarray, walk: np.ndarray) -> float:
+    finder = AStarFinder(diagonal_movement=DiagonalMovement.always)
+    grids = [Grid(matrix=matrix) for _ in enemies]
+
+    start = time.perf_counter()
+    for target in walk:
+        end_x, end_y = int(target[0] // TILE_X), int(target[1] // TILE_Y)
+        for grid, pos in zip(grids, enemies):
+            grid.cleanup()
+            finder.find_path(
+                grid.node(int(pos[0] // TILE_X), int(pos[1] // TILE_Y)),
+                grid.node(end_x, end_y),
+                grid,
+            )
+    return time.perf_counter() - start
+
+
+def bench_flow_field(matrix, enemies: np.ndarray, walk: np.ndarray) -> float:
+    flow_field = FlowField(matrix, TILE_X, TILE_Y)
+    positions = [pg.Vector2(pos.tolist()) for pos in enemies]
+
+    start = time.perf_counter()
+    for target in walk:
+        flow_field.set_target(target)
+        for pos in positions:
+            flow_field.next_tile(pos)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    matrix = np.load(MATRIX_PATH)
+    bounds = pg.Rect(0, 0, matrix.shape[1] * TILE_X, matrix.shape[0] * TILE_Y)
+    walkability = WalkabilityIndex(matrix, TILE_X, TILE_Y, bounds, seed=0)
+    walk = player_walk(walkability, FRAMES)
+
+    print(f"chase cost over {FRAMES} frames (ms per frame)")
+    print(f"{'enemies':>8} {'astar':>10} {'flow field':>12}")
+    for count in (1, 50, 500):
+        enemies = walkability.sample((35, 60), count)
+        astar = bench_astar(matrix, enemies, walk) / FRAMES * 1000
+        flow = bench_flow_field(matrix, enemies, walk) / FRAMES * 1000
+        print(f"{count:>8} {astar:>10.3f} {flow:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import math
+import random
+import time
+
+import numpy as np
+
+from scripts.hierarchy import HierarchicalPathfinder
+from scripts.pathfinder import Pathfinder
+
+
+SIZES = (40, 128, 512, 2048)
+
+
+def path_cost(path) -> float:
+    return sum(
+        math.hypot(a.x - b.x, a.y - b.y) for a, b in zip(path, path[1:])
+    )
+
+
+def block_map(size: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    blocks = rng.random((-(-size // 4), -(-size // 4))) < 0.15
+    return ~np.kron(blocks, np.ones((4, 4), bool))[:size, :size]
+
+
+def long_queries(matrix: np.ndarray, count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    rows, cols = matrix.shape
+    span = max(min(rows, cols) // 4, 1)
+
+    queries = []
+    while len(queries) < count:
+        start = rng.randrange(span), rng.randrange(span)
+        end = cols - 1 - rng.randrange(span), rows - 1 - rng.randrange(span)
+        if matrix[start[1], start[0]] and matrix[end[1], end[0]]:
+            queries.append((start, end))
+    return queries
+
+
+def measure(size: int, count: int) -> dict[str, float]:
+    matrix = block_map(size)
+
+    hierarchy = HierarchicalPathfinder(matrix, min_distance=0)
+    start = time.perf_counter()
+    hierarchy.build()
+    built = time.perf_counter() - start
+
+    queries = long_queries(matrix, count)
+    exact = Pathfinder(matrix)
+
+    routed = first = refined = searched = 0.0
+    ratios = []
+    found = 0
+    for query in queries:
+        start = time.perf_counter()
+        route = hierarchy.route(*query)
+        routed += time.perf_counter() - start
+        if not route.remaining:
+            continue
+        found += 1
+
+        start = time.perf_counter()
+        path = route.next_segment()
+        first += time.perf_counter() - start
+
+        start = time.perf_counter()
+        while route.remaining:
+            path += route.next_segment()
+        refined += time.perf_counter() - start
+
+        start = time.perf_counter()
+        optimal = exact.find_path(*query)
+        searched += time.perf_counter() - start
+        ratios.append(path_cost(path) / path_cost(optimal))
+
+    found = max(found, 1)
+    return {
+        "build_s": built,
+        "clusters": hierarchy.built,
+        "nodes": len(hierarchy.xs),
+        "edges": sum(len(edges) for edges in hierarchy.edges),
+        "route_ms": routed / len(queries) * 1000,
+        "first_ms": first / found * 1000,
+        "refine_ms": refined / found * 1000,
+        "astar_ms": searched / found * 1000,
+        "ratio": max(ratios, default=math.nan),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Answer long queries on the abstract graph."
+    )
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    print(
+        f"{'map':>10} {'build':>8} {'clusters':>9} {'nodes':>8} {'edges':>9} {'route':>9} "
+        f"{'first':>9} {'refine':>9} {'a*':>9} {'worst':>6}"
+    )
+    for size in SIZES:
+        stats = measure(size, args.queries)
+        print(
+            f"{size:>4}x{size:<5} {stats['build_s']:>7.2f}s "
+            f"{stats['clusters']:>9} {stats['nodes']:>8} {stats['edges']:>9} "
+            f"{stats['route_ms']:>7.2f}ms {stats['first_ms']:>7.2f}ms "
+            f"{stats['refine_ms']:>7.2f}ms {stats['astar_ms']:>7.2f}ms "
+            f"{stats['ratio']:>6.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
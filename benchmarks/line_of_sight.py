@@ -0,0 +1,112 @@
+import os
+import time
+
+import numpy as np
+import pygame as pg
+
+from scripts.line_of_sight import LineOfSight
+from scripts.navigation import PathCache
+from scripts.walkability import WalkabilityIndex
+
+
+MATRIX_PATH = os.path.join("assets", "pathfinding_grid.npy")
+TILE_X, TILE_Y = 32, 18
+FPS = 60
+SECONDS = 10
+ENEMIES = 50
+SPEED = 4
+REPATH_DISTANCE = 120
+
+
+def player_walk(walkability: WalkabilityIndex, frames: int) -> np.ndarray:
+    waypoints = walkability.sample((1, 1), frames // 60 + 2)
+    steps = np.linspace(0, 1, 60, endpoint=False)
+    walk = [
+        start + (end - start) * t
+        for start, end in zip(waypoints[:-1], waypoints[1:])
+        for t in steps
+    ]
+    return np.array(walk[:frames])
+
+
+def chase(
+    matrix: np.ndarray,
+    enemies: np.ndarray,
+    walk: np.ndarray,
+    sight: LineOfSight | None,
+    shortcut: bool,
+) -> dict[str, float]:
+    path_cache = PathCache(matrix, TILE_X, TILE_Y, sight=sight)
+    positions = [pg.Vector2(pos.tolist()) for pos in enemies]
+    paths = [[] for _ in positions]
+    tile = pg.Vector2(TILE_X, TILE_Y)
+
+    searches = pops = direct = 0
+    start = time.perf_counter()
+    for target in walk:
+        target = pg.Vector2(target.tolist())
+        visible = (
+            sight.visible(positions, target)
+            if shortcut
+            else np.zeros(len(positions), bool)
+        )
+        for position, path, clear in zip(positions, paths, visible):
+            if clear:
+                path.clear()
+                position.move_towards_ip(target, SPEED)
+                direct += 1
+                continue
+
+            if not path or (
+                target.distance_to(tile.elementwise() * path[-1])
+                >= REPATH_DISTANCE
+            ):
+                path[:] = path_cache.finder.find_path(
+                    *path_cache.key(position, target)
+                )
+                path[:] = path_cache.smooth(path)
+                searches += 1
+            if not path:
+                continue
+
+            waypoint = tile.elementwise() * path[0]
+            position.move_towards_ip(waypoint, SPEED)
+            if position == waypoint:
+                path.pop(0)
+                pops += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "searches": searches / SECONDS,
+        "pops": pops / SECONDS,
+        "direct": direct / SECONDS,
+        "ms": elapsed / len(walk) * 1000,
+    }
+
+
+def main() -> None:
+    matrix = np.load(MATRIX_PATH)
+    bounds = pg.Rect(0, 0, matrix.shape[1] * TILE_X, matrix.shape[0] * TILE_Y)
+    walkability = WalkabilityIndex(matrix, TILE_X, TILE_Y, bounds, seed=0)
+    walk = player_walk(walkability, FPS * SECONDS)
+    enemies = walkability.sample((1, 1), ENEMIES)
+    sight = LineOfSight(matrix, TILE_X, TILE_Y)
+
+    print(f"{ENEMIES} enemies chasing for {SECONDS}s (per second of chase)")
+    print(
+        f"{'mode':>18} {'searches':>9} {'pops':>8} {'direct':>8} {'frame':>9}"
+    )
+    for name, mode_sight, shortcut in (
+        ("tile paths", None, False),
+        ("string-pulled", sight, False),
+        ("line of sight", sight, True),
+    ):
+        stats = chase(matrix, enemies, walk, mode_sight, shortcut)
+        print(
+            f"{name:>18} {stats['searches']:>9.1f} {stats['pops']:>8.1f} "
+            f"{stats['direct']:>8.1f} {stats['ms']:>7.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import math
+import os
+import random
+import time
+
+import numpy as np
+
+from pathfinding.core.grid import Grid
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.finder.a_star import AStarFinder
+
+from scripts.pathfinder import Pathfinder
+
+
+MATRIX_PATH = os.path.join("assets", "pathfinding_grid.npy")
+QUERIES = 500
+
+
+def path_cost(path) -> float:
+    return sum(
+        math.hypot(a.x - b.x, a.y - b.y) for a, b in zip(path, path[1:])
+    )
+
+
+def valid_path(matrix: np.ndarray, path) -> bool:
+    for a, b in zip(path, path[1:]):
+        if max(abs(a.x - b.x), abs(a.y - b.y)) != 1:
+            return False
+    return all(matrix[node.y][node.x] for node in path[1:])
+
+
+def random_queries(matrix: np.ndarray, count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    rows, cols = matrix.shape
+    tiles = [(x, y) for y in range(rows) for x in range(cols)]
+    return [tuple(rng.sample(tiles, 2)) for _ in range(count)]
+
+
+def reference_paths(matrix: np.ndarray, queries: list) -> list:
+    grid = Grid(matrix=matrix)
+    finder = AStarFinder(diagonal_movement=DiagonalMovement.always)
+
+    paths = []
+    for start, end in queries:
+        path, _ = finder.find_path(grid.node(*start), grid.node(*end), grid)
+        paths.append(path)
+    return paths
+
+
+def check_parity(matrix: np.ndarray, queries: list) -> None:
+    expected = reference_paths(matrix, queries)
+    for jump_point in (False, True):
+        finder = Pathfinder(matrix, jump_point)
+        for (start, end), reference in zip(queries, expected):
+            path = finder.find_path(start, end)
+            assert bool(path) == bool(reference), (start, end)
+            if not path:
+                continue
+
+            assert (path[0], path[-1]) == (start, end), (start, end)
+            assert valid_path(matrix, path), (start, end)
+            assert math.isclose(path_cost(path), path_cost(reference)), (
+                start,
+                end,
+                jump_point,
+            )
+
+
+def bench(name: str, run, queries: list) -> None:
+    start = time.perf_counter()
+    run(queries)
+    elapsed = time.perf_counter() - start
+    print(f"{name:>14} {elapsed / len(queries) * 1e6:>10.1f} us/query")
+
+
+def main() -> None:
+    matrix = np.load(MATRIX_PATH)
+    queries = random_queries(matrix, QUERIES)
+
+    check_parity(matrix, queries)
+    print(f"parity ok over {QUERIES} queries")
+
+    astar = Pathfinder(matrix, jump_point=False)
+    jps = Pathfinder(matrix, jump_point=True)
+
+    bench("pathfinding", lambda q: reference_paths(matrix, q), queries)
+    bench(
+        "numpy a*",
+        lambda q: [astar.find_path(start, end) for start, end in q],
+        queries,
+    )
+    bench(
+        "jump point",
+        lambda q: [jps.find_path(start, end) for start, end in q],
+        queries,
+    )
+
+
+if __name__ == "__main__":
+    main()
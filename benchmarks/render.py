@@ -0,0 +1,70 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import time  # noqa: E402
+
+import pygame as pg  # noqa: E402
+
+from scripts.game import Game  # noqa: E402
+from scripts.tilemap import load_map  # noqa: E402
+
+
+MAP_PATH = os.path.join("assets", "arena.map")
+FRAMES = 200
+
+
+def per_sprite(game: Game, display: pg.Surface) -> list[pg.Rect]:
+    rects = [sprite.draw(display) for sprite in game.all_sprites]
+    rects += game.bullets.draw(display)
+    return rects
+
+
+def batched(game: Game, display: pg.Surface) -> list[pg.Rect]:
+    return game.render(display)
+
+
+def measure(game: Game, display: pg.Surface, render) -> float:
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        render(game, display)
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main() -> None:
+    pg.init()
+    screen = pg.display.set_mode((1280, 720))
+    world = load_map(MAP_PATH)
+    game = Game(
+        world,
+        world.tile_x,
+        world.tile_y,
+        world.rows,
+        world.cols,
+        screen,
+        -1000,
+        pg.Rect((0, 0), world.size),
+    )
+    print(f"atlas pages: {[page.get_size() for page in game.atlas.pages]}")
+    print(
+        f"{'sprites':>8} {'per-sprite':>11} {'batched':>9} "
+        f"{'us/sprite':>10} {'us/sprite':>10}"
+    )
+    for count in (10, 100, 300, 600):
+        game.reset()
+        game.spawn_enemies(count - len(game.enemies))
+        for angle in range(0, 360, 360 // (count // 5)):
+            game.bullets.spawn(game.player.position.xy, angle)
+
+        sprites = len(game.all_sprites) + len(game.bullets)
+        old = measure(game, screen, per_sprite)
+        new = measure(game, screen, batched)
+        print(
+            f"{sprites:>8} {old * 1000:>9.3f}ms {new * 1000:>7.3f}ms "
+            f"{old / sprites * 1e6:>10.2f} {new / sprites * 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse  # noqa: E402
+import random  # noqa: E402
+import tempfile  # noqa: E402
+import time  # noqa: E402
+
+import numpy as np  # noqa: E402
+import pygame as pg  # noqa: E402
+
+from scripts import clock  # noqa: E402
+from scripts.game import Game  # noqa: E402
+from scripts.input_source import KEYS, ScriptedInput  # noqa: E402
+from scripts.replay import InputRecorder, Replayer  # noqa: E402
+from scripts.tilemap import load_map  # noqa: E402
+
+
+MAP_PATH = os.path.join("assets", "arena.map")
+SIZE = (1280, 720)
+
+
+def state(game: Game) -> tuple:
+    swarm = game.swarm
+    return (
+        tuple(game.player.position),
+        game.player.ammo,
+        game.player.kill_count,
+        swarm.positions[swarm.alive].tobytes(),
+        game.bullets.positions[game.bullets.alive].tobytes(),
+    )
+
+
+def record(path: str, steps: int) -> tuple[list, float]:
+    pg.init()
+    simulated = clock.SimulatedClock()
+    clock.set_source(simulated.get_ticks)
+
+    source = ScriptedInput()
+    recorder = InputRecorder(path, MAP_PATH, SIZE, True, source=source)
+    world = load_map(MAP_PATH)
+    game = Game(
+        world,
+        world.tile_x,
+        world.tile_y,
+        world.rows,
+        world.cols,
+        pg.Surface(SIZE),
+        0,
+        pg.Rect((0, 0), world.size),
+        True,
+        recorder,
+        headless=True,
+    )
+    game.invulnerable = True
+
+    script = random.Random(0)
+    states = []
+    start = time.perf_counter()
+    recorder.start(game, seed=1)
+    for frame in range(steps):
+        if frame % 30 == 0:
+            source.pressed = set(script.sample(KEYS, script.randint(0, 2)))
+            source.position = script.randint(0, 1279), script.randint(0, 719)
+            source.buttons = script.random() < 0.7, False, False
+        simulated.advance(script.choice((0, 16, 17, 17, 33)))
+        recorder.capture()
+        game.update(1.0)
+        states.append(state(game))
+    elapsed = time.perf_counter() - start
+
+    recorder.close()
+    clock.set_source(None)
+    game.path_scheduler.stop()
+    return states, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Record a scripted session and replay it."
+    )
+    parser.add_argument("--steps", type=int, default=3600)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.rec")
+        recorded, record_time = record(path, args.steps)
+        size = os.path.getsize(path)
+
+        replayer = Replayer(path)
+        replayer.game.invulnerable = True
+        replayed = []
+        stats = replayer.run(on_step=lambda game: replayed.append(state(game)))
+
+    diverged = next(
+        (
+            step
+            for step, (a, b) in enumerate(zip(recorded, replayed))
+            if a != b
+        ),
+        None,
+    )
+    ammo = np.diff([state[1] for state in recorded])
+    print(
+        f"{args.steps} steps, {len(replayer.game.enemies)} enemies, "
+        f"{int((ammo < 0).sum())} shots, {replayer.game.player.kill_count} "
+        "kills"
+    )
+    print(f"log: {size} bytes ({size / args.steps:.1f} bytes/step)")
+    print(
+        f"record: {record_time:.2f}s, replay: {stats['seconds']:.2f}s "
+        f"({stats['steps_per_second']:.0f} steps/s)"
+    )
+    print(
+        "replay matches every step"
+        if diverged is None and len(recorded) == len(replayed)
+        else f"replay diverged at step {diverged}"
+    )
+
+
+if __name__ == "__main__":
+    main()
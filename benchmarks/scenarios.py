@@ -0,0 +1,293 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import math  # noqa: E402
+import random  # noqa: E402
+import sys  # noqa: E402
+import time  # noqa: E402
+
+import numpy as np  # noqa: E402
+import pygame as pg  # noqa: E402
+
+from scripts import clock  # noqa: E402
+from scripts.game import Game  # noqa: E402
+from scripts.input_source import ScriptedInput  # noqa: E402
+from scripts.main_menu import MainMenu  # noqa: E402
+from scripts.objects import Obtainable_Item  # noqa: E402
+from scripts.renderer import DirtyRenderer  # noqa: E402
+from scripts.tilemap import load_map  # noqa: E402
+from scripts.utilities import load_image  # noqa: E402
+
+
+MAP_PATH = os.path.join("assets", "arena.map")
+FRAME_MS = 1000 / 60
+METRICS = ("frame", "update", "render")
+PERCENTILES = (50, 95, 99)
+
+
+class Scenario:
+    name = ""
+
+    def __init__(self, screen: pg.Surface) -> None:
+        self.screen = screen
+
+    def update(self, frame: int) -> None:
+        pass
+
+    def render(self) -> list[pg.Rect]:
+        return []
+
+
+class MainMenuIdle(Scenario):
+    name = "main_menu_idle"
+
+    def __init__(self, screen: pg.Surface) -> None:
+        super().__init__(screen)
+        self.menu = MainMenu(screen)
+
+    def update(self, frame: int) -> None:
+        self.menu.update()
+
+    def render(self) -> list[pg.Rect]:
+        return self.menu.render(self.screen)
+
+
+class GameScenario(Scenario):
+    def __init__(self, screen: pg.Surface) -> None:
+        super().__init__(screen)
+        self.input = ScriptedInput()
+        world = load_map(MAP_PATH)
+        self.game = Game(
+            world,
+            world.tile_x,
+            world.tile_y,
+            world.rows,
+            world.cols,
+            screen,
+            0,
+            pg.Rect((0, 0), world.size),
+            input_source=self.input,
+        )
+        self.game.walkability.rng = np.random.default_rng(0)
+        self.game.reset()
+        self.game.game_start_delay = clock.get_ticks() - 250
+        self.game.invulnerable = True
+        self.setup()
+
+    def setup(self) -> None:
+        pass
+
+    def script(self, frame: int) -> None:
+        pass
+
+    def update(self, frame: int) -> None:
+        self.script(frame)
+        self.game.update(1)
+
+    def render(self) -> list[pg.Rect]:
+        return self.game.render(self.screen)
+
+
+class EnemyRoaming(GameScenario):
+    name = "enemy_roaming"
+
+    def setup(self) -> None:
+        self.game.chase_distance = 0
+
+
+class EnemyChasing(GameScenario):
+    name = "enemy_chasing"
+
+    def setup(self) -> None:
+        self.game.chase_distance = 10000
+
+    def script(self, frame: int) -> None:
+        keys = (pg.K_a, pg.K_w, pg.K_d, pg.K_s)
+        self.input.pressed = {keys[frame // 90 % 4]}
+
+
+class PlayerFiring(GameScenario):
+    name = "player_firing"
+
+    def setup(self) -> None:
+        self.input.buttons = (True, False, False)
+
+    def script(self, frame: int) -> None:
+        angle = frame * 0.05
+        center = self.game.player.position
+        self.input.position = (
+            center.x + math.cos(angle) * 200,
+            center.y + math.sin(angle) * 200,
+        )
+        self.game.player.ammo = 999
+
+
+class ManyPickups(GameScenario):
+    name = "many_pickups"
+
+    def setup(self) -> None:
+        game = self.game
+        image = game.images["ammo"]
+        positions = game.walkability.random_positions(
+            (0, 0), image.get_size(), 0, 200
+        )
+        for pos in positions.tolist():
+            ammo = Obtainable_Item(image, pos)
+            game.all_sprites.add(ammo)
+            game.ammos.add(ammo)
+            game.spatial.insert(ammo)
+
+    def script(self, frame: int) -> None:
+        EnemyChasing.script(self, frame)
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        MainMenuIdle,
+        EnemyRoaming,
+        EnemyChasing,
+        PlayerFiring,
+        ManyPickups,
+    )
+}
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    ms = np.array(samples) * 1000
+    summary = {f"p{p}": float(np.percentile(ms, p)) for p in PERCENTILES}
+    summary["mean"] = float(ms.mean())
+    return summary
+
+
+def run_scenario(
+    scenario_type: type[Scenario],
+    screen: pg.Surface,
+    renderer: DirtyRenderer,
+    frames: int,
+    full_redraw: bool,
+) -> dict:
+    random.seed(0)
+    sim_clock = clock.SimulatedClock(1000)
+    clock.set_source(sim_clock.get_ticks)
+
+    scenario = scenario_type(screen)
+    renderer.invalidate()
+    timings = {metric: [] for metric in METRICS}
+    for frame in range(frames):
+        sim_clock.advance(FRAME_MS)
+
+        start = time.perf_counter()
+        scenario.update(frame)
+        updated = time.perf_counter()
+        if full_redraw:
+            screen.blit(renderer.background)
+            scenario.render()
+            pg.display.flip()
+        else:
+            renderer.restore()
+            renderer.present(scenario.render())
+        rendered = time.perf_counter()
+
+        timings["update"].append(updated - start)
+        timings["render"].append(rendered - updated)
+        timings["frame"].append(rendered - start)
+
+    clock.set_source(None)
+    result = {metric: summarize(timings[metric]) for metric in METRICS}
+    result["frames"] = frames
+    return result
+
+
+def run(frames: int, names: list[str], full_redraw: bool = False) -> dict:
+    pg.init()
+    pg.display.set_caption("Unnamed Game")
+    screen = pg.display.set_mode((1280, 720))
+    renderer = DirtyRenderer(
+        screen, load_image("background.png", "white", scale=8)
+    )
+
+    return {
+        name: run_scenario(
+            SCENARIOS[name], screen, renderer, frames, full_redraw
+        )
+        for name in names
+    }
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float, min_delta: float
+) -> list[tuple[str, str, str, float, float]]:
+    regressions = []
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+
+        for metric in METRICS:
+            for stat in (f"p{p}" for p in PERCENTILES):
+                old = baseline[name][metric][stat]
+                new = result[metric][stat]
+                if new - old > max(old * threshold, min_delta):
+                    regressions.append((name, metric, stat, old, new))
+    return regressions
+
+
+def print_results(results: dict) -> None:
+    print(f"{'scenario':<16} {'metric':<7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, result in results.items():
+        for metric in METRICS:
+            stats = result[metric]
+            print(
+                f"{name:<16} {metric:<7} {stats['p50']:>8.3f} "
+                f"{stats['p95']:>8.3f} {stats['p99']:>8.3f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Frame-time scenarios.")
+    parser.add_argument("--frames", type=int, default=600)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS)
+    )
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"))
+    parser.add_argument("--full-redraw", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--min-delta", type=float, default=0.05)
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as file:
+            baseline = json.load(file)
+        with open(args.compare[1]) as file:
+            current = json.load(file)
+
+        regressions = compare(
+            baseline, current, args.threshold, args.min_delta
+        )
+        for name, metric, stat, old, new in regressions:
+            change = f"{new / old - 1:+.0%}" if old else "n/a"
+            print(
+                f"REGRESSION {name} {metric} {stat}: "
+                f"{old:.3f} ms -> {new:.3f} ms ({change})"
+            )
+        if not regressions:
+            print("no regressions")
+        sys.exit(1 if regressions else 0)
+
+    results = run(
+        args.frames, args.scenario or list(SCENARIOS), args.full_redraw
+    )
+    print_results(results)
+
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+    print(f"wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse  # noqa: E402
+import time  # noqa: E402
+
+import numpy as np  # noqa: E402
+import pygame as pg  # noqa: E402
+
+from scripts.assets import AssetManager  # noqa: E402
+from scripts.game import Game  # noqa: E402
+from scripts.game_assets import GameAssets  # noqa: E402
+from scripts.input_source import ScriptedInput  # noqa: E402
+from scripts.simulation import Simulation, SimulationView  # noqa: E402
+from scripts.tilemap import load_map  # noqa: E402
+from scripts.timestep import FixedTimestep  # noqa: E402
+
+
+MAP_PATH = os.path.join("assets", "arena.map")
+FPS = 144
+
+
+def build(screen: pg.Surface, input_source: ScriptedInput) -> Game:
+    world = load_map(MAP_PATH)
+    game = Game(
+        world,
+        world.tile_x,
+        world.tile_y,
+        world.rows,
+        world.cols,
+        screen,
+        0,
+        pg.Rect((0, 0), world.size),
+        True,
+        input_source,
+    )
+    game.invulnerable = True
+    return game
+
+
+def steer(frame: int, input_source: ScriptedInput) -> None:
+    keys = (pg.K_d, pg.K_s, pg.K_a, pg.K_w)
+    input_source.pressed = {keys[frame // FPS % 4]}
+    input_source.position = (640 + frame % 400, 200)
+    input_source.buttons = (True, False, False)
+
+
+def in_process(screen: pg.Surface, seconds: float) -> tuple[list, int]:
+    input_source = ScriptedInput()
+    game = build(screen, input_source)
+    game.reset()
+    game.game_start_delay = pg.time.get_ticks() - 250
+    clock = pg.time.Clock()
+    timestep = FixedTimestep(60)
+
+    frames, updates, elapsed = [], 0, 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        steer(len(frames), input_source)
+        game.player.ammo = 24
+        for _ in range(timestep.advance(elapsed)):
+            game.update(timestep.dt)
+            updates += 1
+        game.alpha = timestep.alpha
+        game.render(screen)
+        frames.append(time.perf_counter() - start)
+        elapsed = clock.tick(FPS)
+    game.path_scheduler.stop()
+    return frames, updates
+
+
+def worker(screen: pg.Surface, seconds: float) -> tuple[list, int]:
+    input_source = ScriptedInput()
+    world = load_map(MAP_PATH)
+    view = SimulationView(
+        GameAssets(AssetManager()), pg.Rect((0, 0), world.size), True
+    )
+    simulation = Simulation(
+        MAP_PATH, screen.get_size(), True, invulnerable=True
+    )
+    simulation.new_game()
+    simulation.pause(False)
+    while simulation.snapshot() is None:
+        simulation.send_input(input_source)
+        time.sleep(0.01)
+
+    clock = pg.time.Clock()
+    frames, published = [], set()
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        steer(len(frames), input_source)
+        simulation.send_input(input_source)
+        snapshot = simulation.snapshot()
+        if snapshot is not None:
+            published.add(snapshot["time"])
+            view.render(screen, snapshot, simulation.alpha(snapshot))
+        frames.append(time.perf_counter() - start)
+        clock.tick(FPS)
+    simulation.close()
+    return frames, len(published)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare main-loop frame times with and without the "
+        "simulation worker process."
+    )
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    pg.init()
+    screen = pg.display.set_mode((1280, 720))
+
+    print(f"wave mode at {FPS} fps for {args.seconds:g}s")
+    print(
+        f"{'mode':>12} {'frames':>7} {'updates/s':>10} {'mean':>8} "
+        f"{'p99':>8} {'max':>8}"
+    )
+    for name, run in (("in-process", in_process), ("worker", worker)):
+        frames, updates = run(screen, args.seconds)
+        times = np.array(frames) * 1000
+        print(
+            f"{name:>12} {len(times):>7} {updates / args.seconds:>10.1f} "
+            f"{times.mean():>6.2f}ms {np.percentile(times, 99):>6.2f}ms "
+            f"{times.max():>6.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
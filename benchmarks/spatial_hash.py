@@ -0,0 +1,119 @@
+import random
+import time
+
+import pygame as pg
+
+from scripts.objects import BulletPool
+from scripts.spatial_hash import SpatialHash
+
+
+FRAMES = 60
+WORLDS = {
+    "one screen": pg.Rect(0, 0, 1280, 720),
+    "4x4 screens": pg.Rect(0, 0, 5120, 2880),
+}
+
+
+class Body(pg.sprite.Sprite):
+    def __init__(self, size: tuple[int, int], bounds: pg.Rect) -> None:
+        super().__init__()
+        self.bounds = bounds
+        self.rect = pg.Rect((0, 0), size)
+        self.rect.center = (
+            random.randrange(bounds.width),
+            random.randrange(bounds.height),
+        )
+
+    def wander(self) -> None:
+        self.rect.move_ip(random.randint(-3, 3), random.randint(-3, 3))
+        self.rect.clamp_ip(self.bounds)
+
+
+class Enemy(Body):
+    pass
+
+
+class Pickup(Body):
+    pass
+
+
+def make_world(count: int, bounds: pg.Rect) -> tuple:
+    player = Body((50, 90), bounds)
+    enemies = [Enemy((65, 70), bounds) for _ in range(count)]
+    pickups = [Pickup((60, 54), bounds) for _ in range(count)]
+
+    bullets = BulletPool(pg.Surface((32, 32)), 0, count)
+    for _ in range(count):
+        bullets.spawn(
+            (
+                random.uniform(0, bounds.width),
+                random.uniform(0, bounds.height),
+            ),
+            random.uniform(0, 360),
+        )
+    return player, enemies, pickups, bullets
+
+
+def linear(player, enemies, pickups, bullets) -> float:
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for enemy in enemies:
+            enemy.wander()
+            enemy.rect.colliderect(player.rect)
+        for pickup in pickups:
+            pickup.rect.colliderect(player.rect)
+
+        bullet_rects = [
+            pg.Rect(left, top, right - left, bottom - top)
+            for left, top, right, bottom in bullets.rects(bullets.live())
+        ]
+        for rect in bullet_rects:
+            for enemy in enemies:
+                rect.colliderect(enemy.rect)
+    return time.perf_counter() - start
+
+
+def brute_force(player, enemies, pickups, bullets) -> float:
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for enemy in enemies:
+            enemy.wander()
+        player.rect.collidelistall(enemies)
+        player.rect.collidelistall(pickups)
+        bullets.collide([enemy.rect for enemy in enemies])
+    return time.perf_counter() - start
+
+
+def hashed(player, enemies, pickups, bullets) -> float:
+    spatial = SpatialHash(64, 72)
+    for body in (player, *enemies, *pickups):
+        spatial.insert(body)
+
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        for enemy in enemies:
+            enemy.wander()
+            spatial.move(enemy)
+        spatial.query_rect(player.rect, Enemy)
+        spatial.query_rect(player.rect, Pickup)
+        live = bullets.live()
+        spatial.overlaps(bullets.rects(live), Enemy)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    for name, bounds in WORLDS.items():
+        print(f"{name} ({bounds.width}x{bounds.height}), ms per frame")
+        print(f"{'entities':>9} {'linear':>9} {'numpy':>9} {'hashed':>9}")
+        for count in (100, 300, 600):
+            random.seed(count)
+            world = make_world(count, bounds)
+            timings = [
+                bench(*world) / FRAMES * 1000
+                for bench in (linear, brute_force, hashed)
+            ]
+            print(f"{count:>9}", *(f"{ms:>9.3f}" for ms in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import time
+
+STARTED = time.perf_counter()
+
+import os  # noqa: E402
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse  # noqa: E402
+import json  # noqa: E402
+import statistics  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+from typing import Callable  # noqa: E402
+
+
+MODES = ("no_cache", "cold", "warm")
+MAP_PATH = os.path.join("assets", "arena.map")
+
+
+def child(mode: str, cache_dir: str) -> None:
+    import pygame as pg
+
+    from scripts import utilities
+    from scripts.asset_cache import AssetCache
+
+    cache = None if mode == "no_cache" else AssetCache(cache_dir)
+    if mode == "cold":
+        cache.clear()
+    utilities.set_asset_cache(cache)
+
+    spent = [0.0]
+
+    def timed(load: Callable) -> Callable:
+        def run(*args, **kwargs) -> pg.Surface:
+            start = time.perf_counter()
+            result = load(*args, **kwargs)
+            spent[0] += time.perf_counter() - start
+            return result
+
+        return run
+
+    utilities.decode_image = timed(utilities.decode_image)
+    utilities.finish_image = timed(utilities.finish_image)
+
+    from main import Main
+
+    main = Main(MAP_PATH)
+    timings = {"main_init": time.perf_counter() - STARTED}
+
+    present = main.renderer.present
+
+    def first_frame(rects: list[pg.Rect]) -> None:
+        present(rects)
+        timings["first_frame"] = time.perf_counter() - STARTED
+
+        main.get_game()
+        timings["game_ready"] = time.perf_counter() - STARTED
+        main.running = False
+
+    main.renderer.present = first_frame
+    try:
+        main.main()
+    except SystemExit:
+        pass
+
+    timings["images"] = spent[0]
+    timings["hits"] = cache.hits if cache else 0
+    print(json.dumps(timings))
+
+
+def measure(mode: str, cache_dir: str) -> dict:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.startup",
+            "--child",
+            mode,
+            "--cache-dir",
+            cache_dir,
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Startup and time to first frame."
+    )
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument(
+        "--cache-dir", default=os.path.join(".cache", "bench_assets")
+    )
+    parser.add_argument("--child", choices=MODES)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.cache_dir)
+        return
+
+    measure("warm", args.cache_dir)
+
+    columns = ("main_init", "first_frame", "game_ready", "images")
+    print(f"{'mode':<9}", *(f"{c:>11}" for c in columns), f"{'hits':>5}")
+    for mode in MODES:
+        runs = [measure(mode, args.cache_dir) for _ in range(args.runs)]
+        medians = [
+            statistics.median(run[column] for run in runs) * 1000
+            for column in columns
+        ]
+        print(
+            f"{mode:<9}",
+            *(f"{value:>9.1f}ms" for value in medians),
+            f"{runs[-1]['hits']:>5}",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse  # noqa: E402
+import tempfile  # noqa: E402
+import time  # noqa: E402
+
+import numpy as np  # noqa: E402
+
+from scripts.headless import HeadlessRunner  # noqa: E402
+from scripts.tilemap import load_map, save_map  # noqa: E402
+
+
+MATRIX_PATH = os.path.join("assets", "pathfinding_grid.npy")
+SIZES = (40, 512, 2048, 4096)
+
+
+def build_map(path: str, size: int) -> None:
+    matrix = np.load(MATRIX_PATH)
+    repeat = -(-size // len(matrix))
+    save_map(path, np.tile(matrix, (repeat, repeat))[:size, :size], 32, 18)
+
+
+def measure(path: str, frames: int) -> dict[str, float]:
+    start = time.perf_counter()
+    world = load_map(path)
+    loaded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    runner = HeadlessRunner(
+        world,
+        world.tile_x,
+        world.tile_y,
+        world.rows,
+        world.cols,
+        wave_mode=True,
+    )
+    created = time.perf_counter() - start
+    runner.game.invulnerable = True
+    runner.game.wave_ramp = 100
+
+    stats = runner.run(frames)
+    runner.close()
+
+    return {
+        "load_ms": loaded * 1000,
+        "init_ms": created * 1000,
+        "frame_ms": stats["seconds"] / frames * 1000,
+        "enemies": len(runner.game.enemies),
+        "chunks": len(world.chunks),
+        "resident_kb": world.resident_bytes / 1024,
+        "map_kb": world.rows * world.cols / 1024,
+        "windows": runner.game.path_scheduler.finder.windows,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Load and play maps of growing size."
+    )
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args()
+
+    print(
+        f"{'map':>10} {'load':>8} {'init':>8} {'frame':>8} {'enemies':>8} "
+        f"{'chunks':>7} {'resident':>10} {'map':>10} {'windows':>8}"
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SIZES:
+            path = os.path.join(directory, f"{size}.map")
+            build_map(path, size)
+            stats = measure(path, args.frames)
+            print(
+                f"{size:>4}x{size:<5} {stats['load_ms']:>6.2f}ms "
+                f"{stats['init_ms']:>6.1f}ms {stats['frame_ms']:>6.3f}ms "
+                f"{stats['enemies']:>8} {stats['chunks']:>7} "
+                f"{stats['resident_kb']:>8.0f}KB {stats['map_kb']:>8.0f}KB "
+                f"{stats['windows']:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse  # noqa: E402
+import time  # noqa: E402
+
+from scripts.headless import HeadlessRunner  # noqa: E402
+from scripts.tilemap import load_map  # noqa: E402
+from scripts.timestep import FixedTimestep  # noqa: E402
+
+
+MAP_PATH = os.path.join("assets", "arena.map")
+RATES = (15, 30, 60, 144, 240, 1000)
+
+
+def simulate(fps: int, seconds: float, fixed: bool) -> dict[str, float]:
+    world = load_map(MAP_PATH)
+    runner = HeadlessRunner(
+        world,
+        world.tile_x,
+        world.tile_y,
+        world.rows,
+        world.cols,
+        wave_mode=True,
+    )
+    game = runner.game
+    game.invulnerable = True
+    speed = game.bullets.base_speed
+
+    frame_ms = 1000 / fps
+    timestep = FixedTimestep(60)
+    updates, longest, elapsed = 0, 0.0, 0.0
+    for _ in range(int(seconds * fps)):
+        runner.clock.advance(frame_ms)
+        steps = (
+            [timestep.dt] * timestep.advance(frame_ms)
+            if fixed
+            else [frame_ms / 1000 * 60]
+        )
+
+        start = time.perf_counter()
+        for dt in steps:
+            game.update(dt)
+            longest = max(longest, speed * dt)
+        elapsed += time.perf_counter() - start
+        updates += len(steps)
+    runner.close()
+
+    return {
+        "updates": updates / seconds,
+        "update_ms": elapsed / seconds * 1000,
+        "bullet_step": longest,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare variable and fixed simulation steps."
+    )
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"per simulated second over {args.seconds:g}s")
+    print(
+        f"{'fps':>6} {'updates':>8} {'fixed':>6} {'update ms':>10} "
+        f"{'fixed':>7} {'bullet px':>10} {'fixed':>6}"
+    )
+    for fps in RATES:
+        old = simulate(fps, args.seconds, False)
+        new = simulate(fps, args.seconds, True)
+        print(
+            f"{fps:>6} {old['updates']:>8.0f} {new['updates']:>6.0f} "
+            f"{old['update_ms']:>10.1f} {new['update_ms']:>7.1f} "
+            f"{old['bullet_step']:>10.1f} {new['bullet_step']:>6.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame as pg  # noqa: E402
+
+from scripts.game import Game  # noqa: E402
+from scripts.tilemap import load_map  # noqa: E402
+
+
+MAP_PATH = os.path.join("assets", "arena.map")
+FRAMES = 200
+
+
+def make_game() -> Game:
+    pg.init()
+    screen = pg.display.set_mode((1280, 720))
+    world = load_map(MAP_PATH)
+    game = Game(
+        world,
+        world.tile_x,
+        world.tile_y,
+        world.rows,
+        world.cols,
+        screen,
+        -1000,
+        pg.Rect((0, 0), world.size),
+        wave_mode=False,
+    )
+    game.invulnerable = True
+    return game
+
+
+def run(game: Game, count: int, batched: bool) -> float:
+    game.reset()
+    game.game_start_delay = -1000
+    game.swarm.batched = batched
+    game.spawn_enemies(count - len(game.enemies))
+
+    total = 0.0
+    for _ in range(FRAMES):
+        game.update(1)
+        total += game.update_time
+
+    return total / FRAMES * 1000
+
+
+def main() -> None:
+    game = make_game()
+
+    print(f"{'enemies':>8} {'per sprite':>11} {'batched':>9} (ms/update)")
+    for count in (1, 10, 100, 300):
+        per_sprite = run(game, count, batched=False)
+        batched = run(game, count, batched=True)
+        print(f"{count:>8} {per_sprite:>11.3f} {batched:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,39 @@
-import numpy as np
 import pygame as pg
 
+import argparse
+import math
 import sys
 import os
+import time
+from typing import TYPE_CHECKING
 
-from scripts.utilities import load_image
+from scripts.assets import AssetManager
 from scripts.gamestate import GameState
-from scripts.game import Game
+from scripts.input_source import InputSource
 from scripts.main_menu import MainMenu
 from scripts.settings import Settings
 from scripts.pause_menu import PauseMenu
+from scripts.profiler import Profiler
+from scripts.renderer import DirtyRenderer
+from scripts.timestep import FixedTimestep
+
+if TYPE_CHECKING:
+    from scripts.game import Game
+    from scripts.replay import InputRecorder
+    from scripts.simulation import Simulation, SimulationView
+    from scripts.tilemap import TileMap
 
 
 class Main:
     def __init__(
         self,
-        matrix: np.ndarray | list,
-        tile_x: int,
-        tile_y: int,
-        rows: int,
-        cols: int,
+        world: "TileMap | str",
+        wave_mode: bool = False,
+        worker: bool = False,
+        record: str | None = None,
     ) -> None:
-        self.matrix = matrix
-        self.tile_x, self.tile_y = tile_x, tile_y
-        self.rows, self.cols = rows, cols
+        self.world = world
+        self.wave_mode = wave_mode
 
         pg.init()
 
@@ -31,50 +41,172 @@ class Main:
         self.screen = pg.display.set_mode((1280, 720))
         self.w, self.h = self.screen.get_size()
 
-        self.background = load_image("background.png", "white", scale=8)
+        self.assets = AssetManager()
+        self.background = self.assets.image("background.png", "white", scale=8)
         self.bg_position = pg.Vector2()
-        self.bg_rect = self.background.get_rect(topleft=(0, 0))
+        self.renderer = DirtyRenderer(self.screen, self.background)
 
         self.clock = pg.time.Clock()
         self.game_start_delay = 0
 
+        self.fps_font = self.assets.font(None, 33)
         self.fps_text = pg.Surface((10, 10))
         self.prev_fps = 0
         self.fps_update_delay = pg.time.get_ticks()
 
+        self.profiler = Profiler()
+
+        self.main_menu = MainMenu(self.screen, self.assets)
+        self.settings = Settings(self.screen, self.assets)
+        self.pause_menu = PauseMenu(self.screen, self.assets)
+
+        self.game_state = GameState.main_menu
+        self.new_game = False
+
+        self.timestep = FixedTimestep(60)
+        self.elapsed = 0
+
+        self.simulation: "Simulation | None" = None
+        self.view: "SimulationView | None" = None
+        self.input = InputSource()
+        if worker:
+            from scripts.simulation import Simulation
+
+            self.simulation = Simulation(
+                world, self.screen.get_size(), wave_mode, record=record
+            )
+
+        self.recorder: "InputRecorder | None" = None
+        if record is not None and not worker:
+            from scripts.replay import InputRecorder
+
+            self.recorder = InputRecorder(
+                record,
+                world if isinstance(world, str) else "",
+                self.screen.get_size(),
+                wave_mode,
+                self.timestep.dt,
+            )
+
+        self.tilemap: "TileMap | None" = None
+        self.game: "Game | None" = None
+        self.assets.preload(self.prefetch)
+
+    def prefetch(self) -> None:
+        from scripts.game_assets import prefetch
+        from scripts.tilemap import load_map
+
+        world = self.world
+        self.tilemap = load_map(world) if isinstance(world, str) else world
+        prefetch(self.assets)
+
+    def load_game(self) -> None:
+        from scripts.game import Game
+
+        world = self.tilemap
+        self.bg_rect = pg.Rect((0, 0), world.size)
         self.game = Game(
-            matrix,
-            tile_x,
-            tile_y,
-            rows,
-            cols,
+            world,
+            world.tile_x,
+            world.tile_y,
+            world.rows,
+            world.cols,
             self.screen,
             self.game_start_delay,
             self.bg_rect,
+            self.wave_mode,
+            input_source=self.recorder,
+            profiler=self.profiler,
+            assets=self.assets,
         )
-        self.main_menu = MainMenu(self.screen)
-        self.settings = Settings(self.screen)
-        self.pause_menu = PauseMenu(self.screen)
 
-        self.game_state = GameState.main_menu
-        self.new_game = False
+    def get_game(self) -> "Game":
+        if self.game is None:
+            self.assets.wait()
+            self.load_game()
+        return self.game
+
+    def get_view(self) -> "SimulationView":
+        if self.view is None:
+            from scripts.game_assets import GameAssets
+            from scripts.simulation import SimulationView
+
+            self.assets.wait()
+            self.view = SimulationView(
+                GameAssets(self.assets),
+                pg.Rect((0, 0), self.tilemap.size),
+                self.wave_mode,
+            )
+        return self.view
+
+    def handle_events(self) -> None:
+        for event in pg.event.get():
+            if event.type == pg.QUIT:
+                self.running = False
+
+            if event.type == pg.KEYDOWN:
+                if event.key == pg.K_ESCAPE:
+                    if self.game_state == GameState.settings:
+                        self.game_state = GameState.main_menu
+                    elif self.game_state == GameState.game:
+                        self.game_state = GameState.pause_menu
+                elif event.key == pg.K_F3:
+                    self.profiler.toggle()
+                elif event.key == pg.K_F4:
+                    self.profiler.dump_csv(
+                        f"profile_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+                    )
+
+    def update_simulation(self) -> list[pg.Rect]:
+        simulation, view = self.simulation, self.get_view()
+        if self.new_game:
+            simulation.new_game()
+            self.new_game = False
+        simulation.pause(False)
+        simulation.send_input(self.input)
 
-        self.dt = 1
+        with self.profiler.scope("update"):
+            snapshot = simulation.snapshot()
+        self.running = simulation.running
+        if snapshot is None:
+            return []
+
+        view.play(snapshot)
+        alpha = simulation.alpha(snapshot)
+        self.renderer.scroll_to(view.lerp(snapshot, alpha))
+        with self.profiler.scope("render"):
+            return view.render(self.screen, snapshot, alpha)
 
     def main(self) -> None:
         self.running = True
         while self.running:
-            self.screen.fill("white")
-
-            self.screen.blit(self.background)
+            self.profiler.begin_frame()
+            self.renderer.restore()
+            rects = []
 
-            if self.game_state == GameState.game:
+            if self.game_state == GameState.game and self.simulation:
+                rects += self.update_simulation()
+            elif self.game_state == GameState.game:
+                game = self.get_game()
                 if self.new_game:
-                    self.game.reset()
+                    if self.recorder is not None:
+                        self.recorder.start(game)
+                    else:
+                        game.reset()
+                    self.timestep.reset()
                     self.new_game = False
 
-                self.running = self.game.update(self.dt)
-                self.game.render(self.screen)
+                with self.profiler.scope("update"):
+                    for _ in range(self.timestep.advance(self.elapsed)):
+                        if self.recorder is not None:
+                            self.recorder.capture()
+                        self.running = game.update(self.timestep.dt)
+                        if not self.running:
+                            break
+                game.alpha = self.timestep.alpha
+                self.renderer.scroll_to(game.camera.lerp(game.alpha))
+                with self.profiler.scope("render"):
+                    rects += game.render(self.screen)
             elif self.game_state == GameState.main_menu:
                 (
                     self.game_state,
@@ -82,36 +214,33 @@ class Main:
                     self.game_start_delay,
                     self.new_game,
                 ) = self.main_menu.update()
-                self.main_menu.render(self.screen)
+                rects += self.main_menu.render(self.screen)
 
-                self.game.game_start_delay = self.game_start_delay
+                if self.new_game and self.simulation is None:
+                    self.get_game().game_start_delay = self.game_start_delay
             elif self.game_state == GameState.settings:
                 self.settings.update()
-                self.settings.render(self.screen)
+                rects += self.settings.render(self.screen)
             elif self.game_state == GameState.pause_menu:
                 self.game_state, self.game_start_delay = (
                     self.pause_menu.update()
                 )
-                self.game.game_start_delay = self.game_start_delay
-                self.pause_menu.render(self.screen)
+                if self.game is not None:
+                    self.game.game_start_delay = self.game_start_delay
+                if self.simulation is not None:
+                    self.simulation.pause(True)
+                rects += self.pause_menu.render(self.screen)
 
-            for event in pg.event.get():
-                if event.type == pg.QUIT:
-                    self.running = False
+            with self.profiler.scope("events"):
+                self.handle_events()
 
-                if event.type == pg.KEYDOWN:
-                    if event.key == pg.K_ESCAPE:
-                        if self.game_state == GameState.settings:
-                            self.game_state = GameState.main_menu
-                        elif self.game_state == GameState.game:
-                            self.game_state = GameState.pause_menu
-
-            self.dt = (self.clock.tick(self.settings.fps) / 1000) * 60
+            self.elapsed = self.clock.tick(self.settings.fps)
 
             if pg.time.get_ticks() - self.fps_update_delay >= 500:
-                fps = f"{round(self.clock.get_fps())} FPS"
+                fps = self.clock.get_fps()
+                fps = f"{round(fps) if math.isfinite(fps) else '1000+'} FPS"
                 if fps != self.prev_fps:
-                    self.fps_text = self.game.fps_font.render(
+                    self.fps_text = self.fps_font.render(
                         fps, True, (50, 20, 150)
                     )
 
@@ -119,25 +248,39 @@ class Main:
 
                 self.fps_update_delay = pg.time.get_ticks()
 
-            self.screen.blit(
-                self.fps_text,
-                (
-                    self.w - (self.fps_text.get_width() + 10),
-                    0,
-                ),
+            rects.append(
+                self.screen.blit(
+                    self.fps_text,
+                    (
+                        self.w - (self.fps_text.get_width() + 10),
+                        0,
+                    ),
+                )
             )
 
-            pg.display.flip()
+            rects += self.profiler.draw(self.screen)
+
+            with self.profiler.scope("flip"):
+                self.renderer.present(rects)
+            self.profiler.end_frame()
 
+        if self.simulation is not None:
+            self.simulation.close()
+        if self.recorder is not None:
+            self.recorder.close()
         pg.quit()
         sys.exit()
 
 
 if __name__ == "__main__":
-    matrix = np.load(
-        os.path.join(
-            os.path.dirname(sys.argv[0]), "assets", "pathfinding_grid.npy"
-        )
+    parser = argparse.ArgumentParser(description="Play the game.")
+    parser.add_argument("--waves", action="store_true")
+    parser.add_argument("--worker", action="store_true")
+    parser.add_argument("--record", metavar="PATH")
+    args = parser.parse_args()
+
+    world = os.path.join(os.path.dirname(sys.argv[0]), "assets", "arena.map")
+    main = Main(
+        world, wave_mode=args.waves, worker=args.worker, record=args.record
     )
-    main = Main(matrix, 32, 18, 40, 40)
     main.main()
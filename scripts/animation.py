@@ -0,0 +1,68 @@
+from typing import Iterable
+
+import pygame as pg
+
+from .clock import get_ticks
+
+
+class Animation:
+    def __init__(
+        self,
+        frames: pg.Surface | dict[str, list[pg.Surface]],
+        flipped: pg.Surface | dict[str, list[pg.Surface]] | None = None,
+    ) -> None:
+        if isinstance(frames, pg.Surface):
+            frames = {"idle": [frames]}
+            if flipped is not None:
+                flipped = {"idle": [flipped]}
+        elif not isinstance(frames, dict):
+            raise TypeError(
+                "image must be Surface or dict[str, list[Surface]]"
+            )
+
+        self.frames = frames
+        self.flipped = (
+            flipped
+            if flipped is not None
+            else {
+                state: [pg.transform.flip(frame, True, False) for frame in fs]
+                for state, fs in frames.items()
+            }
+        )
+        self.default = next(iter(frames))
+
+    def get(self, state: str, flipped: bool = False) -> list[pg.Surface]:
+        return (self.flipped if flipped else self.frames)[state]
+
+
+class AnimationBank:
+    def __init__(self) -> None:
+        self.animations: dict[str, Animation] = {}
+
+    def __getitem__(self, name: str) -> Animation:
+        return self.animations[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.animations
+
+    def add(
+        self,
+        name: str,
+        frames: pg.Surface | dict[str, list[pg.Surface]],
+        flipped: pg.Surface | dict[str, list[pg.Surface]] | None = None,
+    ) -> Animation:
+        if name not in self.animations:
+            self.animations[name] = Animation(frames, flipped)
+        return self.animations[name]
+
+    def advance(self, entities: Iterable, now: int | None = None) -> None:
+        if now is None:
+            now = get_ticks()
+
+        for entity in entities:
+            frames = entity.frames
+            if len(frames) > 1:
+                entity.frame_index = int(
+                    (now - entity.frame_start) // entity.frame_delay
+                ) % len(frames)
+                entity.image = frames[entity.frame_index]
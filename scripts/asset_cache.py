@@ -0,0 +1,93 @@
+import hashlib
+import mmap
+import os
+import struct
+from typing import Hashable
+
+import pygame as pg
+
+
+HEADER = struct.Struct("<4sIII")
+MAGIC = b"UIMG"
+VERSION = 3
+
+
+def display_format() -> tuple[int, tuple[int, ...]] | None:
+    display = pg.display.get_surface()
+    if display is None:
+        return None
+    return display.get_bitsize(), display.get_masks()
+
+
+class AssetCache:
+    def __init__(
+        self, directory: str = os.path.join(".cache", "assets")
+    ) -> None:
+        self.directory = directory
+
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source: str, params: Hashable) -> str:
+        digest = hashlib.sha1(f"{VERSION}:{params!r}".encode())
+        with open(source, "rb") as file:
+            digest.update(file.read())
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.img")
+
+    def read(self, path: str) -> pg.Surface | None:
+        try:
+            with open(path, "rb") as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            return None
+
+        if len(data) < HEADER.size:
+            data.close()
+            return None
+
+        magic, w, h, alpha = HEADER.unpack_from(data)
+        if magic != MAGIC or len(data) != HEADER.size + w * h * 4:
+            data.close()
+            return None
+
+        image = pg.image.frombuffer(
+            memoryview(data)[HEADER.size :], (w, h), "BGRA"
+        )
+        if not alpha:
+            image.set_alpha(None)
+        return image
+
+    def write(self, path: str, image: pg.Surface) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+        alpha = image.get_flags() & pg.SRCALPHA
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "wb") as file:
+            file.write(HEADER.pack(MAGIC, *image.get_size(), bool(alpha)))
+            file.write(pg.image.tobytes(image, "BGRA"))
+        os.replace(temp, path)
+
+    def fetch(self, source: str, params: Hashable) -> pg.Surface | None:
+        image = self.read(self.path(self.key(source, params)))
+        if image is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return image
+
+    def store(self, source: str, params: Hashable, image: pg.Surface) -> None:
+        try:
+            self.write(self.path(self.key(source, params)), image)
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+
+        for name in os.listdir(self.directory):
+            if name.endswith(".img"):
+                os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,148 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Hashable, TypeVar
+
+import pygame as pg
+
+from .asset_cache import display_format
+from .utilities import decode_image, finish_image, image_names, load_audio
+
+
+T = TypeVar("T")
+
+
+class AssetManager:
+    def __init__(self) -> None:
+        self.assets: dict[Hashable, Future] = {}
+        self.lock = threading.Lock()
+        self.format = display_format()
+
+        self.requests = 0
+        self.loads = 0
+
+        self.worker: threading.Thread | None = None
+        self.error: BaseException | None = None
+
+    def get(self, key: Hashable, loader: Callable[[], T]) -> T:
+        with self.lock:
+            self.requests += 1
+            future = self.assets.get(key)
+            owner = future is None
+            if owner:
+                future = self.assets[key] = Future()
+
+        if owner:
+            try:
+                future.set_result(loader())
+            except BaseException as error:
+                with self.lock:
+                    del self.assets[key]
+                future.set_exception(error)
+                raise
+            with self.lock:
+                self.loads += 1
+
+        return future.result()
+
+    def target(self, alpha: bool, convert: bool) -> Hashable:
+        return (alpha, self.format) if convert else None
+
+    def decode(
+        self,
+        image_path: str,
+        alpha: bool = False,
+        scale: float | tuple[float, float] = 1,
+        convert: bool = True,
+        size: tuple[int, int] | None = None,
+        flip: bool = False,
+    ) -> tuple[pg.Surface, bool]:
+        target = self.target(alpha, convert)
+        return self.get(
+            ("decoded", image_path, scale, size, flip, target),
+            lambda: decode_image(image_path, scale, size, flip, target),
+        )
+
+    def decode_all(
+        self,
+        image_path: str,
+        alpha: bool = False,
+        scale: float | tuple[float, float] = 1,
+        convert: bool = True,
+        flip: bool = False,
+    ) -> None:
+        for image in image_names(image_path):
+            self.decode(image, alpha, scale, convert, flip=flip)
+
+    def image(
+        self,
+        image_path: str,
+        colorkey: pg.Color,
+        alpha: bool = False,
+        scale: float | tuple[float, float] = 1,
+        convert: bool = True,
+        size: tuple[int, int] | None = None,
+        flip: bool = False,
+    ) -> pg.Surface:
+        target = self.target(alpha, convert)
+        return self.get(
+            ("image", image_path, colorkey, alpha, scale, convert, size, flip),
+            lambda: finish_image(
+                image_path,
+                *self.decode(image_path, alpha, scale, convert, size, flip),
+                colorkey,
+                alpha,
+                scale,
+                size,
+                flip,
+                target,
+            ),
+        )
+
+    def images(
+        self,
+        image_path: str,
+        colorkey: pg.Color,
+        alpha: bool = False,
+        scale: float | tuple[float, float] = 1,
+        convert: bool = True,
+        flip: bool = False,
+    ) -> list[pg.Surface]:
+        return self.get(
+            ("images", image_path, colorkey, alpha, scale, convert, flip),
+            lambda: [
+                self.image(image, colorkey, alpha, scale, convert, flip=flip)
+                for image in image_names(image_path)
+            ],
+        )
+
+    def sound(self, audio_path: str, volume: float = 1.0) -> pg.Sound:
+        return self.get(
+            ("sound", audio_path, volume),
+            lambda: load_audio(audio_path, volume),
+        )
+
+    def font(self, name: str | None, size: int) -> pg.Font:
+        return self.get(("font", name, size), lambda: pg.Font(name, size))
+
+    def preload(self, job: Callable[[], None]) -> None:
+        def run() -> None:
+            try:
+                job()
+            except BaseException as error:
+                self.error = error
+
+        self.worker = threading.Thread(target=run, daemon=True)
+        self.worker.start()
+
+    @property
+    def ready(self) -> bool:
+        return self.worker is None or not self.worker.is_alive()
+
+    def wait(self) -> None:
+        if self.worker is not None:
+            self.worker.join()
+            self.worker = None
+
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
@@ -0,0 +1,96 @@
+from typing import Hashable
+
+import pygame as pg
+from pygame.typing import ColorLike
+
+
+class Atlas:
+    def __init__(
+        self,
+        page_size: tuple[int, int] = (1024, 1024),
+        padding: int = 1,
+        colorkey: ColorLike = "white",
+    ) -> None:
+        self.page_size = page_size
+        self.padding = padding
+        self.colorkey = colorkey
+
+        self.pages: list[pg.Surface] = []
+        self.regions: dict[Hashable, tuple[int, pg.Rect]] = {}
+
+    def _place(
+        self, sizes: list[tuple[Hashable, int, int]]
+    ) -> tuple[dict[Hashable, tuple[int, pg.Rect]], list[int]]:
+        page_w, page_h = self.page_size
+        pad = self.padding
+
+        regions = {}
+        heights = [0]
+        x = y = shelf = 0
+        for key, w, h in sorted(sizes, key=lambda size: -size[2]):
+            if w + pad > page_w or h + pad > page_h:
+                raise ValueError(f"{key!r} does not fit in an atlas page")
+
+            if x + w + pad > page_w:
+                x, y, shelf = 0, y + shelf, 0
+            if y + h + pad > page_h:
+                heights.append(0)
+                x = y = shelf = 0
+
+            page = len(heights) - 1
+            regions[key] = page, pg.Rect(x + pad, y + pad, w, h)
+            x += w + pad
+            shelf = max(shelf, h + pad)
+            heights[page] = max(heights[page], y + shelf + pad)
+
+        return regions, heights
+
+    def add(self, images: dict[Hashable, pg.Surface]) -> None:
+        for key, image in images.items():
+            if image.get_flags() & pg.SRCALPHA:
+                raise ValueError(f"{key!r} has per-pixel alpha")
+
+        regions, heights = self._place(
+            [(key, *image.get_size()) for key, image in images.items()]
+        )
+
+        first = len(self.pages)
+        for height in heights:
+            page = pg.Surface((self.page_size[0], height))
+            page.fill(self.colorkey)
+            self.pages.append(page)
+
+        for key, (page, rect) in regions.items():
+            self.pages[first + page].blit(images[key], rect)
+            self.regions[key] = first + page, rect
+
+        for i in range(first, len(self.pages)):
+            self.pages[i].set_colorkey(self.colorkey)
+            if pg.display.get_surface() is not None:
+                self.pages[i] = self.pages[i].convert()
+
+    def image(self, key: Hashable) -> pg.Surface:
+        page, rect = self.regions[key]
+        return self.pages[page].subsurface(rect)
+
+    def pack(
+        self, images: dict[str, pg.Surface | list[pg.Surface]]
+    ) -> dict[str, pg.Surface | list[pg.Surface]]:
+        flat = {}
+        for name, image in images.items():
+            if isinstance(image, list):
+                flat.update(
+                    {(name, i): frame for i, frame in enumerate(image)}
+                )
+            else:
+                flat[name] = image
+        self.add(flat)
+
+        return {
+            name: (
+                [self.image((name, i)) for i in range(len(image))]
+                if isinstance(image, list)
+                else self.image(name)
+            )
+            for name, image in images.items()
+        }
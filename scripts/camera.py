@@ -1,24 +1,50 @@
 import pygame as pg
+from pygame.typing import Point
 
 
 class Camera:
-    def __init__(
-        self,
-        focus: pg.sprite.Sprite,
-        background_pos: pg.Vector2,
-    ) -> None:
-        self.focus = focus
-        self.background_pos = background_pos
-        self.screen_size = pg.Vector2(pg.display.get_surface().get_size())
-
-    def apply_offset(
-        self, all_sprites: pg.sprite.Group
-    ) -> tuple[pg.sprite.Group, pg.Vector2]:
-        for entity in all_sprites:
-            entity.position -= self.focus.velocity
-
-        self.background_pos -= self.focus.velocity
-
-        self.focus.position = self.screen_size // 2
-
-        return all_sprites, self.background_pos
+    def __init__(self, screen_size: Point, world: pg.Rect) -> None:
+        self.world = world.copy()
+        self.viewport = pg.Rect((0, 0), screen_size)
+        self.viewport.center = self.world.center
+        self.clamp()
+
+        self.moved = False
+        self.previous = self.viewport.topleft
+
+    def clamp(self) -> None:
+        view, world = self.viewport, self.world
+        view.x = max(min(view.x, world.right - view.w), world.left)
+        view.y = max(min(view.y, world.bottom - view.h), world.top)
+
+    def follow(self, target: Point) -> None:
+        previous = self.viewport.topleft
+        self.viewport.center = round(target[0]), round(target[1])
+        self.clamp()
+        self.moved = self.viewport.topleft != previous
+
+    def capture(self) -> None:
+        self.previous = self.viewport.topleft
+
+    def lerp(self, alpha: float) -> tuple[int, int]:
+        x, y = self.previous
+        return (
+            round(x + (self.viewport.x - x) * alpha),
+            round(y + (self.viewport.y - y) * alpha),
+        )
+
+    @property
+    def offset(self) -> tuple[int, int]:
+        return -self.viewport.x, -self.viewport.y
+
+    def world_to_screen(self, pos: Point) -> pg.Vector2:
+        return pg.Vector2(pos[0] - self.viewport.x, pos[1] - self.viewport.y)
+
+    def screen_to_world(self, pos: Point) -> pg.Vector2:
+        return pg.Vector2(pos[0] + self.viewport.x, pos[1] + self.viewport.y)
+
+    def rect_to_screen(self, rect: pg.Rect) -> pg.Rect:
+        return rect.move(-self.viewport.x, -self.viewport.y)
+
+    def visible(self, rect: pg.Rect) -> bool:
+        return self.viewport.colliderect(rect)
@@ -0,0 +1,30 @@
+from typing import Callable
+
+import pygame as pg
+
+
+class SimulatedClock:
+    def __init__(self, start: float = 0) -> None:
+        self.ticks = start
+
+    def get_ticks(self) -> int:
+        return int(self.ticks)
+
+    def advance(self, ms: float) -> None:
+        self.ticks += ms
+
+
+_source: Callable[[], int] = pg.time.get_ticks
+
+
+def get_ticks() -> int:
+    return _source()
+
+
+def get_source() -> Callable[[], int]:
+    return _source
+
+
+def set_source(source: Callable[[], int] | None) -> None:
+    global _source
+    _source = source if source is not None else pg.time.get_ticks
@@ -0,0 +1,310 @@
+import heapq
+import math
+from typing import Iterable
+
+import numpy as np
+
+from .pathfinder import SQRT2, Node
+from .tilemap import TileMap, as_tilemap
+
+
+NEIGHBOURS = (
+    (-1, 0, 1.0),
+    (1, 0, 1.0),
+    (0, -1, 1.0),
+    (0, 1, 1.0),
+    (-1, -1, SQRT2),
+    (-1, 1, SQRT2),
+    (1, -1, SQRT2),
+    (1, 1, SQRT2),
+)
+INF = math.inf
+
+
+class DStarLite:
+    def __init__(
+        self,
+        matrix: "TileMap | np.ndarray | list",
+        radius: int = 32,
+        slack: int = 2,
+        horizon: int = 48,
+    ) -> None:
+        self.map = as_tilemap(matrix)
+        self.radius = radius
+        self.slack = slack
+        self.horizon = horizon
+
+        self.side = side = 2 * radius + 3
+        self.blank = [INF] * (side * side)
+        self.empty = [None] * (side * side)
+        self.walk = bytearray(side * side)
+        self.g = self.blank.copy()
+        self.rhs = self.blank.copy()
+        self.queued: list[tuple[float, float] | None] = self.empty.copy()
+        self.heap: list[tuple[tuple[float, float], int]] = []
+        self.offsets = tuple(
+            (dx + dy * side, cost) for dx, dy, cost in NEIGHBOURS
+        )
+
+        self.origin = 0, 0
+        self.root: tuple[int, int] | None = None
+        self.root_index = -1
+        self.goal: tuple[int, int] | None = None
+        self.goal_index = -1
+        self.goal_local = 0, 0
+        self.start: tuple[int, int] | None = None
+        self.km = 0.0
+
+        self.full: list[Node] = []
+        self.index = 0
+        self.path: list[Node] = []
+
+        self.expansions = 0
+        self.resets = 0
+        self.repairs = 0
+
+    def _index(self, cell: tuple[int, int]) -> int:
+        ox, oy = self.origin
+        return (cell[1] - oy) * self.side + cell[0] - ox
+
+    def _aim(self, goal: tuple[int, int]) -> None:
+        ox, oy = self.origin
+        self.goal = goal
+        self.goal_index = self._index(goal)
+        self.goal_local = goal[0] - ox, goal[1] - oy
+
+    def _heuristic(self, a: tuple[int, int], b: tuple[int, int]) -> float:
+        dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+        return dx + dy + (SQRT2 - 2) * min(dx, dy)
+
+    def _key(self, cell: int) -> tuple[float, float]:
+        g, rhs = self.g[cell], self.rhs[cell]
+        best = g if g < rhs else rhs
+        y, x = divmod(cell, self.side)
+        gx, gy = self.goal_local
+        dx, dy = abs(gx - x), abs(gy - y)
+        h = dx + dy + (SQRT2 - 2) * min(dx, dy)
+        return round(best + h + self.km, 9), best
+
+    def _update(self, cell: int) -> None:
+        if self.g[cell] != self.rhs[cell]:
+            key = self._key(cell)
+            self.queued[cell] = key
+            heapq.heappush(self.heap, (key, cell))
+        else:
+            self.queued[cell] = None
+
+    def _lookahead(self, cell: int) -> float:
+        if cell == self.root_index:
+            return 0.0
+        walk = self.walk
+        if not walk[cell]:
+            return INF
+
+        g = self.g
+        best = INF
+        for offset, cost in self.offsets:
+            neighbour = cell + offset
+            if walk[neighbour] and cost + g[neighbour] < best:
+                best = cost + g[neighbour]
+        return best
+
+    def _top(self) -> tuple[tuple[float, float], int] | None:
+        heap, queued = self.heap, self.queued
+        while heap:
+            key, cell = heap[0]
+            if queued[cell] == key:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
+
+    def _compute(self) -> None:
+        g, rhs, walk, queued = self.g, self.rhs, self.walk, self.queued
+        offsets, goal, km = self.offsets, self.goal_index, self.km
+        while True:
+            top = self._top()
+            if top is None:
+                return
+            reached = min(g[goal], rhs[goal])
+            if top[0] >= (round(reached + km, 9), reached) and (
+                rhs[goal] <= g[goal]
+            ):
+                return
+
+            old, cell = top
+            self.expansions += 1
+            new = self._key(cell)
+            if old < new:
+                queued[cell] = new
+                heapq.heappush(self.heap, (new, cell))
+                continue
+
+            best = rhs[cell]
+            if g[cell] > best:
+                g[cell] = best
+                queued[cell] = None
+                for offset, cost in offsets:
+                    neighbour = cell + offset
+                    if walk[neighbour] and cost + best < rhs[neighbour]:
+                        rhs[neighbour] = cost + best
+                        self._update(neighbour)
+            else:
+                g[cell] = INF
+                for offset, _ in offsets:
+                    neighbour = cell + offset
+                    if walk[neighbour]:
+                        rhs[neighbour] = self._lookahead(neighbour)
+                        self._update(neighbour)
+                rhs[cell] = self._lookahead(cell)
+                self._update(cell)
+
+    def _extract(self) -> list[Node]:
+        g, walk, side = self.g, self.walk, self.side
+        cell = self.goal_index
+        if self.rhs[cell] == INF:
+            return []
+
+        ox, oy = self.origin
+        path = [Node(*self.goal)]
+        for _ in range(side * side):
+            if cell == self.root_index:
+                break
+
+            best, step = INF, None
+            for offset, cost in self.offsets:
+                neighbour = cell + offset
+                if walk[neighbour] and cost + g[neighbour] < best:
+                    best, step = cost + g[neighbour], neighbour
+            if step is None:
+                return []
+
+            cell = step
+            y, x = divmod(cell, side)
+            path.append(Node(x + ox, y + oy))
+        path.reverse()
+        return path
+
+    def _locate(self, start: tuple[int, int]) -> int | None:
+        best, nearest = self.slack + 1, None
+        for index in range(self.index, min(len(self.full), self.horizon)):
+            node = self.full[index]
+            distance = max(abs(node.x - start[0]), abs(node.y - start[1]))
+            if distance <= best:
+                best, nearest = distance, index
+        return nearest
+
+    def reset(self, root: tuple[int, int]) -> None:
+        side, radius = self.side, self.radius
+        ox, oy = root[0] - radius - 1, root[1] - radius - 1
+        walk = self.map.region(oy, ox, oy + side, ox + side)
+        walk[[0, -1]] = walk[:, [0, -1]] = False
+        self.walk[:] = walk.tobytes()
+
+        self.origin = ox, oy
+        self.root = root
+        self.root_index = self._index(root)
+        self.walk[self.root_index] = True
+        self.km = 0.0
+        self.g[:] = self.blank
+        self.rhs[:] = self.blank
+        self.rhs[self.root_index] = 0.0
+        self.queued[:] = self.empty
+        self.heap.clear()
+        self.full = []
+        self.index = 0
+        self.resets += 1
+        if self.goal is not None:
+            self._aim(self.goal)
+            self._update(self.root_index)
+
+    def clear(self) -> None:
+        self.root = self.goal = self.start = None
+        self.heap.clear()
+        self.full, self.path = [], []
+        self.index = 0
+
+    def update_cells(self, cells: Iterable[tuple[int, int]]) -> None:
+        if self.root is None:
+            return
+
+        side, walk = self.side, self.walk
+        ox, oy = self.origin
+        touched = set()
+        for x, y in cells:
+            if not (0 < x - ox < side - 1 and 0 < y - oy < side - 1):
+                continue
+            cell = self._index((x, y))
+            walk[cell] = self.map.walkable(x, y) or (x, y) == self.root
+            touched.add(cell)
+            touched.update(cell + offset for offset, _ in self.offsets)
+
+        for cell in touched:
+            self.rhs[cell] = self._lookahead(cell)
+            self._update(cell)
+        self.full = []
+        self.repairs += 1
+
+    def update(self, start: tuple[int, int], goal: tuple[int, int]) -> bool:
+        if max(
+            abs(goal[0] - start[0]), abs(goal[1] - start[1])
+        ) > self.radius or not self.map.walkable(*goal):
+            changed = bool(self.path)
+            self.full, self.path = [], []
+            return changed
+
+        if self.root is None or (
+            max(abs(goal[0] - self.root[0]), abs(goal[1] - self.root[1]))
+            > self.radius
+        ):
+            self.goal = goal
+            self.reset(start)
+
+        changed = not self.full
+        if goal != self.goal:
+            self.km += self._heuristic(self.goal, goal)
+            self._aim(goal)
+            self.repairs += 1
+            changed = True
+
+        if changed:
+            self._compute()
+            self.full = self._extract()
+            self.index = 0
+        elif start == self.start:
+            return False
+
+        self.start = start
+        index = self._locate(start)
+        if index is None:
+            if self.root != start:
+                self.reset(start)
+                self._compute()
+                self.full = self._extract()
+                changed = True
+            index = 0
+
+        if changed or index != self.index:
+            self.index = index
+            self.path = self.full[index:]
+        return changed
+
+
+class PlannerPool:
+    def __init__(
+        self, matrix: "TileMap | np.ndarray | list", **options
+    ) -> None:
+        self.map = as_tilemap(matrix)
+        self.options = options
+        self.free: list[DStarLite] = []
+        self.created = 0
+
+    def acquire(self) -> DStarLite:
+        if self.free:
+            return self.free.pop()
+
+        self.created += 1
+        return DStarLite(self.map, **self.options)
+
+    def release(self, planner: DStarLite) -> None:
+        planner.clear()
+        self.free.append(planner)
@@ -1,50 +1,40 @@
-from itertools import cycle
 from numpy import ndarray
 import pygame as pg
 
-from pathfinding.core.grid import Grid, GridNode
-from pathfinding.core.diagonal_movement import DiagonalMovement
-from pathfinding.finder.a_star import AStarFinder
-
 from typing import Iterable
-from .utilities import get_random_position
+from .animation import Animation
+from .clock import get_ticks
+from .dstar_lite import DStarLite, PlannerPool
+from .flow_field import FlowField
+from .hierarchy import Route
+from .input_source import InputSource
+from .line_of_sight import LineOfSight
+from .navigation import PathCache
+from .path_scheduler import PathRequest, PathScheduler
+from .pathfinder import Node
+from .tilemap import TileMap, as_tilemap
+from .walkability import WalkabilityIndex
 
 
 class Entity(pg.sprite.Sprite):
     def __init__(
         self,
         pos: list[int],
-        image: pg.Surface | dict[str, list[pg.Surface]],
+        image: pg.Surface | dict[str, list[pg.Surface]] | Animation,
         speed: float,
         frame_delay: int = 250,
     ) -> None:
         super().__init__()
 
-        self.animations: dict[str, cycle] = {}
-        self.flipped_animations: dict[str, cycle] = {}
-
-        self.image_iter: cycle | None = None
-        self.state = "idle"
+        self.animation = (
+            image if isinstance(image, Animation) else Animation(image)
+        )
+        self.state = self.animation.default
         self._flipped = False
 
-        if isinstance(image, pg.Surface):
-            self.image = image
-            self.flipped_image = pg.transform.flip(image, True, False)
-        elif isinstance(image, dict):
-            for state, frames in image.items():
-                self.animations[state] = cycle(frames)
-                self.flipped_animations[state] = cycle(
-                    [pg.transform.flip(frame, True, False) for frame in frames]
-                )
-
-            self.state = next(iter(image))
-            self.image_iter = self.animations[self.state]
-            self.image = next(self.image_iter)
-
-        else:
-            raise TypeError(
-                "image must be Surface or dict[str, list[Surface]]"
-            )
+        self.frames = self.animation.get(self.state)
+        self.frame_index = 0
+        self.image = self.frames[0]
 
         self.rect = self.image.get_rect(center=pos)
         self.position = pg.Vector2(pos)
@@ -52,28 +42,21 @@ class Entity(pg.sprite.Sprite):
 
         self.base_speed = speed
         self.frame_delay = frame_delay
-        self.frame_timer = pg.time.get_ticks()
+        self.frame_start = get_ticks()
 
     def set_flipped(self, flipped: bool) -> None:
         if self._flipped != flipped:
             self._flipped = flipped
-            if self.image_iter:
-                animations = (
-                    self.flipped_animations if flipped else self.animations
-                )
-                self.image_iter = animations[self.state]
-                self.image = next(self.image_iter)
+            self.frames = self.animation.get(self.state, flipped)
+            self.image = self.frames[self.frame_index]
 
     def set_state(self, state: str) -> None:
-        animations = (
-            self.flipped_animations if self._flipped else self.animations
-        )
-
-        if state != self.state and state in animations:
+        if state != self.state and state in self.animation.frames:
             self.state = state
-            self.image_iter = animations[state]
-            self.image = next(self.image_iter)
-            self.frame_timer = pg.time.get_ticks()
+            self.frames = self.animation.get(state, self._flipped)
+            self.frame_index = 0
+            self.image = self.frames[0]
+            self.frame_start = get_ticks()
 
     def update(self, dt: float) -> None:
         if self.velocity.length() >= 1:
@@ -82,13 +65,8 @@ class Entity(pg.sprite.Sprite):
         self.position += self.velocity * self.base_speed * dt
         self.rect.center = self.position
 
-        if self.image_iter:
-            if pg.time.get_ticks() - self.frame_timer >= self.frame_delay:
-                self.image = next(self.image_iter)
-                self.frame_timer = pg.time.get_ticks()
-
-    def draw(self, screen: pg.Surface) -> None:
-        screen.blit(self.image, self.rect)
+    def draw(self, screen: pg.Surface) -> pg.Rect:
+        return screen.blit(self.image, self.rect)
 
     def clamp(
         self, pos: pg.Vector2, min_pos: pg.Vector2, max_pos: pg.Vector2
@@ -109,29 +87,33 @@ class Player(Entity):
     def __init__(
         self,
         pos: list[int],
-        image: pg.Surface | Iterable[pg.Surface],
+        image: pg.Surface | Iterable[pg.Surface] | Animation,
         base_speed: int,
-        matrix: list | ndarray,
+        matrix: TileMap | list | ndarray,
         tile_x: int,
         tile_y: int,
         rows: int,
         cols: int,
         frame_delay: float = 0.2,
+        input_source: InputSource | None = None,
     ) -> None:
         super().__init__(pos, image, base_speed, frame_delay)
+        self.input = (
+            input_source if input_source is not None else InputSource()
+        )
         self.ammo = 24
         self.moved = False
         self.kill_count = 0
 
         self.rows, self.cols = rows, cols
-        self.matrix = matrix
+        self.matrix = as_tilemap(matrix, tile_x, tile_y)
         self.tile_x, self.tile_y = tile_x, tile_y
 
     def update(self, dt: float, bg_rect: pg.Rect) -> None:
         super().update(dt)
 
         up, down, left, right = False, False, False, False
-        keys = pg.key.get_pressed()
+        keys = self.input.keys_pressed()
 
         velocity = pg.Vector2()
 
@@ -154,7 +136,7 @@ class Player(Entity):
         row = int(pos.y // self.tile_y)
 
         if 0 <= row < self.rows and 0 <= col < self.cols:
-            if self.matrix[row][col] == 0:
+            if not self.matrix.walkable(col, row):
                 velocity = pg.Vector2()
                 pos = self.position
 
@@ -173,21 +155,27 @@ class Player(Entity):
         )
         self.moved = up or down or left or right
 
-    def draw(self, screen: pg.Surface):
-        super().draw(screen)
+    def draw(self, screen: pg.Surface) -> pg.Rect:
+        return super().draw(screen)
 
 
 class Enemy(Entity):
     def __init__(
         self,
         pos: list[int],
-        image: pg.Surface | Iterable[pg.Surface],
+        image: pg.Surface | Iterable[pg.Surface] | Animation,
         base_speed: int,
-        matrix: list | ndarray,
+        matrix: TileMap | list | ndarray,
         tile_x: int,
         tile_y: int,
         rows: int,
         cols: int,
+        walkability: WalkabilityIndex,
+        path_cache: PathCache,
+        flow_field: FlowField | None = None,
+        path_scheduler: PathScheduler | None = None,
+        sight: LineOfSight | None = None,
+        planners: PlannerPool | None = None,
         frame_delay: float = 0.2,
         max_health: int = 4,
     ) -> None:
@@ -196,12 +184,21 @@ class Enemy(Entity):
         self.rows, self.cols = rows, cols
         self.matrix = matrix
         self.tile_x, self.tile_y = tile_x, tile_y
-
-        self.grid = Grid(matrix=self.matrix)
-        self.finder = AStarFinder(diagonal_movement=DiagonalMovement.always)
+        self.walkability = walkability
+        self.flow_field = flow_field
+        self.sight = sight
+        self.planners = planners
+        self.planner: DStarLite | None = None
+        self.planned: list[Node] | None = None
+
+        self.path_cache = path_cache
+        self.path_scheduler = path_scheduler
+        self.pending: PathRequest | None = None
+        self.pending_dest = pg.Vector2()
+        self.route: Route | None = None
 
         self.arrived = []
-        self.path: list[list[GridNode, ...], str] = []
+        self.path: list[list[Node, ...], str] = []
         self.target_pos = pg.Vector2()
 
         self.max_health = max_health
@@ -214,19 +211,81 @@ class Enemy(Entity):
 
     def find_path(
         self, target_pos: pg.Vector2, reason: str
-    ) -> list[GridNode, str]:
-        self.start = self.grid.node(
-            min(int(self.position.x // self.tile_x), self.rows - 1),
-            min(int(self.position.y // self.tile_y), self.cols - 1),
-        )
-        self.end = self.grid.node(
-            min(int(target_pos.x // self.tile_x), self.rows - 1),
-            min(int(target_pos.y // self.tile_y), self.cols - 1),
+    ) -> list[Node, str]:
+        self.route = self.path_cache.route(
+            self.path_cache.key(self.position, target_pos)
         )
-        path, _ = self.finder.find_path(self.start, self.end, self.grid)
+        if self.route is not None:
+            return [self.path_cache.smooth(self.route.next_segment()), reason]
+
+        path = self.path_cache.find_path(self.position, target_pos)
 
         return [path, reason]
 
+    def request_path(self, target_pos: pg.Vector2, reason: str) -> None:
+        if self.path_scheduler is None:
+            self.path = self.find_path(target_pos, reason)
+            return
+
+        key = self.path_cache.key(self.position, target_pos)
+        if (
+            self.pending is not None
+            and self.pending.reason == reason
+            and (reason == "roam" or self.pending.key[1] == key[1])
+        ):
+            return
+
+        self.pending = self.path_scheduler.submit(
+            self, self.position, target_pos, reason
+        )
+        self.pending_dest = pg.Vector2(target_pos)
+        if not self.path:
+            self.path = [[], reason]
+
+        self.receive_path()
+
+    def replan(self, target: Entity) -> bool:
+        if self.planners is None:
+            return False
+        if self.planner is None:
+            self.planner = self.planners.acquire()
+
+        changed = self.planner.update(
+            self.path_cache.tile_of(self.position),
+            self.path_cache.tile_of(target.position),
+        )
+        if not self.planner.path:
+            return False
+
+        if changed or self.path[0] is not self.planned or not self.path[0]:
+            self.cancel_path()
+            self.planned = self.path_cache.smooth(list(self.planner.path))
+            self.path = [self.planned, "chase"]
+        return True
+
+    def release_planner(self) -> None:
+        if self.planner is not None:
+            self.planners.release(self.planner)
+            self.planner = None
+            self.planned = None
+
+    def receive_path(self) -> None:
+        if self.pending is None:
+            return
+
+        if self.pending.done:
+            self.path = [self.pending.path, self.pending.reason]
+            self.route = self.pending.route
+            self.pending = None
+        elif self.pending.cancelled:
+            self.pending = None
+
+    def cancel_path(self) -> None:
+        if self.path_scheduler is not None:
+            self.path_scheduler.cancel(self)
+        self.pending = None
+        self.route = None
+
     def update(
         self, dt: float, max_rect: pg.Rect, target: Entity, chase_distance: int
     ) -> None:
@@ -235,19 +294,24 @@ class Enemy(Entity):
             self.position, pg.Vector2(), pg.Vector2(max_rect.size)
         )
 
+        self.plan(target, chase_distance)
+        self.steer()
+
+    def plan(self, target: Entity, chase_distance: int) -> None:
+        self.receive_path()
+
+        if self.route is not None and self.path and not self.path[0]:
+            self.path[0] = self.path_cache.smooth(self.route.next_segment())
+            if not self.route.remaining:
+                self.route = None
+
         if not self.path:
             roam_dest = pg.Vector2(
-                get_random_position(
-                    self.position,
-                    self.image.get_size(),
-                    0,
-                    max_rect,
-                    self.matrix,
-                    self.tile_x,
-                    self.tile_y,
+                self.walkability.random_position(
+                    self.position, self.image.get_size(), 0
                 )
             )
-            self.path = self.find_path(roam_dest, "roam")
+            self.request_path(roam_dest, "roam")
         else:
             roam_dest = []
 
@@ -263,30 +327,46 @@ class Enemy(Entity):
             target_to_end_dist = float("inf")
 
         if distance < chase_distance:
-            if (
+            if self.sight is not None and self.sight.clear(
+                self.position, target.position
+            ):
+                step = Node(
+                    int(target.position.x // self.tile_x),
+                    int(target.position.y // self.tile_y),
+                )
+            elif self.flow_field is not None:
+                step = self.flow_field.next_tile(self.position)
+            else:
+                step = None
+
+            if step is not None:
+                self.cancel_path()
+                self.path = [[step], "chase"]
+            elif self.planners is not None:
+                if not self.replan(target) and (
+                    self.path[1] != "chase" or len(self.path[0]) == 0
+                ):
+                    self.request_path(target.position, "chase")
+            elif (
                 self.path[1] != "chase"
                 or len(self.path[0]) == 0
                 or target_to_end_dist >= 120
             ):
-                self.path = self.find_path(target.position, "chase")
+                self.request_path(target.position, "chase")
 
         else:
+            self.release_planner()
             if self.path[1] != "roam" or len(self.path[0]) == 0:
                 roam_dest = pg.Vector2(
                     roam_dest
                     if roam_dest
-                    else get_random_position(
-                        self.position,
-                        self.image.get_size(),
-                        0,
-                        max_rect,
-                        self.matrix,
-                        self.tile_x,
-                        self.tile_y,
+                    else self.walkability.random_position(
+                        self.position, self.image.get_size(), 0
                     )
                 )
-                self.path = self.find_path(roam_dest, "roam")
+                self.request_path(roam_dest, "roam")
 
+    def steer(self) -> None:
         if self.path[0]:
             point = self.path[0][0]
             self.target_pos = pg.Vector2(
@@ -301,26 +381,62 @@ class Enemy(Entity):
 
             if self.rect.collidepoint(self.target_pos):
                 self.path[0].pop(0)
+        elif self.pending is not None:
+            direction = self.pending_dest - self.position
+            if self.pending.reason == "roam":
+                self.velocity = direction * 0.3
+            else:
+                self.velocity = direction * 1
 
+    def update_health_bar(self) -> None:
         ratio = self.health / self.max_health
 
         self.health_bar.center = (self.rect.centerx, self.rect.top - 12)
         self.health_bar.width = self.image.get_width() * ratio
         self.health_bar_outline.center = self.health_bar.center
 
-        if ratio > 0.75:
-            self.health_bar_colour = "green"
-        elif ratio > 0.50:
-            self.health_bar_colour = "orange"
-        elif ratio > 0.25:
-            self.health_bar_colour = "yellow"
-        else:
-            self.health_bar_colour = "red"
+        self.health_bar_colour = health_colour(ratio)
 
-    def draw(self, screen):
-        super().draw(screen)
-        pg.draw.rect(screen, self.health_bar_colour, self.health_bar)
-        pg.draw.rect(screen, "black", self.health_bar_outline, 3)
+    def draw(self, screen: pg.Surface) -> pg.Rect:
+        rect = super().draw(screen)
+        self.update_health_bar()
+        return rect.unionall(
+            (
+                pg.draw.rect(screen, self.health_bar_colour, self.health_bar),
+                pg.draw.rect(screen, "black", self.health_bar_outline, 3),
+            )
+        )
 
     def collision(self, collide_rect: pg.Rect) -> bool:
         return self.rect.colliderect(collide_rect)
+
+
+def health_colour(ratio: float) -> str:
+    if ratio > 0.75:
+        return "green"
+    elif ratio > 0.50:
+        return "orange"
+    elif ratio > 0.25:
+        return "yellow"
+    return "red"
+
+
+def health_bar_images(width: int, max_health: int) -> list[pg.Surface]:
+    outline = pg.Rect(0, 0, width, 10).inflate(3, 3)
+    outline.topleft = 0, 0
+
+    images = []
+    for health in range(max_health + 1):
+        ratio = health / max_health
+        image = pg.Surface(outline.size)
+        image.fill("white")
+
+        bar = pg.Rect(0, 0, width * ratio, 10)
+        bar.center = outline.center
+        pg.draw.rect(image, health_colour(ratio), bar)
+        pg.draw.rect(image, "black", outline, 3)
+
+        image.set_colorkey("white")
+        images.append(image)
+
+    return images
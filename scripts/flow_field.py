@@ -0,0 +1,178 @@
+import math
+
+import numpy as np
+import pygame as pg
+
+from pygame.typing import Point
+
+from .tilemap import TileMap, as_tilemap
+
+
+NEIGHBOURS = (
+    (-1, 0, 1.0),
+    (1, 0, 1.0),
+    (0, -1, 1.0),
+    (0, 1, 1.0),
+    (-1, -1, math.sqrt(2)),
+    (-1, 1, math.sqrt(2)),
+    (1, -1, math.sqrt(2)),
+    (1, 1, math.sqrt(2)),
+)
+
+
+class FlowField:
+    def __init__(
+        self,
+        matrix: "TileMap | np.ndarray | list",
+        tile_x: int,
+        tile_y: int,
+        radius: int = 64,
+    ) -> None:
+        self.map = as_tilemap(matrix, tile_x, tile_y)
+        self.rows, self.cols = self.map.rows, self.map.cols
+        self.tile_x, self.tile_y = tile_x, tile_y
+        self.radius = radius
+
+        self.target_tile: tuple[int, int] | None = None
+        self.dirty = False
+        self.recomputes = 0
+
+        self.window = (0, 0, 0, 0)
+        self.walkable = np.zeros((0, 0), bool)
+        self.distance = np.zeros((0, 0))
+        self.next_row = np.zeros((0, 0), np.int32)
+        self.next_col = np.zeros((0, 0), np.int32)
+
+    def tile_of(self, pos: Point) -> tuple[int, int]:
+        return (
+            min(max(int(pos[0] // self.tile_x), 0), self.cols - 1),
+            min(max(int(pos[1] // self.tile_y), 0), self.rows - 1),
+        )
+
+    def set_target(self, pos: Point) -> None:
+        tile = self.tile_of(pos)
+        if tile != self.target_tile:
+            self.target_tile = tile
+            self.dirty = True
+
+    def _neighbour_view(self, padded: np.ndarray, dy: int, dx: int):
+        rows, cols = self.walkable.shape
+        return padded[1 + dy : 1 + dy + rows, 1 + dx : 1 + dx + cols]
+
+    def _frame(self) -> tuple[int, int, int, int]:
+        col, row = self.target_tile
+        radius = self.radius
+        col0, row0 = max(col - radius, 0), max(row - radius, 0)
+        return (
+            col0,
+            row0,
+            min(col + radius + 1, self.cols),
+            min(row + radius + 1, self.rows),
+        )
+
+    def compute(self) -> None:
+        window = self._frame()
+        if window != self.window:
+            col0, row0, col1, row1 = window
+            self.window = window
+            self.walkable = self.map.region(row0, col0, row1, col1)
+
+        col0, row0 = self.window[:2]
+        col, row = self.target_tile
+        col, row = col - col0, row - row0
+        rows, cols = self.walkable.shape
+        padded = np.full((rows + 2, cols + 2), np.inf)
+        dist = padded[1:-1, 1:-1]
+        dist[row, col] = 0
+
+        while True:
+            relaxed = dist.copy()
+            for dy, dx, cost in NEIGHBOURS:
+                np.minimum(
+                    relaxed,
+                    self._neighbour_view(padded, dy, dx) + cost,
+                    out=relaxed,
+                )
+
+            relaxed[~self.walkable] = np.inf
+            relaxed[row, col] = 0
+            if np.array_equal(relaxed, dist):
+                break
+
+            dist[...] = relaxed
+
+        candidates = np.stack(
+            [
+                self._neighbour_view(padded, dy, dx) + cost
+                for dy, dx, cost in NEIGHBOURS
+            ]
+        )
+        best = candidates.argmin(axis=0)
+        offsets = np.array([(dy, dx) for dy, dx, _ in NEIGHBOURS])
+        has_step = np.take_along_axis(candidates, best[None], 0)[0] < np.inf
+        has_step &= np.isfinite(dist)
+        has_step[row, col] = False
+
+        local_rows, local_cols = np.indices((rows, cols))
+        self.distance = dist.copy()
+        self.next_row = np.where(
+            has_step, local_rows + offsets[best, 0] + row0, -1
+        )
+        self.next_col = np.where(
+            has_step, local_cols + offsets[best, 1] + col0, -1
+        )
+
+        self.dirty = False
+        self.recomputes += 1
+
+    def next_tile(self, pos: Point) -> pg.Vector2 | None:
+        if self.target_tile is None:
+            return None
+        if self.dirty:
+            self.compute()
+
+        col, row = self.tile_of(pos)
+        if (col, row) == self.target_tile:
+            return pg.Vector2(col, row)
+
+        col0, row0, col1, row1 = self.window
+        if not (col0 <= col < col1 and row0 <= row < row1):
+            return None
+
+        next_row = self.next_row[row - row0, col - col0]
+        if next_row < 0:
+            return None
+
+        return pg.Vector2(self.next_col[row - row0, col - col0], next_row)
+
+    def next_tiles(self, positions: np.ndarray) -> np.ndarray:
+        if self.dirty:
+            self.compute()
+
+        cols = np.clip(positions[:, 0] // self.tile_x, 0, self.cols - 1)
+        rows = np.clip(positions[:, 1] // self.tile_y, 0, self.rows - 1)
+        cols, rows = cols.astype(np.intp), rows.astype(np.intp)
+
+        col0, row0, col1, row1 = self.window
+        if self.walkable.shape == (self.rows, self.cols):
+            next_cols = self.next_col[rows, cols]
+            next_rows = self.next_row[rows, cols]
+        else:
+            inside = (
+                (cols >= col0) & (cols < col1) & (rows >= row0) & (rows < row1)
+            )
+            local_rows = np.where(inside, rows - row0, 0)
+            local_cols = np.where(inside, cols - col0, 0)
+            next_cols = np.where(
+                inside, self.next_col[local_rows, local_cols], -1
+            )
+            next_rows = np.where(
+                inside, self.next_row[local_rows, local_cols], -1
+            )
+
+        at_target = (cols == self.target_tile[0]) & (
+            rows == self.target_tile[1]
+        )
+        next_cols = np.where(at_target, cols, next_cols)
+        next_rows = np.where(at_target, rows, next_rows)
+        return np.stack((next_cols, next_rows), axis=1)
@@ -1,22 +1,36 @@
 import numpy as np
 import pygame as pg
 
+from itertools import chain
 import random
-
-from scripts.utilities import (
-    get_random_position,
-    load_image,
-    load_images,
-    load_audio,
-)
+import time
+
+from scripts.clock import get_ticks
+from scripts.input_source import InputSource
+from scripts.profiler import Profiler
+from scripts.assets import AssetManager
+from scripts.game_assets import GameAssets
+from scripts.camera import Camera
+from scripts.tilemap import TileMap, as_tilemap
+from scripts.walkability import WalkabilityIndex
+from scripts.flow_field import FlowField
+from scripts.dstar_lite import PlannerPool
+from scripts.hierarchy import HierarchicalPathfinder
+from scripts.hud import Hud
+from scripts.line_of_sight import LineOfSight
+from scripts.navigation import PathCache
+from scripts.path_scheduler import PathScheduler
+from scripts.spatial_hash import SpatialHash
 from scripts.entities import Player, Enemy
-from scripts.objects import Bullet, Obtainable_Item, Gun
+from scripts.swarm import EnemySwarm
+from scripts.objects import BulletPool, Obtainable_Item, Gun
+from scripts.render_queue import RenderQueue
 
 
 class Game:
     def __init__(
         self,
-        matrix: np.ndarray | list,
+        matrix: TileMap | np.ndarray | list,
         tile_x: int,
         tile_y: int,
         rows: int,
@@ -24,48 +38,57 @@ class Game:
         screen: pg.Surface,
         game_start_delay: int,
         bg_rect: pg.Rect,
+        wave_mode: bool = False,
+        input_source: InputSource | None = None,
+        headless: bool = False,
+        profiler: Profiler | None = None,
+        assets: AssetManager | None = None,
     ) -> None:
-        self.matrix = matrix
+        self.matrix = matrix = as_tilemap(matrix, tile_x, tile_y)
         self.tile_x, self.tile_y = tile_x, tile_y
         self.rows, self.cols = rows, cols
 
         pg.init()
 
+        self.headless = headless
+        self.input = (
+            input_source if input_source is not None else InputSource()
+        )
+        self.profiler = profiler if profiler is not None else Profiler()
+        self.assets = assets if assets is not None else AssetManager()
+
         self.screen = screen
         self.w, self.h = self.screen.get_size()
 
         self.bg_rect = bg_rect
+        self.camera = Camera(self.screen.get_size(), bg_rect)
+        self.walkability = WalkabilityIndex(matrix, tile_x, tile_y, bg_rect)
+        self.flow_field = FlowField(matrix, tile_x, tile_y)
+        self.hierarchy = HierarchicalPathfinder(matrix)
+        self.sight = LineOfSight(matrix, tile_x, tile_y)
+        self.path_cache = PathCache(
+            matrix, tile_x, tile_y, hierarchy=self.hierarchy, sight=self.sight
+        )
+        self.path_scheduler = PathScheduler(matrix, self.path_cache)
+        self.planners = PlannerPool(matrix)
+
+        media = GameAssets(self.assets, headless)
+        self.images = media.images
+        self.atlas = media.atlas
+        self.health_bar_offset = media.health_bar_offset
+        self.render_queue = RenderQueue()
+        self.rifle_rotations = media.rifle_rotations
+        self.bullet_rotations = media.bullet_rotations
+        self.audio = media.audio
+        self.fps_font = media.fps_font
+        self.animations = media.animations
 
-        self.images = {
-            "player_idle": load_images("player/idle", "white", scale=(5, 6)),
-            "player_running": load_images(
-                "player/running", "white", scale=(5, 6)
-            ),
-            "enemy": load_image("enemy.png", "white", scale=1.1),
-            "rifle": load_image("guns/rifle.png", "white", scale=2.75),
-            "bullet": load_image("bullet.png", "white", scale=2),
-            "ammo": load_image("ammo.png", "white"),
-        }
-        self.audio = {
-            "gunshot": load_audio("gunshot.ogg", 0.4),
-            "empty_gun": load_audio("empty_gun.ogg", 0.7),
-            "reload": load_audio("reload.ogg", 0.7),
-        }
-
-        self.images["ammo"] = pg.transform.scale(self.images["ammo"], (60, 54))
-
-        self.fps_font = pg.Font(size=33)
         self.clock = pg.time.Clock()
+        self.mousepos = self.input.mouse_pos()
 
-        self.mousepos = pg.mouse.get_pos()
-
-        self.player_images = {
-            "idle": self.images["player_idle"],
-            "running": self.images["player_running"],
-        }
         self.player = Player(
             [self.w // 2, self.h // 2],
-            self.player_images,
+            self.animations["player"],
             6,
             matrix,
             tile_x,
@@ -73,190 +96,261 @@ class Game:
             rows,
             cols,
             250,
+            self.input,
         )
-        self.rifle = Gun(self.images["rifle"], self.player.rect.center)
-        self.enemy = Enemy(
-            get_random_position(
-                self.player.position,
-                self.images["enemy"].get_size(),
-                325,
-                self.bg_rect,
-                matrix,
-                tile_x,
-                tile_y,
-            ),
-            self.images["enemy"],
-            self.player.base_speed - 1,
-            matrix,
-            tile_x,
-            tile_y,
-            rows,
-            cols,
+        self.rifle = Gun(
+            self.images["rifle"],
+            self.player.rect.center,
+            self.input,
+            self.rifle_rotations,
+            self.camera,
         )
 
-        self.all_sprites = pg.sprite.Group(self.player, self.rifle, self.enemy)
-        self.bullets = pg.sprite.Group()
+        self.all_sprites = pg.sprite.Group(self.player, self.rifle)
+        self.enemies = pg.sprite.Group()
+        self.swarm = EnemySwarm(
+            self.flow_field, tile_x, tile_y, sight=self.sight
+        )
+        self.spatial = SpatialHash(tile_x * 2, tile_y * 4)
+        self.spatial.insert(self.player)
+        self.bullets = BulletPool(
+            self.images["bullet"], 25, rotations=self.bullet_rotations
+        )
         self.ammos = pg.sprite.Group()
 
-        self.bullet_cooldown = pg.time.get_ticks()
-        self.ammo_delay = pg.time.get_ticks()
-        self.new_enemy_delay = pg.time.get_ticks()
+        self.bullet_cooldown = get_ticks()
+        self.ammo_delay = get_ticks()
+        self.new_enemy_delay = get_ticks()
         self.game_start_delay = game_start_delay
 
         self.running = True
         self.spawn_new_enemy = False
+        self.chase_distance = 425
+
+        self.wave_mode = wave_mode
+        self.wave_start = get_ticks()
+        self.wave_ramp = 2000
+        self.max_wave_enemies = 300
+        self.max_spawns_per_frame = 16
+        self.update_time = 0.0
+        self.alpha = 1.0
+        self.player_previous = self.player.position.copy()
+        self.invulnerable = False
+        self.player_chunk: np.ndarray | None = None
+        self.enemy_chunks: np.ndarray | None = None
+        self.sound_counts: dict[str, int] = {}
+        self.random = random.Random()
+
+        self.spawn_enemies(1)
 
         self.prev_fps = 0
         self.fps_text = pg.Surface((10, 10))
 
-        self.prev_ammo = 0
-        self.ammo_text = pg.Surface((10, 10))
+        self.hud = Hud(self.fps_font, wave_mode)
 
-        self.prev_kills = 0
-        self.kills_text = pg.Surface((10, 10))
+    def reseed(self, seed: int) -> None:
+        self.random.seed(seed)
+        self.walkability.rng = np.random.default_rng(seed)
 
     def reset(self) -> None:
+        now = get_ticks()
+        self.path_scheduler.clear()
         self.all_sprites.empty()
-        self.bullets.empty()
+        self.bullets.clear()
         self.ammos.empty()
+        for enemy in self.enemies:
+            enemy.release_planner()
+        self.enemies.empty()
+        self.swarm.clear()
+        self.spatial.clear()
 
         self.player.kill_count = 0
         self.player.ammo = 24
         self.player.position.update([self.w // 2, self.h // 2])
         self.player.set_flipped(False)
+        self.player.set_state("idle")
+        self.player.frame_start = now
+        self.player.rect.center = self.player.position
+        self.camera.follow(self.player.position)
         self.all_sprites.add(self.player)
+        self.spatial.insert(self.player)
 
-        self.spawn_enemy()
+        self.spawn_new_enemy = False
+        self.wave_start = now
+        self.bullet_cooldown = self.ammo_delay = self.new_enemy_delay = now
+        self.spawn_enemies(1)
 
         self.all_sprites.add(self.rifle)
 
-        self.prev_ammo = 0
-        self.ammo_text = pg.Surface((10, 10))
+        self.hud.reset()
+
+        self.capture()
+
+    def capture(self) -> None:
+        self.player_previous = self.player.position.copy()
+        self.camera.capture()
+        self.swarm.capture()
+        self.bullets.capture()
 
-        self.prev_kills = 0
-        self.kills_text = pg.Surface((10, 10))
+    def play_sound(self, name: str) -> None:
+        self.sound_counts[name] = self.sound_counts.get(name, 0) + 1
+        if not self.headless:
+            self.audio[name].play()
 
     def shoot(self) -> None:
-        self.mousepos = pg.mouse.get_pos()
-
-        if pg.time.get_ticks() - self.bullet_cooldown >= 170:
-            bullet = Bullet(
-                self.images["bullet"],
-                self.player.position.xy,
-                self.rifle.angle,
-                25,
-            )
+        self.mousepos = self.input.mouse_pos()
+
+        if get_ticks() - self.bullet_cooldown >= 170:
+            self.bullets.spawn(self.player.position.xy, self.rifle.angle)
             self.player.ammo -= 1
-            self.bullets.add(bullet)
-            self.all_sprites.add(bullet)
-            self.bullet_cooldown = pg.time.get_ticks()
+            self.bullet_cooldown = get_ticks()
 
-            sound = self.audio["gunshot"]
-            sound.play()
+            self.play_sound("gunshot")
 
     def spawn_ammo(self) -> None:
         if len(self.ammos) < 4:
             ammo = Obtainable_Item(
                 self.images["ammo"],
-                get_random_position(
-                    pg.Vector2(),
-                    self.images["ammo"].get_size(),
-                    0,
-                    self.bg_rect,
-                    self.matrix,
-                    self.tile_x,
-                    self.tile_y,
+                self.walkability.random_position(
+                    self.player.position, self.images["ammo"].get_size(), 0
                 ),
             )
             self.all_sprites.add(ammo)
             self.ammos.add(ammo)
+            self.spatial.insert(ammo)
 
-    def spawn_enemy(self) -> None:
-        self.enemy = Enemy(
-            get_random_position(
-                self.player.position,
-                self.images["enemy"].get_size(),
-                325,
-                self.bg_rect,
+    def spawn_enemies(self, count: int) -> None:
+        positions = self.walkability.random_positions(
+            self.player.position, self.images["enemy"].get_size(), 325, count
+        )
+        for pos in positions.tolist():
+            enemy = Enemy(
+                pos,
+                self.animations["enemy"],
+                self.player.base_speed - 1,
                 self.matrix,
                 self.tile_x,
                 self.tile_y,
-            ),
-            self.images["enemy"],
-            self.player.base_speed - 1,
-            self.matrix,
-            self.tile_x,
-            self.tile_y,
-            self.rows,
-            self.cols,
-        )
-        self.enemy.add(self.all_sprites)
+                self.rows,
+                self.cols,
+                self.walkability,
+                self.path_cache,
+                self.flow_field,
+                self.path_scheduler,
+                self.sight,
+                self.planners,
+            )
+            enemy.add(self.all_sprites, self.enemies)
+            self.spatial.insert(enemy)
+            self.swarm.add(enemy)
+
         self.spawn_new_enemy = False
 
-    def manage_hit(self) -> None:
-        self.enemy.health -= 1
-        if self.enemy.health <= 0:
+    def wave_target(self) -> int:
+        elapsed = get_ticks() - self.wave_start
+        return min(self.max_wave_enemies, 1 + elapsed // self.wave_ramp)
+
+    def manage_hit(self, enemy: Enemy) -> None:
+        enemy.health -= 1
+        if enemy.health <= 0:
             self.player.kill_count += 1
-            self.enemy.kill()
+            enemy.cancel_path()
+            enemy.release_planner()
+            enemy.kill()
+            self.spatial.remove(enemy)
+            self.swarm.remove(enemy)
 
-            self.new_enemy_delay = pg.time.get_ticks()
-            self.spawn_new_enemy = True
-            self.enemy = None
+            if not self.enemies:
+                self.new_enemy_delay = get_ticks()
+                self.spawn_new_enemy = True
 
     def update(self, dt: float) -> bool:
+        start = time.perf_counter()
+        self.capture()
+        running = self.step(dt)
+        self.update_time = time.perf_counter() - start
+        return running
+
+    def step(self, dt: float) -> bool:
         self.dt = dt
 
-        if pg.time.get_ticks() - self.game_start_delay <= 250:
+        if get_ticks() - self.game_start_delay <= 250:
             return True
 
-        self.mousepos = pg.mouse.get_pos()
+        self.mousepos = self.input.mouse_pos()
 
-        if self.enemy is not None:
-            if self.enemy.collision(self.player.rect):
+        if not self.invulnerable:
+            if self.spatial.query_rect(self.player.rect, Enemy):
                 return False
 
-        if pg.time.get_ticks() - self.ammo_delay >= 6700:
+        if get_ticks() - self.ammo_delay >= 6700:
             self.spawn_ammo()
-            self.ammo_delay = pg.time.get_ticks()
+            self.ammo_delay = get_ticks()
 
-        for ammo in self.ammos:
+        for ammo in self.spatial.query_rect(self.player.rect, Obtainable_Item):
             if ammo.collision(self.player.rect):
                 self.all_sprites.remove(ammo)
                 self.ammos.remove(ammo)
+                self.spatial.remove(ammo)
                 self.player.ammo += 12
 
-                sound = self.audio["reload"]
-                sound.play()
+                self.play_sound("reload")
 
-        if pg.mouse.get_pressed() == (1, 0, 0):
+        if self.input.mouse_pressed() == (1, 0, 0):
             if self.player.ammo >= 1:
                 self.shoot()
             else:
-                sound = self.audio["empty_gun"]
-                sound.play()
-
-        for bullet in self.bullets:
-            if self.enemy is None:
-                break
+                self.play_sound("empty_gun")
 
-            bullet.update(self.bg_rect, self.dt)
-            if bullet.hit(self.enemy.rect):
-                self.manage_hit()
-                bullet.kill()
-
-        if self.spawn_new_enemy:
-            if pg.time.get_ticks() - self.new_enemy_delay >= random.randint(
+        with self.profiler.scope("bullets"):
+            self.bullets.update(self.bg_rect, self.dt)
+            live = self.bullets.live()
+            hits, enemies = self.spatial.overlaps(
+                self.bullets.rects(live), Enemy
+            )
+            for bullet, enemy in zip(live[hits], enemies):
+                if enemy.health > 0:
+                    self.manage_hit(enemy)
+                    self.bullets.kill([bullet])
+
+        if self.wave_mode:
+            missing = self.wave_target() - len(self.enemies)
+            if missing > 0:
+                self.spawn_enemies(min(missing, self.max_spawns_per_frame))
+        elif self.spawn_new_enemy:
+            if get_ticks() - self.new_enemy_delay >= self.random.randint(
                 250, 5000
             ):
-                self.spawn_enemy()
+                self.spawn_enemies(1)
 
         self.player.update(self.dt, self.bg_rect)
+        self.camera.follow(self.player.position)
         self.rifle.update(
             self.player.position,
         )
 
-        if self.enemy is not None:
-            self.enemy.update(self.dt, self.bg_rect, self.player, 425)
+        self.flow_field.set_target(self.player.position)
+        if not self.matrix.complete:
+            positions = self.swarm.positions[self.swarm.alive]
+            chunks = self.matrix.chunk_of(positions)
+            player_chunk = self.matrix.chunk_of(self.player.position)
+            if not (
+                np.array_equal(player_chunk, self.player_chunk)
+                and np.array_equal(chunks, self.enemy_chunks)
+            ):
+                self.player_chunk, self.enemy_chunks = player_chunk, chunks
+                self.matrix.touch((self.player.position,), positions)
+
+        self.spatial.move(self.player)
+        with self.profiler.scope("enemies"):
+            self.swarm.update(
+                self.dt, self.bg_rect, self.player, self.chase_distance
+            )
+            for enemy in self.enemies:
+                self.spatial.move(enemy)
+
+        with self.profiler.scope("pathfinding"):
+            self.path_scheduler.process()
 
         if self.player.moved:
             self.player.set_state("running")
@@ -268,27 +362,70 @@ class Game:
         else:
             self.player.set_flipped(False)
 
-        return True
-
-    def render(self, display: pg.Surface) -> None:
-        for entity in self.all_sprites:
-            entity.draw(display)
-
-        ammo = f"Ammo: {self.player.ammo}"
-        if ammo != self.prev_ammo:
-            self.ammo_text = self.fps_font.render(ammo, True, "white")
+        self.animations.advance(chain((self.player,), self.enemies))
 
-        self.prev_ammo = ammo
-
-        display.blit(self.ammo_text, (5, 50))
-
-        kills = f"Kills: {self.player.kill_count}"
-        if kills != self.prev_kills:
-            self.kills_text = self.fps_font.render(kills, True, "white")
-
-        self.prev_kills = kills
+        return True
 
-        display.blit(
-            self.kills_text,
-            (5, 0),
+    def visible_sprites(self) -> tuple[list[Obtainable_Item], list[Enemy]]:
+        view = self.camera.viewport
+        if view.contains(self.bg_rect):
+            return list(self.ammos), list(self.enemies)
+
+        ammos, enemies = [], []
+        bounds = view.inflate(0, self.health_bar_offset[1] * 2)
+        for sprite in self.spatial.query_rect(bounds):
+            if isinstance(sprite, Enemy):
+                enemies.append(sprite)
+            elif isinstance(sprite, Obtainable_Item):
+                ammos.append(sprite)
+        enemies.sort(key=lambda enemy: enemy.rect.bottom)
+
+        return ammos, enemies
+
+    def render(self, display: pg.Surface) -> list[pg.Rect]:
+        queue = self.render_queue
+        view = self.camera.viewport.copy()
+        view.topleft = self.camera.lerp(self.alpha)
+        x, y = -view.x, -view.y
+        ammos, enemies = self.visible_sprites()
+
+        lag = (self.player_previous - self.player.position) * (1 - self.alpha)
+        lag_x, lag_y = round(lag.x), round(lag.y)
+
+        rects = []
+        for sprite in (self.player, self.rifle):
+            rect = sprite.rect.move(x + lag_x, y + lag_y)
+            queue.add(sprite.image, rect)
+            rects.append(rect)
+
+        for ammo in ammos:
+            rect = ammo.rect.move(x, y)
+            queue.add(ammo.image, rect)
+            rects.append(rect)
+
+        bars = self.images["health_bars"]
+        bar_w, bar_h = bars[0].get_size()
+        offset_x, offset_y = self.health_bar_offset
+        slots = self.swarm.slots
+        lags = self.swarm.lag(self.alpha).tolist()
+        for enemy in enemies:
+            lag_x, lag_y = lags[slots[enemy]]
+            rect = enemy.rect.move(x + lag_x, y + lag_y)
+            dest = rect.centerx - offset_x, rect.top - offset_y
+            queue.add(enemy.image, rect)
+            queue.add(bars[enemy.health], dest)
+            rects.append(rect.union((*dest, bar_w, bar_h)))
+
+        blits, bullet_rects = self.bullets.blits(view, self.alpha)
+        queue.extend(blits)
+        rects += bullet_rects
+
+        queue.flush(display)
+
+        return rects + self.hud.render(
+            display,
+            self.player.ammo,
+            self.player.kill_count,
+            len(self.enemies),
+            self.update_time,
         )
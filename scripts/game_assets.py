@@ -0,0 +1,98 @@
+import pygame as pg
+
+from .animation import AnimationBank
+from .assets import AssetManager
+from .atlas import Atlas
+from .entities import health_bar_images
+from .rotations import RotationAtlas
+
+
+IMAGES = {
+    "player_idle": ("images", "player/idle", {"scale": (5, 6)}),
+    "player_running": ("images", "player/running", {"scale": (5, 6)}),
+    "player_idle_flipped": (
+        "images",
+        "player/idle",
+        {"scale": (5, 6), "flip": True},
+    ),
+    "player_running_flipped": (
+        "images",
+        "player/running",
+        {"scale": (5, 6), "flip": True},
+    ),
+    "enemy": ("image", "enemy.png", {"scale": 1.1}),
+    "enemy_flipped": ("image", "enemy.png", {"scale": 1.1, "flip": True}),
+    "rifle": ("image", "guns/rifle.png", {"scale": 2.75}),
+    "bullet": ("image", "bullet.png", {"scale": 2}),
+    "ammo": ("image", "ammo.png", {"size": (60, 54)}),
+}
+SOUNDS = {
+    "gunshot": ("gunshot.ogg", 0.4),
+    "empty_gun": ("empty_gun.ogg", 0.7),
+    "reload": ("reload.ogg", 0.7),
+}
+
+
+def prefetch(assets: AssetManager, headless: bool = False) -> None:
+    for kind, path, options in IMAGES.values():
+        if kind == "images":
+            assets.decode_all(path, convert=not headless, **options)
+        else:
+            assets.decode(path, convert=not headless, **options)
+
+    if not headless:
+        for path, volume in SOUNDS.values():
+            assets.sound(path, volume)
+
+
+class GameAssets:
+    def __init__(self, assets: AssetManager, headless: bool = False) -> None:
+        self.images = {
+            name: getattr(assets, kind)(
+                path, "white", convert=not headless, **options
+            )
+            for name, (kind, path, options) in IMAGES.items()
+        }
+        self.images["health_bars"] = health_bar_images(
+            self.images["enemy"].get_width(), 4
+        )
+        self.atlas = Atlas()
+        if not headless:
+            self.images = self.atlas.pack(self.images)
+
+        outline = self.images["health_bars"][0].get_rect()
+        self.health_bar_offset = outline.w // 2, 12 + outline.h // 2
+
+        atlas = self.atlas if not headless else None
+        self.rifle_rotations = RotationAtlas(
+            self.images["rifle"], 3, True, atlas, "rifle"
+        )
+        self.bullet_rotations = RotationAtlas(
+            self.images["bullet"], 1, False, atlas, "bullet"
+        )
+
+        self.audio: dict[str, pg.Sound] = (
+            {}
+            if headless
+            else {
+                name: assets.sound(path, volume)
+                for name, (path, volume) in SOUNDS.items()
+            }
+        )
+        self.fps_font = assets.font(None, 33)
+
+        self.animations = AnimationBank()
+        self.animations.add(
+            "player",
+            {
+                "idle": self.images["player_idle"],
+                "running": self.images["player_running"],
+            },
+            {
+                "idle": self.images["player_idle_flipped"],
+                "running": self.images["player_running_flipped"],
+            },
+        )
+        self.animations.add(
+            "enemy", self.images["enemy"], self.images["enemy_flipped"]
+        )
@@ -44,10 +44,14 @@ class Button:
 
         return clicked
 
-    def draw(self, screen: pg.Surface) -> None:
-        screen.blit(self.image, self.rect)
+    def draw(self, screen: pg.Surface) -> pg.Rect:
+        rect = screen.blit(self.image, self.rect)
         if self.show_outline:
-            pg.draw.rect(screen, "black", self.surround_rect, 4)
+            rect = rect.union(
+                pg.draw.rect(screen, "black", self.surround_rect, 4)
+            )
+
+        return rect
 
 
 class DropDown:
@@ -129,18 +133,22 @@ class DropDown:
 
         return False
 
-    def draw(self, screen: pg.Surface) -> None:
-        pg.draw.rect(screen, self.bg_colour, self.name_surround_rect)
+    def draw(self, screen: pg.Surface) -> list[pg.Rect]:
+        rects = [pg.draw.rect(screen, self.bg_colour, self.name_surround_rect)]
         pg.draw.rect(screen, self.colour, self.name_surround_rect, 2)
-        screen.blit(self.name_surf, self.name_button.rect)
+        rects.append(screen.blit(self.name_surf, self.name_button.rect))
 
-        pg.draw.rect(screen, self.bg_colour, self.main_option_rect)
+        rects.append(
+            pg.draw.rect(screen, self.bg_colour, self.main_option_rect)
+        )
         pg.draw.rect(screen, self.colour, self.main_option_rect, 2)
-        self.main_option_button.draw(screen)
+        rects.append(self.main_option_button.draw(screen))
 
         if self.open:
             for button in self.option_buttons:
                 rect = button.surround_rect
-                pg.draw.rect(screen, self.bg_colour, rect)
+                rects.append(pg.draw.rect(screen, self.bg_colour, rect))
+
+                rects.append(button.draw(screen))
 
-                button.draw(screen)
+        return rects
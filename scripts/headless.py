@@ -0,0 +1,125 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse  # noqa: E402
+import time  # noqa: E402
+from typing import Callable  # noqa: E402
+
+import numpy as np  # noqa: E402
+import pygame as pg  # noqa: E402
+
+from scripts import clock  # noqa: E402
+from scripts.game import Game  # noqa: E402
+from scripts.input_source import ScriptedInput  # noqa: E402
+from scripts.tilemap import TileMap, load_map  # noqa: E402
+
+
+class HeadlessRunner:
+    def __init__(
+        self,
+        matrix: TileMap | np.ndarray | list,
+        tile_x: int,
+        tile_y: int,
+        rows: int,
+        cols: int,
+        input_source: ScriptedInput | None = None,
+        script: Callable[[int, ScriptedInput, Game], None] | None = None,
+        wave_mode: bool = False,
+        size: tuple[int, int] = (1280, 720),
+        fps: int = 60,
+    ) -> None:
+        pg.init()
+
+        self.clock = clock.SimulatedClock()
+        clock.set_source(self.clock.get_ticks)
+
+        self.input = (
+            input_source if input_source is not None else ScriptedInput()
+        )
+        self.script = script
+        self.frame_ms = 1000 / fps
+        self.dt = self.frame_ms / 1000 * 60
+
+        screen = pg.Surface(size)
+        self.game = Game(
+            matrix,
+            tile_x,
+            tile_y,
+            rows,
+            cols,
+            screen,
+            0,
+            screen.get_rect(),
+            wave_mode,
+            self.input,
+            headless=True,
+        )
+
+        self.frame = 0
+        self.games_over = 0
+        self.reset()
+
+    def reset(self) -> None:
+        self.game.reset()
+        self.game.game_start_delay = self.clock.get_ticks() - 250
+
+    def step(self) -> bool:
+        if self.script is not None:
+            self.script(self.frame, self.input, self.game)
+
+        self.clock.advance(self.frame_ms)
+        running = self.game.update(self.dt)
+        self.frame += 1
+
+        if not running:
+            self.games_over += 1
+            self.reset()
+
+        return running
+
+    def run(self, frames: int) -> dict[str, float]:
+        start = time.perf_counter()
+        for _ in range(frames):
+            self.step()
+        elapsed = time.perf_counter() - start
+
+        return {
+            "frames": frames,
+            "seconds": elapsed,
+            "fps": frames / elapsed if elapsed else float("inf"),
+            "games_over": self.games_over,
+        }
+
+    def close(self) -> None:
+        clock.set_source(None)
+        self.game.path_scheduler.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the game headless.")
+    parser.add_argument("--frames", type=int, default=10000)
+    parser.add_argument("--waves", action="store_true")
+    args = parser.parse_args()
+
+    world = load_map(os.path.join("assets", "arena.map"))
+    runner = HeadlessRunner(
+        world,
+        world.tile_x,
+        world.tile_y,
+        world.rows,
+        world.cols,
+        wave_mode=args.waves,
+    )
+    stats = runner.run(args.frames)
+    runner.close()
+
+    print(
+        f"{stats['frames']} frames in {stats['seconds']:.2f}s "
+        f"({stats['fps']:.0f} fps, {stats['games_over']} games over)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,417 @@
+from collections import deque
+import heapq
+import threading
+
+import numpy as np
+
+from .pathfinder import SQRT2, Node, Pathfinder
+from .tilemap import TileMap, as_tilemap
+
+
+SEGMENT = 1e6
+SPLIT_LENGTH = 6
+
+
+def spread(
+    row: np.ndarray,
+    wall: np.ndarray,
+    forward: np.ndarray,
+    backward: np.ndarray,
+) -> np.ndarray:
+    row = np.minimum.accumulate(row + wall - forward, axis=1) + forward
+    row[row >= SEGMENT / 2] = np.inf
+    row = row[:, ::-1] + wall[:, ::-1] - backward
+    row = np.minimum.accumulate(row, axis=1) + backward
+    row[row >= SEGMENT / 2] = np.inf
+    return row[:, ::-1] + wall
+
+
+def sweep(walk: np.ndarray, dist: np.ndarray, limit: int = 64) -> None:
+    blocked = np.ascontiguousarray(~walk.transpose(1, 0, 2))
+    index = np.arange(walk.shape[2])
+    wall = np.where(blocked, np.inf, 0.0)
+    forward = np.cumsum(blocked, axis=2) * SEGMENT + index
+    backward = np.cumsum(blocked[:, :, ::-1], axis=2) * SEGMENT + index
+
+    field = np.ascontiguousarray(dist.transpose(1, 0, 2))
+    rows = len(field)
+    for _ in range(limit):
+        before = field.copy()
+        for order in (range(rows), range(rows - 1, -1, -1)):
+            previous = None
+            for r in order:
+                row = field[r]
+                if previous is not None:
+                    row = np.minimum(row, previous + 1)
+                    diagonal = previous + SQRT2
+                    np.minimum(row[:, 1:], diagonal[:, :-1], out=row[:, 1:])
+                    np.minimum(row[:, :-1], diagonal[:, 1:], out=row[:, :-1])
+
+                field[r] = previous = spread(
+                    row, wall[r], forward[r], backward[r]
+                )
+
+        if np.array_equal(before, field):
+            break
+
+    dist[...] = field.transpose(1, 0, 2)
+
+
+def entrances(both: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    padded = np.zeros((both.shape[0], both.shape[1] + 2), np.int8)
+    padded[:, 1:-1] = both
+    edges = np.diff(padded, axis=1)
+    groups, starts = np.nonzero(edges == 1)
+    ends = np.nonzero(edges == -1)[1]
+
+    short = ends - starts < SPLIT_LENGTH
+    middles = starts + (ends - starts - 1) // 2
+    return (
+        np.concatenate((groups[short], groups[~short], groups[~short])),
+        np.concatenate((middles[short], starts[~short], ends[~short] - 1)),
+    )
+
+
+class Route:
+    def __init__(
+        self,
+        hierarchy: "HierarchicalPathfinder",
+        waypoints: list[tuple[int, int]],
+    ) -> None:
+        self.hierarchy = hierarchy
+        self.waypoints = waypoints
+        self.index = 0
+
+    @property
+    def remaining(self) -> int:
+        return max(len(self.waypoints) - 1 - self.index, 0)
+
+    def next_segment(self) -> list[Node]:
+        path: list[Node] = []
+        size = self.hierarchy.size
+        while self.remaining:
+            a = self.waypoints[self.index]
+            b = self.waypoints[self.index + 1]
+            segment = self.hierarchy.refine(a, b)
+            if not segment:
+                self.index = len(self.waypoints)
+                return path
+
+            path += segment if self.index == 0 else segment[1:]
+            self.index += 1
+            if (a[0] // size, a[1] // size) == (b[0] // size, b[1] // size):
+                break
+
+        return path
+
+
+class HierarchicalPathfinder:
+    def __init__(
+        self,
+        matrix: "TileMap | np.ndarray | list",
+        cluster_size: int = 16,
+        min_distance: int = 64,
+        block: int = 2,
+        weight: float = 1.1,
+    ) -> None:
+        self.map = as_tilemap(matrix)
+        self.rows, self.cols = self.map.rows, self.map.cols
+        self.size = cluster_size
+        self.cluster_rows = -(-self.rows // cluster_size)
+        self.cluster_cols = -(-self.cols // cluster_size)
+        self.min_distance = min_distance
+        self.block = block
+        self.weight = weight
+
+        self.finder = Pathfinder(self.map, margin=0)
+        self.lock = threading.Lock()
+
+        self.nodes: dict[tuple[int, int], int] = {}
+        self.xs: list[int] = []
+        self.ys: list[int] = []
+        self.edges: list[list[tuple[int, float]]] = []
+        self.clusters: dict[tuple[int, int], list[int]] = {}
+        self.borders: set[tuple[int, int, bool]] = set()
+        self.pending = deque(
+            (x, y)
+            for y in range(0, self.cluster_rows, block)
+            for x in range(0, self.cluster_cols, block)
+        )
+
+        self.built = 0
+        self.expansions = 0
+        self.refined = 0
+
+    def _node(self, x: int, y: int) -> int:
+        node = self.nodes.get((x, y))
+        if node is None:
+            node = self.nodes[x, y] = len(self.xs)
+            self.xs.append(x)
+            self.ys.append(y)
+            self.edges.append([])
+            self.clusters.setdefault(
+                (x // self.size, y // self.size), []
+            ).append(node)
+        return node
+
+    def _link(
+        self, sources: list[int], targets: list[int], costs: list[float]
+    ) -> None:
+        edges = self.edges
+        for source, target, cost in zip(sources, targets, costs):
+            edges[source].append((target, cost))
+
+    def _border(self, x: int, y: int, vertical: bool) -> None:
+        neighbour = (x + 1, y) if vertical else (x, y + 1)
+        if (
+            x < 0
+            or y < 0
+            or neighbour[0] >= self.cluster_cols
+            or neighbour[1] >= self.cluster_rows
+            or (x, y, vertical) in self.borders
+        ):
+            return
+        self.borders.add((x, y, vertical))
+
+        size = self.size
+        if vertical:
+            col, top = (x + 1) * size - 1, y * size
+            strip = self.map.region(top, col, top + size, col + 2)
+            _, rows = entrances((strip[:, 0] & strip[:, 1])[None])
+            first = [self._node(col, top + row) for row in rows.tolist()]
+            second = [self._node(col + 1, top + row) for row in rows.tolist()]
+        else:
+            row, left = (y + 1) * size - 1, x * size
+            strip = self.map.region(row, left, row + 2, left + size)
+            _, cols = entrances((strip[0] & strip[1])[None])
+            first = [self._node(left + col, row) for col in cols.tolist()]
+            second = [self._node(left + col, row + 1) for col in cols.tolist()]
+
+        ones = [1.0] * len(first)
+        self._link(first, second, ones)
+        self._link(second, first, ones)
+
+    def _expand(self, x0: int, y0: int) -> None:
+        block, size = self.block, self.size
+        x1 = min(x0 + block, self.cluster_cols)
+        y1 = min(y0 + block, self.cluster_rows)
+        for cluster_row in range(y0, y1):
+            for cluster_col in range(x0, x1):
+                for border in (
+                    (cluster_col - 1, cluster_row, True),
+                    (cluster_col, cluster_row, True),
+                    (cluster_col, cluster_row - 1, False),
+                    (cluster_col, cluster_row, False),
+                ):
+                    self._border(*border)
+
+        walk = self.map.region(y0 * size, x0 * size, y1 * size, x1 * size)
+        jobs = []
+        for cluster_row in range(y0, y1):
+            top = (cluster_row - y0) * size
+            job = self._intra(walk[top : top + size], cluster_row, x0)
+            if job is not None:
+                jobs.append(job)
+        if jobs:
+            self._link(*(values.tolist() for values in self._solve(jobs)))
+        self.built += (x1 - x0) * (y1 - y0)
+
+    def _intra(
+        self, walk: np.ndarray, cluster_row: int, col0: int = 0
+    ) -> tuple | None:
+        size = self.size
+        groups = [
+            (cluster_col, self.clusters[col0 + cluster_col, cluster_row])
+            for cluster_col in range(walk.shape[1] // size)
+            if (col0 + cluster_col, cluster_row) in self.clusters
+        ]
+        if not groups:
+            return None
+
+        cluster_cols = np.array([col for col, _ in groups])
+        counts = np.array([len(nodes) for _, nodes in groups])
+        nodes = np.array([node for _, group in groups for node in group])
+        owner = np.repeat(np.arange(len(groups)), counts)
+
+        cells = walk.reshape(size, -1, size).transpose(1, 0, 2)
+        batch = cells[cluster_cols[owner]]
+
+        starts = np.cumsum(counts) - counts
+        partners = counts[owner]
+        first = np.repeat(np.arange(len(nodes)), partners)
+        offsets = np.arange(len(first)) - np.repeat(
+            np.cumsum(partners) - partners, partners
+        )
+        second = starts[owner[first]] + offsets
+        keep = first != second
+
+        return nodes, batch, first[keep], second[keep]
+
+    def _solve(
+        self, jobs: list[tuple]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        shifts = np.cumsum([0] + [len(job[0]) for job in jobs])
+        nodes = np.concatenate([job[0] for job in jobs])
+        batch = np.concatenate([job[1] for job in jobs])
+        first = np.concatenate(
+            [job[2] + shift for job, shift in zip(jobs, shifts)]
+        )
+        second = np.concatenate(
+            [job[3] + shift for job, shift in zip(jobs, shifts)]
+        )
+
+        local_x = np.array(self.xs)[nodes] % self.size
+        local_y = np.array(self.ys)[nodes] % self.size
+        layouts = np.concatenate(
+            (
+                np.packbits(batch.reshape(len(nodes), -1), axis=1),
+                np.stack((local_x, local_y), axis=1).astype(np.uint8),
+            ),
+            axis=1,
+        )
+        layouts, unique, inverse = np.unique(
+            layouts, axis=0, return_index=True, return_inverse=True
+        )
+        inverse = inverse.ravel()
+
+        dist = np.full((len(unique), self.size, self.size), np.inf)
+        dist[np.arange(len(unique)), local_y[unique], local_x[unique]] = 0
+        sweep(batch[unique], dist)
+
+        cost = dist[inverse[first], local_y[second], local_x[second]]
+        keep = np.isfinite(cost)
+        return nodes[first[keep]], nodes[second[keep]], cost[keep]
+
+    @property
+    def complete(self) -> bool:
+        return not self.pending
+
+    def build_next(self) -> bool:
+        with self.lock:
+            if self.pending:
+                self._expand(*self.pending.popleft())
+            return not self.pending
+
+    def build(self) -> None:
+        while not self.build_next():
+            pass
+
+    def is_long(self, start: tuple[int, int], end: tuple[int, int]) -> bool:
+        return (
+            max(abs(start[0] - end[0]), abs(start[1] - end[1]))
+            >= self.min_distance
+        )
+
+    def _cluster_window(self, x: int, y: int) -> tuple[int, int, int, int]:
+        col0, row0 = x // self.size * self.size, y // self.size * self.size
+        return (
+            col0,
+            row0,
+            min(col0 + self.size, self.cols),
+            min(row0 + self.size, self.rows),
+        )
+
+    def _connect(self, tile: tuple[int, int]) -> tuple[dict, np.ndarray]:
+        x, y = tile
+        col0, row0, col1, row1 = self._cluster_window(x, y)
+        walk = np.zeros((1, self.size, self.size), bool)
+        walk[0, : row1 - row0, : col1 - col0] = self.map.region(
+            row0, col0, row1, col1
+        )
+        walk[0, y - row0, x - col0] = True
+
+        dist = np.full(walk.shape, np.inf)
+        dist[0, y - row0, x - col0] = 0
+        sweep(walk, dist)
+
+        links = {}
+        for node in self.clusters.get((x // self.size, y // self.size), []):
+            cost = dist[0, self.ys[node] - row0, self.xs[node] - col0]
+            if np.isfinite(cost):
+                links[node] = float(cost)
+        return links, dist[0]
+
+    def _heuristic(self, node: tuple[int, int], end: tuple[int, int]) -> float:
+        dx, dy = abs(node[0] - end[0]), abs(node[1] - end[1])
+        return (dx + dy + (SQRT2 - 2) * min(dx, dy)) * self.weight
+
+    def route(self, start: tuple[int, int], end: tuple[int, int]) -> Route:
+        if not self.complete or not self.map.walkable(*end):
+            return Route(self, [])
+
+        with self.lock:
+            return self._route(start, end)
+
+    def _route(self, start: tuple[int, int], end: tuple[int, int]) -> Route:
+        start_links, start_dist = self._connect(start)
+        end_links, _ = self._connect(end)
+
+        source, goal = -1, -2
+        xs, ys, edges = self.xs, self.ys, self.edges
+
+        g = {source: 0.0}
+        parent = {source: source}
+        closed = set()
+        heap = [(self._heuristic(start, end), source)]
+
+        direct = None
+        if self._cluster_window(*start) == self._cluster_window(*end):
+            col0, row0 = self._cluster_window(*start)[:2]
+            direct = float(start_dist[end[1] - row0, end[0] - col0])
+
+        while heap:
+            _, current = heapq.heappop(heap)
+            if current in closed:
+                continue
+            closed.add(current)
+            self.expansions += 1
+
+            if current == goal:
+                break
+
+            if current == source:
+                neighbours = list(start_links.items())
+                if direct is not None and np.isfinite(direct):
+                    neighbours.append((goal, direct))
+            else:
+                neighbours = edges[current]
+                if current in end_links:
+                    neighbours = neighbours + [(goal, end_links[current])]
+
+            base = g[current]
+            for node, cost in neighbours:
+                if node in closed:
+                    continue
+
+                new_g = base + cost
+                if new_g < g.get(node, np.inf):
+                    g[node] = new_g
+                    parent[node] = current
+                    tile = end if node == goal else (xs[node], ys[node])
+                    heapq.heappush(
+                        heap, (new_g + self._heuristic(tile, end), node)
+                    )
+
+        if goal not in closed:
+            return Route(self, [])
+
+        nodes = [goal]
+        while nodes[-1] != source:
+            nodes.append(parent[nodes[-1]])
+        nodes.reverse()
+
+        return Route(
+            self,
+            [start] + [(xs[node], ys[node]) for node in nodes[1:-1]] + [end],
+        )
+
+    def refine(self, a: tuple[int, int], b: tuple[int, int]) -> list[Node]:
+        self.refined += 1
+        if a == b:
+            return [Node(*a)]
+        if max(abs(a[0] - b[0]), abs(a[1] - b[1])) <= 1:
+            return [Node(*a), Node(*b)]
+
+        with self.lock:
+            self.finder.restrict(self._cluster_window(*a))
+            return self.finder.find_path(a, b)
@@ -0,0 +1,60 @@
+import pygame as pg
+
+
+class Hud:
+    def __init__(self, font: pg.Font, wave_mode: bool = False) -> None:
+        self.font = font
+        self.wave_mode = wave_mode
+
+        self.prev_wave = 0
+        self.wave_text = pg.Surface((10, 10))
+        self.reset()
+
+    def reset(self) -> None:
+        self.prev_ammo = 0
+        self.ammo_text = pg.Surface((10, 10))
+
+        self.prev_kills = 0
+        self.kills_text = pg.Surface((10, 10))
+
+    def render(
+        self,
+        display: pg.Surface,
+        ammo: int,
+        kills: int,
+        enemies: int,
+        update_time: float,
+    ) -> list[pg.Rect]:
+        rects = []
+
+        ammo = f"Ammo: {ammo}"
+        if ammo != self.prev_ammo:
+            self.ammo_text = self.font.render(ammo, True, "white")
+
+        self.prev_ammo = ammo
+
+        rects.append(display.blit(self.ammo_text, (5, 50)))
+
+        kills = f"Kills: {kills}"
+        if kills != self.prev_kills:
+            self.kills_text = self.font.render(kills, True, "white")
+
+        self.prev_kills = kills
+
+        rects.append(
+            display.blit(
+                self.kills_text,
+                (5, 0),
+            )
+        )
+
+        if self.wave_mode:
+            wave = f"Enemies: {enemies}  Update: {update_time * 1000:.1f} ms"
+            if wave != self.prev_wave:
+                self.wave_text = self.font.render(wave, True, "white")
+
+            self.prev_wave = wave
+
+            rects.append(display.blit(self.wave_text, (5, 100)))
+
+        return rects
@@ -0,0 +1,41 @@
+import pygame as pg
+
+from pygame.typing import Point
+
+
+KEYS = (pg.K_w, pg.K_a, pg.K_s, pg.K_d)
+
+
+class InputSource:
+    def keys_pressed(self):
+        return pg.key.get_pressed()
+
+    def mouse_pos(self) -> Point:
+        return pg.mouse.get_pos()
+
+    def mouse_pressed(self) -> tuple[bool, bool, bool]:
+        return pg.mouse.get_pressed()
+
+
+class KeyState:
+    def __init__(self, pressed: set[int]) -> None:
+        self.pressed = pressed
+
+    def __getitem__(self, key: int) -> bool:
+        return key in self.pressed
+
+
+class ScriptedInput(InputSource):
+    def __init__(self) -> None:
+        self.pressed: set[int] = set()
+        self.position: tuple[int, int] = (0, 0)
+        self.buttons: tuple[bool, bool, bool] = (False, False, False)
+
+    def keys_pressed(self) -> KeyState:
+        return KeyState(self.pressed)
+
+    def mouse_pos(self) -> Point:
+        return self.position
+
+    def mouse_pressed(self) -> tuple[bool, bool, bool]:
+        return self.buttons
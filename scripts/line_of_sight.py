@@ -0,0 +1,90 @@
+import numpy as np
+
+from pygame.typing import Point
+
+from .pathfinder import Node
+from .tilemap import TileMap, as_tilemap
+
+
+class LineOfSight:
+    def __init__(
+        self,
+        matrix: "TileMap | np.ndarray | list",
+        tile_x: int,
+        tile_y: int,
+        horizon: int = 32,
+    ) -> None:
+        self.map = as_tilemap(matrix, tile_x, tile_y)
+        self.tile_x, self.tile_y = tile_x, tile_y
+        self.horizon = horizon
+
+        self.traced = 0
+        self.removed = 0
+
+    def trace(
+        self, x0: np.ndarray, y0: np.ndarray, x1: np.ndarray, y1: np.ndarray
+    ) -> np.ndarray:
+        dx, dy = x1 - x0, y1 - y0
+        steps = (
+            np.ceil(np.maximum(np.abs(dx), np.abs(dy)) * 2).astype(np.int64)
+            + 1
+        )
+        owner = np.repeat(np.arange(len(steps)), steps)
+        first = np.cumsum(steps) - steps
+        spans = np.maximum(steps - 1, 1)
+        t = (np.arange(len(owner)) - first[owner]) / spans[owner]
+
+        cols = np.floor(x0[owner] + dx[owner] * t).astype(np.int64)
+        rows = np.floor(y0[owner] + dy[owner] * t).astype(np.int64)
+
+        turn = owner[1:] == owner[:-1]
+        cols = np.concatenate((cols, cols[1:][turn], cols[:-1][turn]))
+        rows = np.concatenate((rows, rows[:-1][turn], rows[1:][turn]))
+        owner = np.concatenate((owner, owner[1:][turn], owner[1:][turn]))
+
+        col0, row0 = cols.min(), rows.min()
+        grid = self.map.region(row0, col0, rows.max() + 1, cols.max() + 1)
+        blocked = ~grid[rows - row0, cols - col0]
+
+        self.traced += len(steps)
+        return np.bincount(owner, blocked, len(steps)) == 0
+
+    def visible(self, starts: np.ndarray, end: Point) -> np.ndarray:
+        starts = np.asarray(starts, float).reshape(-1, 2)
+        if not len(starts):
+            return np.zeros(0, bool)
+
+        return self.trace(
+            starts[:, 0] / self.tile_x,
+            starts[:, 1] / self.tile_y,
+            np.full(len(starts), end[0] / self.tile_x),
+            np.full(len(starts), end[1] / self.tile_y),
+        )
+
+    def clear(self, start: Point, end: Point) -> bool:
+        return bool(self.visible((start,), end)[0])
+
+    def smooth(self, path: list[Node]) -> list[Node]:
+        if len(path) <= 2:
+            return path
+
+        xs = np.array([node.x for node in path], float) + 0.5
+        ys = np.array([node.y for node in path], float) + 0.5
+
+        smoothed = [path[0]]
+        index, last = 0, len(path) - 1
+        while index < last:
+            end = min(index + self.horizon, last)
+            count = end - index
+            clear = self.trace(
+                np.full(count, xs[index]),
+                np.full(count, ys[index]),
+                xs[index + 1 : end + 1],
+                ys[index + 1 : end + 1],
+            )
+            reach = count if clear.all() else int(clear.argmin())
+            index += max(reach, 1)
+            smoothed.append(path[index])
+
+        self.removed += len(path) - len(smoothed)
+        return smoothed
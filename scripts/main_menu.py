@@ -4,13 +4,14 @@ import math
 
 from scripts.gui_elements import Button
 from scripts.gamestate import GameState
-from scripts.utilities import load_audio
+from scripts.assets import AssetManager
 
 
 class MainMenu:
     def __init__(
         self,
         screen: pg.Surface,
+        assets: AssetManager | None = None,
     ) -> None:
         self.screen = screen
         self.w, self.h = self.screen.get_size()
@@ -22,7 +23,8 @@ class MainMenu:
             pg.display.get_caption()[0], True, "white"
         )
 
-        self.click_sound = load_audio("button_click.ogg", 0.85)
+        assets = assets if assets is not None else AssetManager()
+        self.click_sound = assets.sound("button_click.ogg", 0.85)
 
         self.name_x = self.w // 2
         self.name_y = self.h // 5
@@ -82,8 +84,10 @@ class MainMenu:
 
         return game_state, running, game_start_delay, new_game
 
-    def render(self, display: pg.Surface) -> None:
-        display.blit(self.name_surf, self.name_rect)
+    def render(self, display: pg.Surface) -> list[pg.Rect]:
+        rects = [display.blit(self.name_surf, self.name_rect)]
 
         for button in self.menu_buttons:
-            button.draw(display)
+            rects.append(button.draw(display))
+
+        return rects
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+import threading
+
+import numpy as np
+
+from pygame.typing import Point
+
+from .hierarchy import HierarchicalPathfinder, Route
+from .line_of_sight import LineOfSight
+from .pathfinder import Node, Pathfinder
+from .tilemap import TileMap
+
+
+class PathCache:
+    def __init__(
+        self,
+        matrix: "TileMap | np.ndarray | list",
+        tile_x: int,
+        tile_y: int,
+        max_size: int = 256,
+        hierarchy: HierarchicalPathfinder | None = None,
+        sight: LineOfSight | None = None,
+    ) -> None:
+        self.finder = Pathfinder(matrix)
+        self.hierarchy = hierarchy
+        self.sight = sight
+
+        self.tile_x, self.tile_y = tile_x, tile_y
+        self.rows, self.cols = self.finder.rows, self.finder.cols
+
+        self.max_size = max_size
+        self.paths: OrderedDict[
+            tuple[tuple[int, int], tuple[int, int]], list[Node]
+        ] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.search_lock = threading.Lock()
+
+    def tile_of(self, pos: Point) -> tuple[int, int]:
+        return (
+            min(max(int(pos[0] // self.tile_x), 0), self.cols - 1),
+            min(max(int(pos[1] // self.tile_y), 0), self.rows - 1),
+        )
+
+    def key(
+        self, start_pos: Point, end_pos: Point
+    ) -> tuple[tuple[int, int], tuple[int, int]]:
+        return self.tile_of(start_pos), self.tile_of(end_pos)
+
+    def lookup(
+        self, key: tuple[tuple[int, int], tuple[int, int]]
+    ) -> list[Node] | None:
+        with self.lock:
+            if key not in self.paths:
+                return None
+
+            self.hits += 1
+            self.paths.move_to_end(key)
+            return list(self.paths[key])
+
+    def store(
+        self, key: tuple[tuple[int, int], tuple[int, int]], path: list[Node]
+    ) -> None:
+        with self.lock:
+            self.misses += 1
+            self.paths[key] = path
+            if len(self.paths) > self.max_size:
+                self.paths.popitem(last=False)
+
+    def route(
+        self, key: tuple[tuple[int, int], tuple[int, int]]
+    ) -> Route | None:
+        if (
+            self.hierarchy is None
+            or not self.hierarchy.complete
+            or not self.hierarchy.is_long(*key)
+        ):
+            return None
+        with self.search_lock:
+            return self.hierarchy.route(*key)
+
+    def smooth(self, path: list[Node]) -> list[Node]:
+        if self.sight is None:
+            return path
+        with self.search_lock:
+            return self.sight.smooth(path)
+
+    def find_path(self, start_pos: Point, end_pos: Point) -> list[Node]:
+        key = self.key(start_pos, end_pos)
+
+        path = self.lookup(key)
+        if path is not None:
+            return path
+
+        path = self.smooth(self.finder.find_path(*key))
+        self.store(key, path)
+        return list(path)
+
+    def clear(self) -> None:
+        self.paths.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
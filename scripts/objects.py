@@ -1,41 +1,172 @@
+import numpy as np
 import pygame as pg
 from pygame.sprite import Sprite
 import math
 
+from .camera import Camera
+from .input_source import InputSource
+from .rotations import RotationAtlas
 
-class Bullet(Sprite):
+
+class BulletPool:
     def __init__(
         self,
         image: pg.Surface,
-        pos: tuple[float, float],
-        angle: float,
         base_speed: float,
-    ):
-        super().__init__()
-        self.image = image
-        self.rect = self.image.get_rect(center=pos)
-
+        capacity: int = 1024,
+        rotations: RotationAtlas | None = None,
+    ) -> None:
+        self.rotations = (
+            rotations if rotations is not None else RotationAtlas(image, 1)
+        )
         self.base_speed = base_speed
-        self.position = pg.Vector2(pos)
-        self.angle = angle
-        self.velocity = pg.Vector2()
 
-        self.image = pg.transform.rotate(self.image, -self.angle)
+        self.positions = np.zeros((capacity, 2))
+        self.previous = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.half_sizes = np.zeros((capacity, 2))
+        self.rotation = np.zeros(capacity, np.intp)
+        self.alive = np.zeros(capacity, bool)
+
+        self.images: list[pg.Surface | None] = [None] * capacity
+        self.free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self) -> int:
+        return len(self.alive) - len(self.free)
+
+    def _grow(self) -> None:
+        capacity = len(self.alive)
+        self.positions = np.concatenate(
+            (self.positions, np.zeros_like(self.positions))
+        )
+        self.previous = np.concatenate(
+            (self.previous, np.zeros_like(self.previous))
+        )
+        self.velocities = np.concatenate(
+            (self.velocities, np.zeros_like(self.velocities))
+        )
+        self.half_sizes = np.concatenate(
+            (self.half_sizes, np.zeros_like(self.half_sizes))
+        )
+        self.rotation = np.concatenate(
+            (self.rotation, np.zeros_like(self.rotation))
+        )
+        self.alive = np.concatenate((self.alive, np.zeros_like(self.alive)))
+        self.images += [None] * capacity
+        self.free += range(capacity * 2 - 1, capacity - 1, -1)
+
+    def spawn(self, pos: tuple[float, float], angle: float) -> None:
+        if not self.free:
+            self._grow()
+
+        idx = self.free.pop()
+        rotations = self.rotations
+        rotation = rotations.index(angle)
+        rad = math.radians(angle)
+
+        self.positions[idx] = pos
+        self.previous[idx] = pos
+        self.velocities[idx] = (
+            math.cos(rad) * self.base_speed,
+            math.sin(rad) * self.base_speed,
+        )
+        self.half_sizes[idx] = rotations.half_sizes[0][rotation]
+        self.rotation[idx] = rotation
+        self.alive[idx] = True
+        self.images[idx] = rotations.images[0][rotation]
+
+    def kill(self, indices: np.ndarray | list[int]) -> None:
+        indices = np.unique(np.asarray(indices, np.intp))
+        indices = indices[self.alive[indices]]
+
+        self.alive[indices] = False
+        self.free.extend(indices.tolist())
+
+    def clear(self) -> None:
+        self.kill(np.flatnonzero(self.alive))
 
-    def update(self, screen_rect: pg.Rect, dt: float):
-        self.speed = self.base_speed * dt
-        self.velocity = pg.Vector2(self.speed, 0).rotate(self.angle)
-        self.position += self.velocity
-        self.rect.centerx, self.rect.centery = self.position.x, self.position.y
+    def rects(self, indices: np.ndarray) -> np.ndarray:
+        topleft = self.positions[indices] - self.half_sizes[indices]
+        return np.concatenate(
+            (topleft, topleft + self.half_sizes[indices] * 2), axis=1
+        )
+
+    def live(self) -> np.ndarray:
+        return np.flatnonzero(self.alive)
+
+    def capture(self) -> None:
+        self.previous[:] = self.positions
+
+    def update(self, screen_rect: pg.Rect, dt: float) -> None:
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            return
+
+        self.positions[live] += self.velocities[live] * dt
 
-        if not screen_rect.contains(self.rect):
-            self.kill()
+        bounds = self.rects(live)
+        inside = (
+            (bounds[:, 0] >= screen_rect.left)
+            & (bounds[:, 1] >= screen_rect.top)
+            & (bounds[:, 2] <= screen_rect.right)
+            & (bounds[:, 3] <= screen_rect.bottom)
+        )
+        self.kill(live[~inside])
 
-    def hit(self, collide_rect: pg.Rect) -> None:
-        return self.rect.colliderect(collide_rect)
+    def collide(self, rects: list[pg.Rect]) -> tuple[np.ndarray, np.ndarray]:
+        live = np.flatnonzero(self.alive)
+        if not len(live) or not rects:
+            return np.empty(0, np.intp), np.empty(0, np.intp)
 
-    def draw(self, screen: pg.Surface) -> None:
-        screen.blit(self.image, self.rect)
+        bounds = self.rects(live)
+        targets = np.array(
+            [(r.left, r.top, r.right, r.bottom) for r in rects], float
+        )
+        overlap = (
+            (bounds[:, None, 0] < targets[None, :, 2])
+            & (targets[None, :, 0] < bounds[:, None, 2])
+            & (bounds[:, None, 1] < targets[None, :, 3])
+            & (targets[None, :, 1] < bounds[:, None, 3])
+        )
+
+        hit = overlap.any(axis=1)
+        return live[hit], overlap[hit].argmax(axis=1)
+
+    def blits(
+        self, viewport: pg.Rect | None = None, alpha: float = 1.0
+    ) -> tuple[list[tuple[pg.Surface, list[float]]], list[pg.Rect]]:
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            return [], []
+
+        positions = self.positions[live]
+        if alpha < 1:
+            previous = self.previous[live]
+            positions = previous + (positions - previous) * alpha
+        dests = positions - self.half_sizes[live]
+        if viewport is not None:
+            size = self.half_sizes[live] * 2
+            shown = (
+                (dests[:, 0] < viewport.right)
+                & (dests[:, 0] + size[:, 0] > viewport.left)
+                & (dests[:, 1] < viewport.bottom)
+                & (dests[:, 1] + size[:, 1] > viewport.top)
+            )
+            live, dests = live[shown], dests[shown] - viewport.topleft
+
+        images = self.images
+        dests = dests.tolist()
+        blits = [
+            (images[idx], dest) for idx, dest in zip(live.tolist(), dests)
+        ]
+        return blits, [
+            image.get_rect(topleft=dest).inflate(2, 2) for image, dest in blits
+        ]
+
+    def draw(self, screen: pg.Surface) -> list[pg.Rect]:
+        blits, rects = self.blits()
+        screen.fblits(blits)
+        return rects
 
 
 class Obtainable_Item(Sprite):
@@ -48,24 +179,40 @@ class Obtainable_Item(Sprite):
     def collision(self, collide_object: pg.Rect):
         return self.rect.colliderect(collide_object)
 
-    def draw(self, screen: pg.Surface) -> None:
-        screen.blit(self.image, self.position)
+    def draw(self, screen: pg.Surface) -> pg.Rect:
+        return screen.blit(self.image, self.position)
 
 
 class Gun(Sprite):
-    def __init__(self, image: pg.Surface, pos: list[int, int]) -> None:
+    def __init__(
+        self,
+        image: pg.Surface,
+        pos: list[int, int],
+        input_source: InputSource | None = None,
+        rotations: RotationAtlas | None = None,
+        camera: Camera | None = None,
+    ) -> None:
         super().__init__()
-        self.base_image = image
-        self.image = self.base_image.copy()
+        self.camera = camera
+        self.input = (
+            input_source if input_source is not None else InputSource()
+        )
+        self.rotations = (
+            rotations
+            if rotations is not None
+            else RotationAtlas(image, 3, flipped=True)
+        )
+        self.image = self.rotations.get(0)
 
         self.position = pg.Vector2(pos)
         self.rect = self.image.get_rect(center=pos)
 
-        self.cache = {}
         self.angle = 0
 
     def get_angle(self, pos: pg.Vector2) -> None:
-        mousepos = pg.mouse.get_pos()
+        mousepos = self.input.mouse_pos()
+        if self.camera is not None:
+            mousepos = self.camera.screen_to_world(mousepos)
         x = mousepos[0] - pos.x
         y = mousepos[1] - pos.y
 
@@ -75,28 +222,12 @@ class Gun(Sprite):
 
     def update(self, pos: pg.Vector2) -> None:
         self.angle = self.get_angle(pos)
-        rounded_angle = round(self.angle / 3) * 3
-
-        if self.angle in self.cache:
-            self.image = self.cache[rounded_angle]
-        else:
-            if 90 <= self.angle <= 270:
-                self.image = pg.transform.flip(self.base_image, False, True)
-            else:
-                self.image = self.base_image.copy()
-
-            self.image = pg.transform.rotate(
-                self.image,
-                -rounded_angle,
-            )
-
-            self.cache[rounded_angle] = self.image
 
-        self.rect.center = pos.xy
-        self.rect.size = self.image.get_size()
+        self.image = self.rotations.get(self.angle, 90 <= self.angle <= 270)
+        self.rect = self.image.get_rect(center=pos.xy)
 
-    def draw(self, screen: pg.Surface) -> None:
-        screen.blit(
+    def draw(self, screen: pg.Surface) -> pg.Rect:
+        return screen.blit(
             self.image,
             self.rect,
         )
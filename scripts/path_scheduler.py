@@ -0,0 +1,229 @@
+from collections import deque
+import queue
+import threading
+import time
+
+import numpy as np
+
+from pygame.typing import Point
+
+from .hierarchy import Route
+from .navigation import PathCache
+from .pathfinder import Node, Pathfinder
+from .tilemap import TileMap
+
+
+class PathRequest:
+    def __init__(
+        self,
+        owner: object,
+        key: tuple[tuple[int, int], tuple[int, int]],
+        reason: str,
+    ) -> None:
+        self.owner = owner
+        self.key = key
+        self.reason = reason
+
+        self.path: list[Node] = []
+        self.route: Route | None = None
+        self.done = False
+        self.cancelled = False
+
+    def finish(self, path: list[Node], route: Route | None = None) -> None:
+        self.path = path
+        self.route = route
+        self.done = True
+
+
+class PathScheduler:
+    def __init__(
+        self,
+        matrix: "TileMap | np.ndarray | list",
+        path_cache: PathCache,
+        budget_ms: float = 2.0,
+        threaded: bool = False,
+        chunk: int = 16,
+        step_budget: int | None = None,
+    ) -> None:
+        self.path_cache = path_cache
+        self.finder = Pathfinder(matrix)
+
+        self.budget = budget_ms / 1000
+        self.step_budget = step_budget
+        self.chunk = chunk
+        self.threaded = threaded
+
+        self.requests: dict[object, PathRequest] = {}
+        self.lock = threading.Lock()
+        self.pending: deque[PathRequest] = deque()
+        self.active: PathRequest | None = None
+        self.steps = None
+
+        self.completed = 0
+        self.cancelled = 0
+
+        self.queue: queue.Queue[PathRequest | None] = queue.Queue()
+        self.worker: threading.Thread | None = None
+        if threaded:
+            self.worker = threading.Thread(target=self._work, daemon=True)
+            self.worker.start()
+
+    def submit(
+        self, owner: object, start_pos: Point, end_pos: Point, reason: str
+    ) -> PathRequest:
+        request = PathRequest(
+            owner, self.path_cache.key(start_pos, end_pos), reason
+        )
+        with self.lock:
+            self._cancel(owner)
+            self.requests[owner] = request
+
+        if self.threaded:
+            self.queue.put(request)
+            return request
+
+        cached = self.path_cache.lookup(request.key)
+        if cached is not None:
+            self._finish(request, cached)
+        else:
+            self.pending.append(request)
+
+        return request
+
+    def _cancel(self, owner: object) -> None:
+        request = self.requests.pop(owner, None)
+        if request is not None and not request.done:
+            request.cancelled = True
+            self.cancelled += 1
+
+    def cancel(self, owner: object) -> None:
+        with self.lock:
+            self._cancel(owner)
+
+    def clear(self) -> None:
+        with self.lock:
+            for owner in list(self.requests):
+                self._cancel(owner)
+
+    def _finish(
+        self,
+        request: PathRequest,
+        path: list[Node],
+        route: Route | None = None,
+    ) -> None:
+        with self.lock:
+            request.finish(path, route)
+            self.completed += 1
+            if self.requests.get(request.owner) is request:
+                del self.requests[request.owner]
+
+    def _resolve(self, request: PathRequest, path: list[Node]) -> None:
+        path = self.path_cache.smooth(path)
+        self.path_cache.store(request.key, path)
+        self._finish(request, list(path))
+
+    def _resolve_route(self, request: PathRequest, route: Route) -> None:
+        self._finish(
+            request, self.path_cache.smooth(route.next_segment()), route
+        )
+
+    def process(self) -> None:
+        if self.threaded:
+            return
+
+        deadline = time.perf_counter() + self.budget
+        steps = self._build(deadline, 0, 1)
+        while self.active is not None or self.pending:
+            if self.active is None:
+                request = self.pending.popleft()
+                if request.cancelled:
+                    continue
+
+                cached = self.path_cache.lookup(request.key)
+                if cached is not None:
+                    self._finish(request, cached)
+                    continue
+
+                route = self.path_cache.route(request.key)
+                if route is not None:
+                    self._resolve_route(request, route)
+                    steps += 1
+                    if self._spent(deadline, steps):
+                        break
+                    continue
+
+                self.active = request
+                self.steps = self.finder.search(*request.key, self.chunk)
+
+            if self.active.cancelled:
+                self.active, self.steps = None, None
+                continue
+
+            try:
+                next(self.steps)
+            except StopIteration as done:
+                self._resolve(self.active, done.value)
+                self.active, self.steps = None, None
+
+            steps += 1
+            if self._spent(deadline, steps):
+                break
+
+        if not self._spent(deadline, steps):
+            self._build(deadline, steps)
+
+    def _build(
+        self, deadline: float, steps: int, blocks: int | None = None
+    ) -> int:
+        hierarchy = self.path_cache.hierarchy
+        built = 0
+        while (
+            hierarchy is not None
+            and not hierarchy.complete
+            and built != blocks
+        ):
+            hierarchy.build_next()
+            built += 1
+            if self._spent(deadline, steps + built):
+                break
+        return steps + built
+
+    def _spent(self, deadline: float, steps: int) -> bool:
+        if self.step_budget is not None:
+            return steps >= self.step_budget
+        return time.perf_counter() >= deadline
+
+    def _work(self) -> None:
+        hierarchy = self.path_cache.hierarchy
+        while True:
+            if (
+                hierarchy is not None
+                and not hierarchy.complete
+                and self.queue.empty()
+            ):
+                hierarchy.build_next()
+                continue
+
+            request = self.queue.get()
+            if request is None:
+                return
+            if request.cancelled:
+                continue
+
+            cached = self.path_cache.lookup(request.key)
+            if cached is not None:
+                self._finish(request, cached)
+                continue
+
+            route = self.path_cache.route(request.key)
+            if route is not None:
+                self._resolve_route(request, route)
+                continue
+
+            self._resolve(request, self.finder.find_path(*request.key))
+
+    def stop(self) -> None:
+        if self.worker is not None:
+            self.queue.put(None)
+            self.worker.join()
+            self.worker = None
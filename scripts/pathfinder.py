@@ -0,0 +1,300 @@
+import heapq
+import math
+from typing import Generator, NamedTuple
+
+import numpy as np
+
+from .tilemap import TileMap, as_tilemap
+
+
+SQRT2 = math.sqrt(2)
+
+
+class Node(NamedTuple):
+    x: int
+    y: int
+
+
+class Pathfinder:
+    def __init__(
+        self,
+        matrix: "TileMap | np.ndarray | list",
+        jump_point: bool = True,
+        margin: int = 32,
+    ) -> None:
+        self.map = as_tilemap(matrix)
+        self.rows, self.cols = self.map.rows, self.map.cols
+        self.jump_point = jump_point
+        self.margin = margin
+
+        self.window = (0, 0, 0, 0)
+        self.origin = (0, 0)
+        self.width = 0
+        self.offsets = ()
+        self.walkable: list[bool] = []
+        self.xs: list[int] = []
+        self.ys: list[int] = []
+        self.g: list[float] = []
+        self.parent: list[int] = []
+        self.seen: list[int] = []
+        self.closed: list[int] = []
+        self.generation = 0
+
+        self.expansions = 0
+        self.windows = 0
+
+        if self.rows <= margin * 4 and self.cols <= margin * 4:
+            self._prepare((0, 0, self.cols, self.rows))
+
+    def _prepare(self, window: tuple[int, int, int, int]) -> None:
+        col0, row0, col1, row1 = window
+        self.window = window
+        self.origin = col0, row0
+        self.windows += 1
+
+        self.width = col1 - col0 + 2
+        padded = np.zeros((row1 - row0 + 2, self.width), bool)
+        padded[1:-1, 1:-1] = self.map.region(row0, col0, row1, col1)
+        self.walkable = padded.ravel().tolist()
+
+        size = padded.size
+        ys, xs = np.divmod(np.arange(size), self.width)
+        self.xs = (xs + col0).tolist()
+        self.ys = (ys + row0).tolist()
+
+        w = self.width
+        self.offsets = (
+            (1, 1.0),
+            (-1, 1.0),
+            (w, 1.0),
+            (-w, 1.0),
+            (w + 1, SQRT2),
+            (w - 1, SQRT2),
+            (-w + 1, SQRT2),
+            (-w - 1, SQRT2),
+        )
+
+        self.g = [0.0] * size
+        self.parent = [0] * size
+        self.seen = [0] * size
+        self.closed = [0] * size
+
+    def restrict(self, window: tuple[int, int, int, int]) -> None:
+        if window != self.window:
+            self._prepare(window)
+
+    def cover(self, start: tuple[int, int], end: tuple[int, int]) -> None:
+        col0, row0, col1, row1 = self.window
+        if (
+            col0 <= min(start[0], end[0])
+            and max(start[0], end[0]) < col1
+            and row0 <= min(start[1], end[1])
+            and max(start[1], end[1]) < row1
+        ):
+            return
+
+        size, margin = self.map.chunk_size, self.margin
+        col0 = max(min(start[0], end[0]) - margin, 0) // size * size
+        row0 = max(min(start[1], end[1]) - margin, 0) // size * size
+        col1 = -(-(max(start[0], end[0]) + margin + 1) // size) * size
+        row1 = -(-(max(start[1], end[1]) + margin + 1) // size) * size
+        self._prepare((col0, row0, min(col1, self.cols), min(row1, self.rows)))
+
+    def node_id(self, x: int, y: int) -> int:
+        return (y - self.origin[1] + 1) * self.width + x - self.origin[0] + 1
+
+    def heuristic(self, a: int, b: int) -> float:
+        dx = abs(self.xs[a] - self.xs[b])
+        dy = abs(self.ys[a] - self.ys[b])
+        return dx + dy + (SQRT2 - 2) * min(dx, dy)
+
+    def find_path(
+        self, start: tuple[int, int], end: tuple[int, int]
+    ) -> list[Node]:
+        steps = self.search(start, end)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as done:
+                return done.value
+
+    def search(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        chunk: int | None = None,
+    ) -> Generator[None, None, list[Node]]:
+        if not (0 <= start[0] < self.cols and 0 <= start[1] < self.rows):
+            return []
+        if not (0 <= end[0] < self.cols and 0 <= end[1] < self.rows):
+            return []
+
+        self.cover(start, end)
+        start_id, end_id = self.node_id(*start), self.node_id(*end)
+        if not self.walkable[end_id]:
+            return []
+
+        self.generation += 1
+        successors = (
+            self._jump_successors if self.jump_point else self._grid_successors
+        )
+        found = yield from self._search(start_id, end_id, successors, chunk)
+
+        if not found:
+            return []
+
+        return self._expand(self._trace(start_id, end_id))
+
+    def _search(
+        self, start: int, end: int, successors, chunk: int | None
+    ) -> Generator[None, None, bool]:
+        gen = self.generation
+        g, parent, seen, closed = self.g, self.parent, self.seen, self.closed
+
+        g[start] = 0.0
+        parent[start] = start
+        seen[start] = gen
+        heap = [(self.heuristic(start, end), start)]
+        expanded = 0
+
+        while heap:
+            _, current = heapq.heappop(heap)
+            if closed[current] == gen:
+                continue
+            closed[current] = gen
+            self.expansions += 1
+
+            if current == end:
+                return True
+
+            base = g[current]
+            for node, cost in successors(current, end):
+                if closed[node] == gen:
+                    continue
+
+                new_g = base + cost
+                if seen[node] != gen or new_g < g[node]:
+                    seen[node] = gen
+                    g[node] = new_g
+                    parent[node] = current
+                    heapq.heappush(
+                        heap, (new_g + self.heuristic(node, end), node)
+                    )
+
+            expanded += 1
+            if chunk and expanded % chunk == 0:
+                yield
+
+        return False
+
+    def _grid_successors(self, current: int, end: int):
+        walkable = self.walkable
+        for offset, cost in self.offsets:
+            node = current + offset
+            if walkable[node]:
+                yield node, cost
+
+    def _jump_successors(self, current: int, end: int):
+        xs, ys, w = self.xs, self.ys, self.width
+        for dx, dy in self._pruned_directions(current):
+            node = self._jump(current + dy * w + dx, dx, dy, end)
+            if node is not None:
+                dist_x = abs(xs[node] - xs[current])
+                dist_y = abs(ys[node] - ys[current])
+                yield (
+                    node,
+                    dist_x + dist_y + (SQRT2 - 2) * min(dist_x, dist_y),
+                )
+
+    def _pruned_directions(self, current: int) -> list[tuple[int, int]]:
+        parent = self.parent[current]
+        if parent == current:
+            return [
+                (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy
+            ]
+
+        walkable, w = self.walkable, self.width
+        dx = (self.xs[current] > self.xs[parent]) - (
+            self.xs[current] < self.xs[parent]
+        )
+        dy = (self.ys[current] > self.ys[parent]) - (
+            self.ys[current] < self.ys[parent]
+        )
+
+        directions = []
+        if dx and dy:
+            directions += [(0, dy), (dx, 0), (dx, dy)]
+            if not walkable[current - dx]:
+                directions.append((-dx, dy))
+            if not walkable[current - dy * w]:
+                directions.append((dx, -dy))
+        elif dx:
+            directions.append((dx, 0))
+            if not walkable[current + w]:
+                directions.append((dx, 1))
+            if not walkable[current - w]:
+                directions.append((dx, -1))
+        else:
+            directions.append((0, dy))
+            if not walkable[current + 1]:
+                directions.append((1, dy))
+            if not walkable[current - 1]:
+                directions.append((-1, dy))
+
+        return directions
+
+    def _jump(self, node: int, dx: int, dy: int, end: int) -> int | None:
+        walkable, w = self.walkable, self.width
+        step = dy * w + dx
+
+        while True:
+            if not walkable[node]:
+                return None
+            if node == end:
+                return node
+
+            if dx and dy:
+                if (
+                    walkable[node - dx + dy * w] and not walkable[node - dx]
+                ) or (
+                    walkable[node + dx - dy * w]
+                    and not walkable[node - dy * w]
+                ):
+                    return node
+                if (
+                    self._jump(node + dx, dx, 0, end) is not None
+                    or self._jump(node + dy * w, 0, dy, end) is not None
+                ):
+                    return node
+            elif dx:
+                if (walkable[node + dx + w] and not walkable[node + w]) or (
+                    walkable[node + dx - w] and not walkable[node - w]
+                ):
+                    return node
+            else:
+                if (
+                    walkable[node + 1 + dy * w] and not walkable[node + 1]
+                ) or (walkable[node - 1 + dy * w] and not walkable[node - 1]):
+                    return node
+
+            node += step
+
+    def _trace(self, start: int, end: int) -> list[int]:
+        nodes = [end]
+        while nodes[-1] != start:
+            nodes.append(self.parent[nodes[-1]])
+        nodes.reverse()
+        return nodes
+
+    def _expand(self, nodes: list[int]) -> list[Node]:
+        xs, ys = self.xs, self.ys
+        path = [Node(xs[nodes[0]] - 1, ys[nodes[0]] - 1)]
+        for a, b in zip(nodes, nodes[1:]):
+            x, y = xs[a], ys[a]
+            dx = (xs[b] > x) - (xs[b] < x)
+            dy = (ys[b] > y) - (ys[b] < y)
+            while (x, y) != (xs[b], ys[b]):
+                x, y = x + dx, y + dy
+                path.append(Node(x - 1, y - 1))
+
+        return path
@@ -2,13 +2,14 @@ import pygame as pg
 
 from scripts.gui_elements import Button
 from scripts.gamestate import GameState
-from scripts.utilities import load_audio
+from scripts.assets import AssetManager
 
 
 class PauseMenu:
     def __init__(
         self,
         screen: pg.Surface,
+        assets: AssetManager | None = None,
     ) -> None:
         self.screen = screen
         self.w, self.h = self.screen.get_size()
@@ -18,7 +19,8 @@ class PauseMenu:
 
         self.title_surf = self.title_font.render("Game Paused", True, "white")
 
-        self.click_sound = load_audio("button_click.ogg", 0.85)
+        assets = assets if assets is not None else AssetManager()
+        self.click_sound = assets.sound("button_click.ogg", 0.85)
 
         self.title_x = self.w // 2
         self.title_y = self.h // 5
@@ -63,8 +65,10 @@ class PauseMenu:
 
         return game_state, game_start_delay
 
-    def render(self, display: pg.Surface) -> None:
-        display.blit(self.title_surf, self.title_rect)
+    def render(self, display: pg.Surface) -> list[pg.Rect]:
+        rects = [display.blit(self.title_surf, self.title_rect)]
 
         for button in self.menu_buttons:
-            button.draw(display)
+            rects.append(button.draw(display))
+
+        return rects
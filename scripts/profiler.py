@@ -0,0 +1,171 @@
+import csv
+import time
+from typing import TYPE_CHECKING
+
+import pygame as pg
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+PHASES = (
+    "events",
+    "update",
+    "bullets",
+    "enemies",
+    "pathfinding",
+    "render",
+    "flip",
+    "frame",
+)
+COLORS = (
+    (230, 160, 60),
+    (90, 170, 250),
+    (250, 230, 90),
+    (240, 90, 90),
+    (200, 110, 240),
+    (100, 220, 140),
+    (160, 160, 160),
+    (255, 255, 255),
+)
+
+
+class _NullScope:
+    def __enter__(self) -> None:
+        pass
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _Scope:
+    def __init__(self, profiler: "Profiler", index: int) -> None:
+        self.profiler = profiler
+        self.index = index
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.profiler.current[self.index] += time.perf_counter() - self.start
+
+
+class Profiler:
+    def __init__(
+        self, capacity: int = 240, phases: tuple[str, ...] = PHASES
+    ) -> None:
+        self.phases = phases
+        self.index = {name: i for i, name in enumerate(phases)}
+        self.capacity = capacity
+        self.samples: "np.ndarray | None" = None
+        self.current = [0.0] * len(phases)
+        self.head = 0
+        self.count = 0
+
+        self.enabled = False
+        self.frame_start = 0.0
+        self.scopes = {name: _Scope(self, i) for i, name in enumerate(phases)}
+
+        self.font = None
+        self.labels: list[pg.Surface] = []
+
+    def toggle(self) -> None:
+        self.enabled = not self.enabled
+        self.head = 0
+        self.count = 0
+
+        if self.samples is None:
+            import numpy as np
+
+            self.samples = np.zeros((self.capacity, len(self.phases)))
+
+    def scope(self, name: str) -> _Scope | _NullScope:
+        if not self.enabled:
+            return _NULL_SCOPE
+        return self.scopes[name]
+
+    def begin_frame(self) -> None:
+        if not self.enabled:
+            return
+
+        self.current = [0.0] * len(self.phases)
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self) -> None:
+        if not self.enabled:
+            return
+
+        self.current[self.index["frame"]] = (
+            time.perf_counter() - self.frame_start
+        )
+        self.samples[self.head] = self.current
+        self.head = (self.head + 1) % len(self.samples)
+        self.count = min(self.count + 1, len(self.samples))
+
+    def history(self) -> "np.ndarray":
+        import numpy as np
+
+        if self.samples is None:
+            return np.zeros((0, len(self.phases)))
+        if self.count < len(self.samples):
+            return self.samples[: self.count]
+        return np.roll(self.samples, -self.head, axis=0)
+
+    def dump_csv(self, path: str) -> int:
+        history = self.history()
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(("frame", *(f"{p}_ms" for p in self.phases)))
+            for frame, row in enumerate(history * 1000):
+                writer.writerow((frame, *(f"{v:.4f}" for v in row)))
+
+        return len(history)
+
+    def draw(
+        self, display: pg.Surface, pos: tuple[int, int] = (5, 150)
+    ) -> list[pg.Rect]:
+        if not self.enabled or not self.count:
+            return []
+
+        if self.font is None:
+            self.font = pg.Font(size=20)
+            self.labels = [
+                self.font.render(name, True, color)
+                for name, color in zip(self.phases, COLORS)
+            ]
+
+        history = self.history() * 1000
+        worst = int(history[:, self.index["frame"]].argmax())
+        scale = 24 / max(float(history.max()), 1)
+
+        x, y = pos
+        width = self.capacity
+        height = 28
+        panel = pg.Rect(x, y, width + 160, height * len(self.phases) + 4)
+        display.fill((20, 20, 30), panel)
+
+        for i, (label, color) in enumerate(zip(self.labels, COLORS)):
+            top = y + 2 + i * height
+            base = top + height - 2
+            display.blit(label, (x + 4, top))
+
+            values = history[:, i]
+            display.blit(
+                self.font.render(
+                    f"{values[-1]:.2f} / {values.max():.2f}", True, color
+                ),
+                (x + 4, top + 13),
+            )
+
+            graph_x = x + 156
+            for frame, bar in enumerate((values * scale).astype(int)):
+                if bar:
+                    display.fill(color, (graph_x + frame, base - bar, 1, bar))
+
+            display.fill((255, 60, 60), (graph_x + worst, top, 1, height - 2))
+
+        return [panel]
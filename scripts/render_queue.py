@@ -0,0 +1,23 @@
+import pygame as pg
+from pygame.typing import Point
+
+
+class RenderQueue:
+    def __init__(self) -> None:
+        self.blits: list[tuple[pg.Surface, Point]] = []
+        self.submitted = 0
+
+    def __len__(self) -> int:
+        return len(self.blits)
+
+    def add(self, image: pg.Surface, dest: Point) -> None:
+        self.blits.append((image, dest))
+
+    def extend(self, blits: list[tuple[pg.Surface, Point]]) -> None:
+        self.blits += blits
+
+    def flush(self, display: pg.Surface) -> None:
+        if self.blits:
+            display.fblits(self.blits)
+            self.submitted += 1
+            self.blits = []
@@ -0,0 +1,80 @@
+import pygame as pg
+from pygame.typing import ColorLike
+
+
+class DirtyRenderer:
+    def __init__(
+        self,
+        screen: pg.Surface,
+        background: pg.Surface,
+        fill: ColorLike = "white",
+        full_ratio: float = 0.5,
+    ) -> None:
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+
+        width, height = background.get_size()
+        self.period = width, height
+        cols = -(-self.screen_rect.w // width) + 1
+        rows = -(-self.screen_rect.h // height) + 1
+        self.background = pg.Surface((cols * width, rows * height)).convert()
+        self.background.fill(fill)
+        self.background.fblits(
+            [
+                (background, (col * width, row * height))
+                for row in range(rows)
+                for col in range(cols)
+            ]
+        )
+        self.scroll = pg.Rect(self.screen_rect)
+
+        self.full_area = self.screen_rect.w * self.screen_rect.h * full_ratio
+        self.previous: list[pg.Rect] = []
+        self.previous_area = 0
+        self.full = True
+
+        self.flips = 0
+        self.updates = 0
+
+    def invalidate(self) -> None:
+        self.full = True
+
+    def scroll_to(self, pos: tuple[int, int]) -> None:
+        pos = pos[0] % self.period[0], pos[1] % self.period[1]
+        if self.scroll.topleft == pos:
+            return
+
+        self.scroll.topleft = pos
+        self.full = True
+        self.restore()
+
+    def restore(self) -> None:
+        if self.full or self.previous_area >= self.full_area:
+            self.screen.blit(self.background, (0, 0), self.scroll)
+            return
+
+        background = self.background
+        x, y = self.scroll.topleft
+        self.screen.blits(
+            [(background, rect, rect.move(x, y)) for rect in self.previous],
+            False,
+        )
+
+    def present(self, rects: list[pg.Rect]) -> None:
+        rects = [
+            rect.clip(self.screen_rect)
+            for rect in rects
+            if rect.colliderect(self.screen_rect)
+        ]
+        area = sum(rect.w * rect.h for rect in rects)
+        dirty = self.previous + rects
+        dirty_area = self.previous_area + area
+        self.previous, self.previous_area = rects, area
+
+        if self.full or dirty_area >= self.full_area:
+            self.full = False
+            self.flips += 1
+            pg.display.flip()
+        else:
+            self.updates += 1
+            pg.display.update(dirty)
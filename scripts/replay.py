@@ -0,0 +1,269 @@
+import argparse
+import os
+import random
+import struct
+import time
+from typing import BinaryIO, Callable, Iterator
+
+import pygame as pg
+
+from . import clock
+from .game import Game
+from .input_source import KEYS, InputSource, ScriptedInput
+from .tilemap import TileMap, load_map
+
+
+MAGIC = b"UGRL"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHHdHH")
+KIND = struct.Struct("<B")
+SEED, CLOCK, DELAY, TICK = range(4)
+RECORDS = {
+    SEED: struct.Struct("<qQ"),
+    CLOCK: struct.Struct("<q"),
+    DELAY: struct.Struct("<q"),
+    TICK: struct.Struct("<HhhB"),
+}
+STEP_BUDGET = 16
+
+
+class InputRecorder(ScriptedInput):
+    def __init__(
+        self,
+        path: str,
+        world: str,
+        size: tuple[int, int],
+        wave_mode: bool = False,
+        dt: float = 1.0,
+        source: InputSource | None = None,
+        step_budget: int = STEP_BUDGET,
+    ) -> None:
+        super().__init__()
+        self.source = source if source is not None else InputSource()
+        self.step_budget = step_budget
+
+        name = world.encode()
+        self.file: BinaryIO = open(path, "wb")
+        self.file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                wave_mode,
+                *size,
+                dt,
+                step_budget,
+                len(name),
+            )
+            + name
+        )
+
+        self.live = clock.get_source()
+        self.tick = self.live()
+        self.recorded = self.tick
+        self.delay: int | None = None
+        self.game: Game | None = None
+        self.ticks = 0
+        clock.set_source(self.get_ticks)
+
+    def get_ticks(self) -> int:
+        return self.tick
+
+    def write(self, kind: int, *values: int) -> None:
+        self.file.write(KIND.pack(kind) + RECORDS[kind].pack(*values))
+
+    def start(self, game: Game, seed: int | None = None) -> None:
+        seed = seed if seed is not None else random.getrandbits(63)
+        game.reseed(seed)
+        game.path_scheduler.step_budget = self.step_budget
+
+        self.game = game
+        self.tick = self.recorded = self.live()
+        self.delay = None
+        self.write(SEED, self.tick, seed)
+        game.reset()
+
+    def capture(self) -> None:
+        source = self.source
+        keys = source.keys_pressed()
+        self.pressed = {key for key in KEYS if keys[key]}
+        x, y = source.mouse_pos()
+        self.position = int(x), int(y)
+        self.buttons = tuple(bool(button) for button in source.mouse_pressed())
+
+        self.tick = self.live()
+        delta = self.tick - self.recorded
+        if not 0 <= delta <= 0xFFFF:
+            self.write(CLOCK, self.tick)
+            delta = 0
+        self.recorded = self.tick
+
+        delay = self.game.game_start_delay
+        if delay != self.delay:
+            self.write(DELAY, delay)
+            self.delay = delay
+
+        bits = sum(
+            1 << index
+            for index, down in enumerate(
+                (*self.buttons, *(key in self.pressed for key in KEYS))
+            )
+            if down
+        )
+        self.write(TICK, delta, *self.position, bits)
+        self.ticks += 1
+
+    def close(self) -> None:
+        clock.set_source(self.live)
+        self.file.close()
+
+
+class Replayer:
+    def __init__(self, path: str, world: TileMap | str | None = None) -> None:
+        with open(path, "rb") as file:
+            data = file.read()
+
+        if len(data) < HEADER.size:
+            raise ValueError(f"{path} is not an input recording")
+        (
+            magic,
+            version,
+            wave_mode,
+            width,
+            height,
+            self.dt,
+            self.step_budget,
+            length,
+        ) = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} recording")
+
+        self.wave_mode = bool(wave_mode)
+        self.size = width, height
+        self.map_path = data[HEADER.size : HEADER.size + length].decode()
+        self.data = data[HEADER.size + length :]
+
+        world = world if world is not None else self.map_path
+        self.world = world = (
+            load_map(world) if isinstance(world, str) else world
+        )
+
+        self.clock = clock.SimulatedClock()
+        self.input = ScriptedInput()
+        self.game = Game(
+            world,
+            world.tile_x,
+            world.tile_y,
+            world.rows,
+            world.cols,
+            pg.Surface(self.size),
+            0,
+            pg.Rect((0, 0), world.size),
+            self.wave_mode,
+            self.input,
+            headless=True,
+        )
+
+    def __iter__(self) -> Iterator[tuple[int, tuple[int, ...]]]:
+        data, offset = self.data, 0
+        while offset < len(data):
+            (kind,) = KIND.unpack_from(data, offset)
+            record = RECORDS[kind]
+            yield kind, record.unpack_from(data, offset + KIND.size)
+            offset += KIND.size + record.size
+
+    def run(
+        self,
+        realtime: bool = False,
+        on_step: Callable[[Game], None] | None = None,
+    ) -> dict[str, float]:
+        simulated = self.clock
+        clock.set_source(simulated.get_ticks)
+        game, input_source = self.game, self.input
+
+        steps = sessions = games_over = 0
+        paced = None
+        start = time.perf_counter()
+        try:
+            for kind, values in self:
+                if kind == SEED:
+                    tick, seed = values
+                    simulated.ticks = tick
+                    game.reseed(seed)
+                    game.path_scheduler.step_budget = self.step_budget
+                    game.reset()
+                    sessions += 1
+                    paced = None
+                elif kind == CLOCK:
+                    simulated.ticks = values[0]
+                    paced = None
+                elif kind == DELAY:
+                    game.game_start_delay = values[0]
+                elif kind == TICK:
+                    delta, x, y, bits = values
+                    simulated.ticks += delta
+                    input_source.position = x, y
+                    input_source.buttons = tuple(
+                        bool(bits & 1 << index) for index in range(3)
+                    )
+                    input_source.pressed = {
+                        key
+                        for index, key in enumerate(KEYS, 3)
+                        if bits & 1 << index
+                    }
+
+                    if realtime:
+                        if paced is None:
+                            paced = simulated.ticks, time.perf_counter()
+                        tick, wall = paced
+                        wait = (simulated.ticks - tick) / 1000 - (
+                            time.perf_counter() - wall
+                        )
+                        if wait > 0:
+                            time.sleep(wait)
+
+                    if not game.update(self.dt):
+                        games_over += 1
+                    steps += 1
+                    if on_step is not None:
+                        on_step(game)
+        finally:
+            clock.set_source(None)
+            game.path_scheduler.stop()
+        elapsed = time.perf_counter() - start
+
+        return {
+            "steps": steps,
+            "sessions": sessions,
+            "games_over": games_over,
+            "seconds": elapsed,
+            "steps_per_second": steps / elapsed if elapsed else float("inf"),
+        }
+
+
+def main() -> None:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    parser = argparse.ArgumentParser(description="Replay an input recording.")
+    parser.add_argument("path")
+    parser.add_argument("--map", default=None)
+    parser.add_argument("--realtime", action="store_true")
+    args = parser.parse_args()
+
+    replayer = Replayer(args.path, args.map)
+    stats = replayer.run(args.realtime)
+    game = replayer.game
+
+    print(
+        f"{stats['steps']} steps over {stats['sessions']} sessions in "
+        f"{stats['seconds']:.2f}s ({stats['steps_per_second']:.0f} steps/s, "
+        f"{stats['games_over']} games over)"
+    )
+    print(
+        f"kills {game.player.kill_count} enemies {len(game.enemies)} "
+        f"ammo {game.player.ammo} player {tuple(game.player.position)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+from typing import Hashable
+
+import pygame as pg
+
+from .atlas import Atlas
+
+
+class RotationAtlas:
+    def __init__(
+        self,
+        image: pg.Surface,
+        step: int = 3,
+        flipped: bool = False,
+        atlas: Atlas | None = None,
+        name: Hashable = None,
+    ) -> None:
+        if step <= 0 or 360 % step:
+            raise ValueError("step must be a positive divisor of 360")
+
+        self.step = step
+        self.count = 360 // step
+
+        variants = [image]
+        if flipped:
+            variants.append(pg.transform.flip(image, False, True))
+
+        rotated = {
+            (name, variant, i): pg.transform.rotate(source, -i * step)
+            for variant, source in enumerate(variants)
+            for i in range(self.count)
+        }
+        if atlas is not None:
+            atlas.add(rotated)
+            rotated = {key: atlas.image(key) for key in rotated}
+
+        self.images = [
+            [rotated[name, variant, i] for i in range(self.count)]
+            for variant in range(len(variants))
+        ]
+        self.half_sizes = [
+            [(image.get_width() / 2, image.get_height() / 2) for image in row]
+            for row in self.images
+        ]
+
+    def index(self, angle: float) -> int:
+        return round(angle / self.step) % self.count
+
+    def get(self, angle: float, flipped: bool = False) -> pg.Surface:
+        return self.images[flipped][self.index(angle)]
+
+    def half_size(
+        self, angle: float, flipped: bool = False
+    ) -> tuple[float, float]:
+        return self.half_sizes[flipped][self.index(angle)]
+
+    def rect(
+        self, angle: float, center: tuple[float, float], flipped: bool = False
+    ) -> pg.Rect:
+        return self.get(angle, flipped).get_rect(center=center)
@@ -1,16 +1,19 @@
 import pygame as pg
 
 from scripts.gui_elements import DropDown
-from scripts.utilities import load_audio
+from scripts.assets import AssetManager
 
 
 class Settings:
-    def __init__(self, screen: pg.Surface) -> None:
+    def __init__(
+        self, screen: pg.Surface, assets: AssetManager | None = None
+    ) -> None:
         self.screen = screen
         self.w, self.h = self.screen.get_size()
 
         self.font = pg.Font(size=32)
-        self.click_sound = load_audio("button_click.ogg", 0.85)
+        assets = assets if assets is not None else AssetManager()
+        self.click_sound = assets.sound("button_click.ogg", 0.85)
 
         self.fps_dropdown = DropDown(
             "FPS: ",
@@ -37,6 +40,9 @@ class Settings:
                     else:
                         self.fps = int(option)
 
-    def render(self, display: pg.Surface) -> None:
+    def render(self, display: pg.Surface) -> list[pg.Rect]:
+        rects = []
         for dropdown in self.dropdowns:
-            dropdown.draw(display)
+            rects += dropdown.draw(display)
+
+        return rects
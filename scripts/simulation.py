@@ -0,0 +1,535 @@
+import os
+import time
+from multiprocessing import get_context, shared_memory
+
+import numpy as np
+import pygame as pg
+
+from .clock import get_ticks
+from .game import Game
+from .game_assets import GameAssets
+from .hud import Hud
+from .input_source import KEYS, InputSource, KeyState
+from .render_queue import RenderQueue
+from .replay import InputRecorder
+from .tilemap import load_map
+from .timestep import FixedTimestep
+
+
+SOUNDS = ("gunshot", "empty_gun", "reload")
+CONTROL = ("quit", "over", "paused", "generation", "published")
+INPUT = ("mouse_x", "mouse_y", "left", "middle", "right", *KEYS)
+SCALARS = (
+    "seq",
+    "generation",
+    "time",
+    "view_x",
+    "view_y",
+    "previous_x",
+    "previous_y",
+    "player_x",
+    "player_y",
+    "player_px",
+    "player_py",
+    "player_cx",
+    "player_cy",
+    "rifle_cx",
+    "rifle_cy",
+    "state",
+    "flipped",
+    "frame",
+    "angle",
+    "ammo",
+    "kills",
+    "enemies",
+    "bullets",
+    "items",
+    "update_ms",
+    *SOUNDS,
+)
+ENEMY = (
+    "cx",
+    "cy",
+    "x",
+    "y",
+    "px",
+    "py",
+    "health",
+    "state",
+    "flipped",
+    "frame",
+)
+BULLET = ("x", "y", "px", "py", "rotation")
+ITEM = ("x", "y")
+
+C = {name: index for index, name in enumerate(CONTROL)}
+S = {name: index for index, name in enumerate(SCALARS)}
+
+
+def layout(
+    enemies: int, bullets: int, items: int
+) -> list[tuple[str, type, tuple[int, ...]]]:
+    return [
+        ("control", np.int64, (len(CONTROL),)),
+        ("input", np.float64, (len(INPUT),)),
+        ("scalars", np.float64, (2, len(SCALARS))),
+        ("enemies", np.float64, (2, enemies, len(ENEMY))),
+        ("bullets", np.float64, (2, bullets, len(BULLET))),
+        ("items", np.float64, (2, items, len(ITEM))),
+    ]
+
+
+class SharedState:
+    def __init__(
+        self,
+        name: str | None = None,
+        enemies: int = 512,
+        bullets: int = 1024,
+        items: int = 8,
+    ) -> None:
+        self.capacity = enemies, bullets, items
+        fields = layout(*self.capacity)
+        size = sum(
+            np.dtype(dtype).itemsize * int(np.prod(shape))
+            for _, dtype, shape in fields
+        )
+
+        self.owner = name is None
+        self.memory = shared_memory.SharedMemory(
+            name=name, create=self.owner, size=size
+        )
+        self.name = self.memory.name
+
+        offset = 0
+        for field, dtype, shape in fields:
+            array = np.ndarray(shape, dtype, self.memory.buf, offset)
+            setattr(self, field, array)
+            offset += array.nbytes
+
+        if self.owner:
+            self.memory.buf[:size] = bytes(size)
+            self.control[C["paused"]] = 1
+
+    def write_input(self, source: InputSource) -> None:
+        keys = source.keys_pressed()
+        self.input[:] = (
+            *source.mouse_pos(),
+            *source.mouse_pressed(),
+            *(keys[key] for key in KEYS),
+        )
+
+    def publish(self, game: Game) -> None:
+        back = 1 - int(self.control[C["published"]])
+        row = self.scalars[back]
+        row[S["seq"]] += 1
+
+        player, rifle, camera = game.player, game.rifle, game.camera
+        states = list(player.animation.frames)
+        enemy_states = list(game.animations["enemy"].frames)
+        enemies, bullets, items = self.capacity
+
+        slots = game.swarm.slots
+        slots = [(enemy, slots[enemy]) for enemy in game.enemies][:enemies]
+        if slots:
+            index = np.array([slot for _, slot in slots])
+            table = self.enemies[back, : len(slots)]
+            table[:, 0:2] = [enemy.rect.center for enemy, _ in slots]
+            table[:, 2:4] = game.swarm.positions[index]
+            table[:, 4:6] = game.swarm.previous[index]
+            table[:, 6:] = [
+                (
+                    enemy.health,
+                    enemy_states.index(enemy.state),
+                    enemy._flipped,
+                    enemy.frame_index,
+                )
+                for enemy, _ in slots
+            ]
+
+        pool = game.bullets
+        live = pool.live()[:bullets]
+        table = self.bullets[back, : len(live)]
+        table[:, 0:2] = pool.positions[live]
+        table[:, 2:4] = pool.previous[live]
+        table[:, 4] = pool.rotation[live]
+
+        ammos = [ammo.rect.topleft for ammo in game.ammos][:items]
+        if ammos:
+            self.items[back, : len(ammos)] = ammos
+
+        row[S["generation"] :] = (
+            self.control[C["generation"]],
+            time.monotonic(),
+            *camera.viewport.topleft,
+            *camera.previous,
+            *player.position,
+            *game.player_previous,
+            *player.rect.center,
+            *rifle.rect.center,
+            states.index(player.state),
+            player._flipped,
+            player.frame_index,
+            rifle.angle,
+            player.ammo,
+            player.kill_count,
+            len(slots),
+            len(live),
+            len(ammos),
+            game.update_time * 1000,
+            *(game.sound_counts.get(name, 0) for name in SOUNDS),
+        )
+
+        row[S["seq"]] += 1
+        self.control[C["published"]] = back
+
+    def read(self) -> "Snapshot | None":
+        for _ in range(8):
+            front = int(self.control[C["published"]])
+            row = self.scalars[front]
+            seq = row[S["seq"]]
+            if seq == 0 or seq % 2:
+                continue
+
+            scalars = row.copy()
+            enemies = int(scalars[S["enemies"]])
+            bullets = int(scalars[S["bullets"]])
+            items = int(scalars[S["items"]])
+            snapshot = Snapshot(
+                scalars,
+                self.enemies[front, :enemies].copy(),
+                self.bullets[front, :bullets].copy(),
+                self.items[front, :items].copy(),
+            )
+            if row[S["seq"]] == seq:
+                return snapshot
+        return None
+
+    def close(self) -> None:
+        for field, _, _ in layout(*self.capacity):
+            setattr(self, field, None)
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+
+class Snapshot:
+    def __init__(
+        self,
+        scalars: np.ndarray,
+        enemies: np.ndarray,
+        bullets: np.ndarray,
+        items: np.ndarray,
+    ) -> None:
+        self.scalars = scalars
+        self.enemies = enemies
+        self.bullets = bullets
+        self.items = items
+
+    def __getitem__(self, name: str) -> float:
+        return float(self.scalars[S[name]])
+
+
+class SharedInput(InputSource):
+    def __init__(self, state: SharedState) -> None:
+        self.state = state
+
+    def keys_pressed(self) -> KeyState:
+        pressed = self.state.input[5:]
+        return KeyState(
+            {key for key, down in zip(KEYS, pressed.tolist()) if down}
+        )
+
+    def mouse_pos(self) -> tuple[int, int]:
+        x, y = self.state.input[:2].tolist()
+        return int(x), int(y)
+
+    def mouse_pressed(self) -> tuple[bool, bool, bool]:
+        left, middle, right = self.state.input[2:5].tolist()
+        return bool(left), bool(middle), bool(right)
+
+
+def run_worker(
+    name: str,
+    capacity: tuple[int, int, int],
+    world: str,
+    size: tuple[int, int],
+    wave_mode: bool,
+    rate: int,
+    invulnerable: bool = False,
+    record: str | None = None,
+) -> None:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+    pg.init()
+    state = SharedState(name, *capacity)
+    control = state.control
+
+    timestep = FixedTimestep(rate)
+    recorder = (
+        InputRecorder(
+            record, world, size, wave_mode, timestep.dt, SharedInput(state)
+        )
+        if record is not None
+        else None
+    )
+
+    world = load_map(world)
+    screen = pg.Surface(size)
+    game = Game(
+        world,
+        world.tile_x,
+        world.tile_y,
+        world.rows,
+        world.cols,
+        screen,
+        0,
+        pg.Rect((0, 0), world.size),
+        wave_mode,
+        recorder if recorder is not None else SharedInput(state),
+        headless=True,
+    )
+    game.invulnerable = invulnerable
+
+    generation, paused = 0, True
+    last = time.perf_counter()
+    try:
+        while not control[C["quit"]]:
+            now = time.perf_counter()
+            elapsed, last = (now - last) * 1000, now
+
+            if control[C["generation"]] != generation:
+                generation = int(control[C["generation"]])
+                if recorder is not None:
+                    recorder.start(game)
+                else:
+                    game.reset()
+                game.game_start_delay = get_ticks()
+                timestep.reset()
+                state.publish(game)
+
+            if control[C["paused"]] or not generation:
+                paused = True
+                time.sleep(timestep.step_ms / 4000)
+                continue
+            if paused:
+                paused = False
+                game.game_start_delay = get_ticks()
+                timestep.reset()
+                continue
+
+            steps = timestep.advance(elapsed)
+            for _ in range(steps):
+                if recorder is not None:
+                    recorder.capture()
+                if not game.update(timestep.dt):
+                    control[C["over"]] = 1
+                    break
+            if control[C["over"]]:
+                break
+            if steps:
+                state.publish(game)
+
+            time.sleep(max(timestep.step_ms - timestep.accumulator, 0) / 1000)
+    finally:
+        if recorder is not None:
+            recorder.close()
+        game.path_scheduler.stop()
+        state.close()
+        pg.quit()
+
+
+class Simulation:
+    def __init__(
+        self,
+        world: str,
+        size: tuple[int, int],
+        wave_mode: bool = False,
+        rate: int = 60,
+        invulnerable: bool = False,
+        record: str | None = None,
+        enemies: int = 512,
+        bullets: int = 1024,
+        items: int = 8,
+    ) -> None:
+        if not isinstance(world, str):
+            raise TypeError("the simulation worker loads the map by path")
+
+        self.state = SharedState(None, enemies, bullets, items)
+        self.step_ms = 1000 / rate
+        self.process = get_context("spawn").Process(
+            target=run_worker,
+            args=(
+                self.state.name,
+                self.state.capacity,
+                world,
+                size,
+                wave_mode,
+                rate,
+                invulnerable,
+                record,
+            ),
+            daemon=True,
+        )
+        self.process.start()
+
+    @property
+    def running(self) -> bool:
+        return (
+            not self.state.control[C["over"]] and self.process.exitcode is None
+        )
+
+    @property
+    def generation(self) -> int:
+        return int(self.state.control[C["generation"]])
+
+    def new_game(self) -> None:
+        self.state.control[C["over"]] = 0
+        self.state.control[C["generation"]] += 1
+
+    def pause(self, paused: bool) -> None:
+        self.state.control[C["paused"]] = paused
+
+    def send_input(self, source: InputSource) -> None:
+        self.state.write_input(source)
+
+    def snapshot(self) -> Snapshot | None:
+        snapshot = self.state.read()
+        if snapshot is None or snapshot["generation"] != self.generation:
+            return None
+        return snapshot
+
+    def alpha(self, snapshot: Snapshot) -> float:
+        elapsed = (time.monotonic() - snapshot["time"]) * 1000
+        return min(max(elapsed / self.step_ms, 0.0), 1.0)
+
+    def close(self) -> None:
+        self.state.control[C["quit"]] = 1
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.state.close()
+
+
+class SimulationView:
+    def __init__(
+        self, media: GameAssets, bg_rect: pg.Rect, wave_mode: bool = False
+    ) -> None:
+        self.media = media
+        self.bg_rect = bg_rect
+        self.render_queue = RenderQueue()
+        self.hud = Hud(media.fps_font, wave_mode)
+        self.sounds = dict.fromkeys(SOUNDS, 0)
+
+    def lerp(self, snapshot: Snapshot, alpha: float) -> tuple[int, int]:
+        x, y = snapshot["previous_x"], snapshot["previous_y"]
+        return (
+            round(x + (snapshot["view_x"] - x) * alpha),
+            round(y + (snapshot["view_y"] - y) * alpha),
+        )
+
+    def play(self, snapshot: Snapshot) -> None:
+        for name, count in self.sounds.items():
+            played = int(snapshot[name])
+            if played > count:
+                self.media.audio[name].play()
+            self.sounds[name] = played
+
+    def render(
+        self, display: pg.Surface, snapshot: Snapshot, alpha: float
+    ) -> list[pg.Rect]:
+        media = self.media
+        queue = self.render_queue
+        view = display.get_rect(topleft=self.lerp(snapshot, alpha))
+        x, y = -view.x, -view.y
+
+        player = media.animations["player"]
+        states = list(player.frames)
+        lag = (
+            round(
+                (snapshot["player_px"] - snapshot["player_x"]) * (1 - alpha)
+            ),
+            round(
+                (snapshot["player_py"] - snapshot["player_y"]) * (1 - alpha)
+            ),
+        )
+
+        image = player.get(
+            states[int(snapshot["state"])], bool(snapshot["flipped"])
+        )[int(snapshot["frame"])]
+        angle = snapshot["angle"]
+        rifle = media.rifle_rotations.get(angle, 90 <= angle <= 270)
+
+        rects = []
+        for image, center in (
+            (image, (snapshot["player_cx"], snapshot["player_cy"])),
+            (rifle, (snapshot["rifle_cx"], snapshot["rifle_cy"])),
+        ):
+            rect = image.get_rect(center=center).move(x + lag[0], y + lag[1])
+            queue.add(image, rect)
+            rects.append(rect)
+
+        bounds = view.inflate(0, media.health_bar_offset[1] * 2)
+        ammo = media.images["ammo"]
+        for item in snapshot.items.tolist():
+            rect = ammo.get_rect(topleft=item)
+            if bounds.colliderect(rect):
+                rect.move_ip(x, y)
+                queue.add(ammo, rect)
+                rects.append(rect)
+
+        enemy = media.animations["enemy"]
+        states = list(enemy.frames)
+        bars = media.images["health_bars"]
+        bar_w, bar_h = bars[0].get_size()
+        offset_x, offset_y = media.health_bar_offset
+        table = snapshot.enemies
+        lags = np.rint((table[:, 4:6] - table[:, 2:4]) * (1 - alpha))
+        shown = []
+        for row, (lag_x, lag_y) in zip(table.tolist(), lags.tolist()):
+            cx, cy, _, _, _, _, health, state, flipped, frame = row
+            image = enemy.get(states[int(state)], bool(flipped))[int(frame)]
+            rect = image.get_rect(center=(cx, cy))
+            if bounds.colliderect(rect):
+                shown.append((rect, image, int(lag_x), int(lag_y), health))
+        if not view.contains(self.bg_rect):
+            shown.sort(key=lambda item: item[0].bottom)
+
+        for rect, image, lag_x, lag_y, health in shown:
+            rect = rect.move(x + lag_x, y + lag_y)
+            dest = rect.centerx - offset_x, rect.top - offset_y
+            queue.add(image, rect)
+            queue.add(bars[int(health)], dest)
+            rects.append(rect.union((*dest, bar_w, bar_h)))
+
+        table = snapshot.bullets
+        if len(table):
+            rotations = media.bullet_rotations
+            index = table[:, 4].astype(np.intp)
+            half = np.array(rotations.half_sizes[0])[index]
+            positions = table[:, 2:4] + (table[:, 0:2] - table[:, 2:4]) * alpha
+            dests = positions - half
+            shown = (
+                (dests[:, 0] < view.right)
+                & (dests[:, 0] + half[:, 0] * 2 > view.left)
+                & (dests[:, 1] < view.bottom)
+                & (dests[:, 1] + half[:, 1] * 2 > view.top)
+            )
+            images = rotations.images[0]
+            for rotation, dest in zip(
+                index[shown].tolist(), (dests[shown] - view.topleft).tolist()
+            ):
+                image = images[rotation]
+                queue.add(image, dest)
+                rects.append(image.get_rect(topleft=dest).inflate(2, 2))
+
+        queue.flush(display)
+
+        return rects + self.hud.render(
+            display,
+            int(snapshot["ammo"]),
+            int(snapshot["kills"]),
+            int(snapshot["enemies"]),
+            snapshot["update_ms"] / 1000,
+        )
@@ -0,0 +1,179 @@
+from collections import defaultdict
+
+import numpy as np
+import pygame as pg
+
+from pygame.sprite import Sprite
+from pygame.typing import Point
+
+
+class SpatialHash:
+    def __init__(self, cell_w: int, cell_h: int) -> None:
+        self.cell_w, self.cell_h = cell_w, cell_h
+        self.cells: defaultdict[tuple[int, int], set[Sprite]] = defaultdict(
+            set
+        )
+        self.spans: dict[Sprite, tuple[int, int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __contains__(self, sprite: Sprite) -> bool:
+        return sprite in self.spans
+
+    def cell_span(self, rect: pg.Rect) -> tuple[int, int, int, int]:
+        return (
+            rect.left // self.cell_w,
+            rect.top // self.cell_h,
+            (rect.right - 1) // self.cell_w,
+            (rect.bottom - 1) // self.cell_h,
+        )
+
+    def _cells(self, span: tuple[int, int, int, int]):
+        col0, row0, col1, row1 = span
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                yield col, row
+
+    def insert(self, sprite: Sprite) -> None:
+        if sprite in self.spans:
+            self.move(sprite)
+            return
+
+        span = self.cell_span(sprite.rect)
+        self.spans[sprite] = span
+        for cell in self._cells(span):
+            self.cells[cell].add(sprite)
+
+    def remove(self, sprite: Sprite) -> None:
+        span = self.spans.pop(sprite, None)
+        if span is None:
+            return
+
+        for cell in self._cells(span):
+            members = self.cells[cell]
+            members.discard(sprite)
+            if not members:
+                del self.cells[cell]
+
+    def move(self, sprite: Sprite) -> None:
+        span = self.cell_span(sprite.rect)
+        if self.spans.get(sprite) == span:
+            return
+
+        self.remove(sprite)
+        self.spans[sprite] = span
+        for cell in self._cells(span):
+            self.cells[cell].add(sprite)
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.spans.clear()
+
+    def _gather(self, cells, kind: type | None) -> set[Sprite]:
+        found = set()
+        for cell in cells:
+            members = self.cells.get(cell)
+            if members:
+                found |= members
+
+        if kind is not None:
+            found = {sprite for sprite in found if isinstance(sprite, kind)}
+        return found
+
+    def query_rect(
+        self, rect: pg.Rect, kind: type | None = None
+    ) -> list[Sprite]:
+        candidates = self._gather(self._cells(self.cell_span(rect)), kind)
+        return [
+            sprite for sprite in candidates if sprite.rect.colliderect(rect)
+        ]
+
+    def query_radius(
+        self, center: Point, radius: float, kind: type | None = None
+    ) -> list[Sprite]:
+        x, y = center
+        bounds = pg.Rect(x - radius, y - radius, radius * 2, radius * 2)
+        candidates = self._gather(self._cells(self.cell_span(bounds)), kind)
+
+        found = []
+        for sprite in candidates:
+            rect = sprite.rect
+            dx = x - max(rect.left, min(x, rect.right))
+            dy = y - max(rect.top, min(y, rect.bottom))
+            if dx * dx + dy * dy <= radius * radius:
+                found.append(sprite)
+        return found
+
+    def _spans_of(self, bounds: np.ndarray) -> np.ndarray:
+        return np.stack(
+            (
+                np.floor_divide(bounds[:, 0], self.cell_w),
+                np.floor_divide(bounds[:, 1], self.cell_h),
+                np.floor_divide(bounds[:, 2] - 1, self.cell_w),
+                np.floor_divide(bounds[:, 3] - 1, self.cell_h),
+            ),
+            axis=1,
+        ).astype(np.int64)
+
+    def _expand(self, spans: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        col0, row0, col1, row1 = spans.T
+        owners, keys = [], []
+        for dcol in range(int((col1 - col0).max()) + 1):
+            for drow in range(int((row1 - row0).max()) + 1):
+                idx = np.flatnonzero(
+                    (col0 + dcol <= col1) & (row0 + drow <= row1)
+                )
+                owners.append(idx)
+                keys.append(
+                    ((col0[idx] + dcol) << 32) + (row0[idx] + drow + (1 << 31))
+                )
+        return np.concatenate(owners), np.concatenate(keys)
+
+    def overlaps(
+        self, bounds: np.ndarray, kind: type | None = None
+    ) -> tuple[np.ndarray, list[Sprite]]:
+        sprites = [
+            sprite
+            for sprite in self.spans
+            if kind is None or isinstance(sprite, kind)
+        ]
+        if not len(bounds) or not sprites:
+            return np.empty(0, np.intp), []
+
+        rects = np.array(
+            [
+                (r.left, r.top, r.right, r.bottom)
+                for r in (sprite.rect for sprite in sprites)
+            ],
+            float,
+        )
+        spans = np.array([self.spans[sprite] for sprite in sprites], np.int64)
+
+        mine, my_keys = self._expand(self._spans_of(bounds))
+        theirs, their_keys = self._expand(spans)
+        order = np.argsort(their_keys, kind="stable")
+        theirs, their_keys = theirs[order], their_keys[order]
+
+        low = np.searchsorted(their_keys, my_keys, "left")
+        counts = np.searchsorted(their_keys, my_keys, "right") - low
+        total = int(counts.sum())
+        if not total:
+            return np.empty(0, np.intp), []
+
+        starts = np.cumsum(counts) - counts
+        offsets = np.arange(total) - np.repeat(starts, counts)
+        rows = np.repeat(mine, counts)
+        ids = theirs[np.repeat(low, counts) + offsets]
+
+        a, b = bounds[rows], rects[ids]
+        hit = (
+            (a[:, 0] < b[:, 2])
+            & (b[:, 0] < a[:, 2])
+            & (a[:, 1] < b[:, 3])
+            & (b[:, 1] < a[:, 3])
+        )
+        rows, ids = rows[hit], ids[hit]
+
+        rows, first = np.unique(rows, return_index=True)
+        return rows, [sprites[i] for i in ids[first].tolist()]
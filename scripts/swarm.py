@@ -0,0 +1,232 @@
+import numpy as np
+import pygame as pg
+
+from .entities import Enemy, Entity
+from .flow_field import FlowField
+from .line_of_sight import LineOfSight
+
+
+class EnemySwarm:
+    def __init__(
+        self,
+        flow_field: FlowField,
+        tile_x: int,
+        tile_y: int,
+        capacity: int = 64,
+        sight: LineOfSight | None = None,
+        batched: bool = True,
+    ) -> None:
+        self.flow_field = flow_field
+        self.sight = sight
+        self.batched = batched
+        self.tile_x, self.tile_y = tile_x, tile_y
+
+        self.enemies: list[Enemy | None] = [None] * capacity
+        self.slots: dict[Enemy, int] = {}
+        self.free = list(range(capacity - 1, -1, -1))
+
+        self.positions = np.zeros((capacity, 2))
+        self.previous = np.zeros((capacity, 2))
+        self.velocities = np.zeros((capacity, 2))
+        self.speeds = np.zeros(capacity)
+        self.half_sizes = np.zeros((capacity, 2))
+        self.waypoints = np.zeros((capacity, 2))
+        self.factors = np.zeros(capacity)
+        self.has_waypoint = np.zeros(capacity, bool)
+        self.flow_chasing = np.zeros(capacity, bool)
+        self.needs_plan = np.zeros(capacity, bool)
+        self.alive = np.zeros(capacity, bool)
+
+        self.planned = 0
+        self.sighted = 0
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __iter__(self):
+        return iter(self.slots)
+
+    def _grow(self) -> None:
+        capacity = len(self.alive)
+        for name in (
+            "positions",
+            "previous",
+            "velocities",
+            "speeds",
+            "half_sizes",
+            "waypoints",
+            "factors",
+            "has_waypoint",
+            "flow_chasing",
+            "needs_plan",
+            "alive",
+        ):
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate((array, np.zeros_like(array))))
+
+        self.enemies += [None] * capacity
+        self.free += range(capacity * 2 - 1, capacity - 1, -1)
+
+    def add(self, enemy: Enemy) -> None:
+        if not self.free:
+            self._grow()
+
+        slot = self.free.pop()
+        self.slots[enemy] = slot
+        self.enemies[slot] = enemy
+
+        self.positions[slot] = enemy.position
+        self.previous[slot] = enemy.position
+        self.velocities[slot] = enemy.velocity
+        self.speeds[slot] = enemy.base_speed
+        self.half_sizes[slot] = (
+            enemy.image.get_width() // 2,
+            enemy.image.get_height() // 2,
+        )
+        self.has_waypoint[slot] = False
+        self.flow_chasing[slot] = False
+        self.needs_plan[slot] = True
+        self.alive[slot] = True
+
+    def remove(self, enemy: Enemy) -> None:
+        slot = self.slots.pop(enemy, None)
+        if slot is None:
+            return
+
+        self.enemies[slot] = None
+        self.alive[slot] = False
+        self.free.append(slot)
+
+    def clear(self) -> None:
+        for enemy in list(self.slots):
+            self.remove(enemy)
+
+    def capture(self) -> None:
+        self.previous[:] = self.positions
+
+    def lag(self, alpha: float) -> np.ndarray:
+        lag = (self.previous - self.positions) * (1 - alpha)
+        return np.rint(lag).astype(int)
+
+    def update(
+        self, dt: float, max_rect: pg.Rect, target: Entity, chase_distance: int
+    ) -> None:
+        live = np.flatnonzero(self.alive)
+        if not len(live):
+            return
+        if not self.batched:
+            self._update_each(live, dt, max_rect, target, chase_distance)
+            return
+
+        velocities = self.velocities[live]
+        length = np.hypot(velocities[:, 0], velocities[:, 1])
+        scale = np.where(length >= 1, 1 / np.maximum(length, 1e-9), 1)
+        velocities *= scale[:, None]
+
+        half = self.half_sizes[live]
+        positions = self.positions[live]
+        positions += velocities * (self.speeds[live] * dt)[:, None]
+        positions = np.clip(positions, half, np.array(max_rect.size) - half)
+        self.positions[live] = positions
+
+        enemies = self.enemies
+        for slot, (x, y) in zip(live.tolist(), positions.tolist()):
+            enemy = enemies[slot]
+            enemy.position.update(x, y)
+            enemy.rect.center = x, y
+
+        offset = np.array(target.position) - positions
+        chasing = np.hypot(offset[:, 0], offset[:, 1]) < chase_distance
+
+        direct = np.zeros(len(live), bool)
+        if chasing.any() and self.sight is not None:
+            direct[chasing] = self.sight.visible(
+                positions[chasing], target.position
+            )
+        self.sighted = int(direct.sum())
+
+        tracking = chasing & ~direct
+        steps = np.full((len(live), 2), -1)
+        if tracking.any():
+            steps[tracking] = self.flow_field.next_tiles(positions[tracking])
+        flowing = tracking & (steps[:, 1] >= 0)
+        steered = direct | flowing
+
+        was_steered = self.flow_chasing[live]
+        for slot in live[steered & ~was_steered].tolist():
+            enemies[slot].cancel_path()
+        self.needs_plan[live[was_steered & ~steered]] = True
+        self.flow_chasing[live] = steered
+
+        tiles = np.array((self.tile_x, self.tile_y))
+        self.waypoints[live[flowing]] = steps[flowing] * tiles
+        self.waypoints[live[direct]] = target.position
+        self.factors[live[steered]] = 1
+        self.has_waypoint[live[steered]] = True
+
+        waypoints = self.waypoints[live]
+        rect_low = np.floor(positions) - half
+        reached = np.all(
+            (waypoints >= rect_low) & (waypoints < rect_low + half * 2),
+            axis=1,
+        )
+
+        python = ~steered & (
+            chasing
+            | self.needs_plan[live]
+            | reached
+            | ~self.has_waypoint[live]
+        )
+        self.planned = int(python.sum())
+        for slot in live[python].tolist():
+            self._plan(slot, enemies[slot], target, chase_distance)
+
+        direction = self.waypoints[live] - positions
+        velocities = direction * self.factors[live][:, None]
+        still = ~self.has_waypoint[live]
+        velocities[still] = self.velocities[live][still]
+        self.velocities[live] = velocities
+
+    def _update_each(
+        self,
+        live: np.ndarray,
+        dt: float,
+        max_rect: pg.Rect,
+        target: Entity,
+        chase_distance: int,
+    ) -> None:
+        enemies = self.enemies
+        for slot in live.tolist():
+            enemy = enemies[slot]
+            enemy.update(dt, max_rect, target, chase_distance)
+            self.positions[slot] = enemy.position
+            self.velocities[slot] = enemy.velocity
+
+        self.flow_chasing[live] = False
+        self.needs_plan[live] = True
+        self.planned = len(live)
+        self.sighted = 0
+
+    def _plan(
+        self, slot: int, enemy: Enemy, target: Entity, chase_distance: int
+    ) -> None:
+        enemy.plan(target, chase_distance)
+        enemy.steer()
+        self.velocities[slot] = enemy.velocity
+
+        if enemy.path[0]:
+            point = enemy.path[0][0]
+            self.waypoints[slot] = (
+                point.x * self.tile_x,
+                point.y * self.tile_y,
+            )
+            self.factors[slot] = 0.3 if enemy.path[1] == "roam" else 1
+            self.has_waypoint[slot] = True
+        elif enemy.pending is not None:
+            self.waypoints[slot] = enemy.pending_dest
+            self.factors[slot] = 0.3 if enemy.pending.reason == "roam" else 1
+            self.has_waypoint[slot] = True
+        else:
+            self.has_waypoint[slot] = False
+
+        self.needs_plan[slot] = enemy.pending is not None
@@ -0,0 +1,224 @@
+import argparse
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+import numpy as np
+
+from pygame.typing import Point
+
+
+HEADER = struct.Struct("<4sIIIIII")
+MAGIC = b"UMAP"
+VERSION = 2
+
+
+class TileMap:
+    def __init__(
+        self,
+        data: np.ndarray,
+        tile_x: int = 1,
+        tile_y: int = 1,
+        chunk_size: int = 64,
+        max_chunks: int = 256,
+        shape: tuple[int, int] | None = None,
+    ) -> None:
+        self.data = data
+        self.rows, self.cols = shape if shape is not None else data.shape
+        self.tile_x, self.tile_y = tile_x, tile_y
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+
+        self.chunks: OrderedDict[tuple[int, int], np.ndarray] = OrderedDict()
+        self.lock = threading.RLock()
+
+        self.loads = 0
+        self.evictions = 0
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.cols * self.tile_x, self.rows * self.tile_y
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(chunk.nbytes for chunk in self.chunks.values())
+
+    def chunk(self, chunk_row: int, chunk_col: int) -> np.ndarray:
+        key = chunk_row, chunk_col
+        with self.lock:
+            chunk = self.chunks.get(key)
+            if chunk is not None:
+                self.chunks.move_to_end(key)
+                return chunk
+
+            if self.data.ndim == 4:
+                chunk = np.array(self.data[chunk_row, chunk_col])
+            else:
+                size = self.chunk_size
+                row, col = chunk_row * size, chunk_col * size
+                chunk = np.array(self.data[row : row + size, col : col + size])
+            chunk = chunk != 0
+
+            self.loads += 1
+            self.chunks[key] = chunk
+            if len(self.chunks) > self.max_chunks:
+                self.chunks.popitem(last=False)
+                self.evictions += 1
+
+            return chunk
+
+    def region(self, row0: int, col0: int, row1: int, col1: int) -> np.ndarray:
+        out = np.zeros((max(row1 - row0, 0), max(col1 - col0, 0)), bool)
+        r0, c0 = max(row0, 0), max(col0, 0)
+        r1, c1 = min(row1, self.rows), min(col1, self.cols)
+        if r0 >= r1 or c0 >= c1:
+            return out
+
+        size = self.chunk_size
+        for chunk_row in range(r0 // size, (r1 - 1) // size + 1):
+            top = chunk_row * size
+            y0, y1 = max(r0, top), min(r1, top + size)
+            for chunk_col in range(c0 // size, (c1 - 1) // size + 1):
+                left = chunk_col * size
+                x0, x1 = max(c0, left), min(c1, left + size)
+                out[y0 - row0 : y1 - row0, x0 - col0 : x1 - col0] = self.chunk(
+                    chunk_row, chunk_col
+                )[y0 - top : y1 - top, x0 - left : x1 - left]
+
+        return out
+
+    def walkable(self, col: int, row: int) -> bool:
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+
+        size = self.chunk_size
+        return bool(
+            self.chunk(row // size, col // size)[row % size, col % size]
+        )
+
+    def chunk_of(self, positions: Iterable[Point]) -> np.ndarray:
+        size = self.chunk_size
+        return (
+            np.asarray(positions, float).reshape(-1, 2)
+            // (self.tile_x * size, self.tile_y * size)
+        ).astype(np.intp)
+
+    @property
+    def complete(self) -> bool:
+        size = self.chunk_size
+        return len(self.chunks) == (
+            ((self.rows - 1) // size + 1) * ((self.cols - 1) // size + 1)
+        )
+
+    def touch(self, *groups: Iterable[Point], radius: int = 1) -> None:
+        if self.complete:
+            return
+
+        size = self.chunk_size
+        chunk_rows = (self.rows - 1) // size + 1
+        chunk_cols = (self.cols - 1) // size + 1
+
+        positions = np.concatenate(
+            [np.asarray(group, float).reshape(-1, 2) for group in groups]
+        )
+
+        keys = np.unique(
+            np.clip(
+                positions[:, 1] // (self.tile_y * size), 0, chunk_rows - 1
+            ).astype(np.int64)
+            * chunk_cols
+            + np.clip(
+                positions[:, 0] // (self.tile_x * size), 0, chunk_cols - 1
+            ).astype(np.int64)
+        )
+
+        wanted = set()
+        for key in keys.tolist():
+            chunk_row, chunk_col = divmod(key, chunk_cols)
+            for row in range(chunk_row - radius, chunk_row + radius + 1):
+                for col in range(chunk_col - radius, chunk_col + radius + 1):
+                    if 0 <= row < chunk_rows and 0 <= col < chunk_cols:
+                        wanted.add((row, col))
+
+        for key in sorted(wanted)[: self.max_chunks]:
+            self.chunk(*key)
+
+
+def save_map(
+    path: str,
+    matrix: np.ndarray | list,
+    tile_x: int,
+    tile_y: int,
+    chunk_size: int = 64,
+) -> None:
+    grid = np.asarray(matrix)
+    rows, cols = grid.shape
+    size = chunk_size
+    chunk_cols = -(-cols // size)
+
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as file:
+        file.write(
+            HEADER.pack(MAGIC, VERSION, rows, cols, tile_x, tile_y, chunk_size)
+        )
+        for row in range(0, rows, size):
+            band = np.zeros((size, chunk_cols * size), np.uint8)
+            part = grid[row : row + size]
+            band[: len(part), :cols] = part != 0
+            file.write(
+                band.reshape(size, chunk_cols, size).swapaxes(0, 1).tobytes()
+            )
+    os.replace(temp, path)
+
+
+def load_map(path: str, max_chunks: int = 256) -> TileMap:
+    with open(path, "rb") as file:
+        header = file.read(HEADER.size)
+
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is not a map file")
+
+    magic, version, rows, cols, tile_x, tile_y, chunk_size = HEADER.unpack(
+        header
+    )
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} map file")
+    shape = -(-rows // chunk_size), -(-cols // chunk_size)
+    shape += chunk_size, chunk_size
+    if os.path.getsize(path) != HEADER.size + int(np.prod(shape)):
+        raise ValueError(f"{path} is truncated")
+
+    data = np.memmap(path, np.uint8, "r", offset=HEADER.size, shape=shape)
+    return TileMap(data, tile_x, tile_y, chunk_size, max_chunks, (rows, cols))
+
+
+def as_tilemap(
+    matrix: "TileMap | np.ndarray | list", tile_x: int = 1, tile_y: int = 1
+) -> TileMap:
+    if isinstance(matrix, TileMap):
+        return matrix
+    return TileMap(np.asarray(matrix), tile_x, tile_y)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert a walkability grid into a map file."
+    )
+    parser.add_argument("source", help="a .npy walkability grid")
+    parser.add_argument("output")
+    parser.add_argument("--tile", type=int, nargs=2, default=(32, 18))
+    parser.add_argument("--chunk", type=int, default=64)
+    args = parser.parse_args()
+
+    save_map(
+        args.output,
+        np.load(args.source, mmap_mode="r"),
+        *args.tile,
+        args.chunk,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+class FixedTimestep:
+    def __init__(self, rate: int = 60, max_steps: int = 5) -> None:
+        self.rate = rate
+        self.step_ms = 1000 / rate
+        self.dt = 60 / rate
+        self.max_steps = max_steps
+
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+        self.steps = 0
+        self.dropped_ms = 0.0
+
+    def reset(self) -> None:
+        self.accumulator = 0.0
+        self.alpha = 1.0
+
+    def advance(self, elapsed_ms: float) -> int:
+        self.accumulator += elapsed_ms
+        steps = int(self.accumulator // self.step_ms)
+        if steps > self.max_steps:
+            self.dropped_ms += (steps - self.max_steps) * self.step_ms
+            steps = self.max_steps
+
+        self.accumulator = min(
+            self.accumulator - steps * self.step_ms, self.step_ms
+        )
+        self.alpha = self.accumulator / self.step_ms
+        self.steps += steps
+        return steps
@@ -1,35 +1,114 @@
 import pygame as pg
-from numpy import ndarray
 import os
-import random
+from typing import Hashable
 
-from pygame.typing import Point
+from .asset_cache import AssetCache, display_format
 
 
-def load_image(
+_asset_cache: AssetCache | None = AssetCache()
+
+
+def set_asset_cache(cache: AssetCache | None) -> None:
+    global _asset_cache
+    _asset_cache = cache
+
+
+def get_asset_cache() -> AssetCache | None:
+    return _asset_cache
+
+
+def image_names(image_path: str) -> list[str]:
+    return [
+        os.path.join(image_path, image)
+        for image in sorted(
+            os.listdir(os.path.join("./assets/images", image_path))
+        )
+    ]
+
+
+def decode_image(
+    image_path: str,
+    scale: float | tuple[float, float] = 1,
+    size: tuple[int, int] | None = None,
+    flip: bool = False,
+    target: Hashable = None,
+) -> tuple[pg.Surface, bool]:
+    image_path = os.path.join("./assets/images", image_path)
+
+    if _asset_cache is not None:
+        image = _asset_cache.fetch(image_path, (scale, size, flip, target))
+        if image is not None:
+            return image, False
+
+    image = pg.image.load(image_path)
+    image = pg.transform.scale_by(image, scale)
+    if size is not None:
+        image = pg.transform.scale(image, size)
+    if flip:
+        image = pg.transform.flip(image, True, False)
+    return image, True
+
+
+def finish_image(
     image_path: str,
+    image: pg.Surface,
+    baked: bool,
     colorkey: pg.Color,
     alpha: bool = False,
     scale: float | tuple[float, float] = 1,
+    size: tuple[int, int] | None = None,
+    flip: bool = False,
+    target: Hashable = None,
 ) -> pg.Surface:
-    image = pg.image.load(os.path.join("./assets/images", image_path))
-    image = pg.transform.scale_by(image, scale)
+    if baked:
+        if target is not None:
+            image = image.convert_alpha() if alpha else image.convert()
+        if _asset_cache is not None:
+            _asset_cache.store(
+                os.path.join("./assets/images", image_path),
+                (scale, size, flip, target),
+                image,
+            )
+
     image.set_colorkey(colorkey) if not alpha else False
-    image = image.convert_alpha() if alpha else image.convert()
     return image
 
 
+def load_image(
+    image_path: str,
+    colorkey: pg.Color,
+    alpha: bool = False,
+    scale: float | tuple[float, float] = 1,
+    convert: bool = True,
+    size: tuple[int, int] | None = None,
+    flip: bool = False,
+) -> pg.Surface:
+    target = (alpha, display_format()) if convert else None
+    image, baked = decode_image(image_path, scale, size, flip, target)
+    return finish_image(
+        image_path,
+        image,
+        baked,
+        colorkey,
+        alpha,
+        scale,
+        size,
+        flip,
+        target,
+    )
+
+
 def load_images(
     image_path: str,
     colorkey: pg.Color,
     alpha: bool = False,
     scale: float | tuple[float, float] = 1,
+    convert: bool = True,
+    flip: bool = False,
 ) -> list[pg.Surface]:
     return [
-        load_image(os.path.join(image_path, image), colorkey, alpha, scale)
-        for image in sorted(
-            os.listdir(os.path.join("./assets/images", image_path))
-        )
+        load_image(image, colorkey, alpha, scale, convert, flip=flip)
+        for image in image_names(image_path)
     ]
 
 
@@ -41,38 +120,3 @@ def load_audio(audio_path: str, volume: float = 1.0) -> pg.Sound:
     audio = pg.Sound(audio_path)
     audio.set_volume(min(1.0, max(0, volume)))
     return audio
-
-
-def get_random_position(
-    point: pg.Vector2,
-    size: Point,
-    radius: int,
-    max_rect: pg.Rect,
-    matrix: ndarray,
-    tile_x: int,
-    tile_y: int,
-) -> tuple[int, int]:
-    while True:
-        x = random.randint(max_rect.left + size[0], max_rect.right - size[0])
-        y = random.randint(max_rect.top + size[1], max_rect.bottom - size[1])
-
-        dist = point.distance_to((x, y))
-        if dist < radius:
-            continue
-
-        valid = True
-        rect = pg.Rect((x, y), size)
-        rect.clamp_ip(max_rect)
-        for gy in range(rect.top, rect.bottom):
-            for gx in range(rect.left, rect.right):
-                if matrix[gy // tile_y][gx // tile_x] == 0:
-                    valid = False
-                    break
-
-            if not valid:
-                break
-
-        if not valid:
-            continue
-
-        return x, y
@@ -0,0 +1,206 @@
+from collections import OrderedDict
+
+import numpy as np
+import pygame as pg
+
+from pygame.typing import Point
+
+from .tilemap import TileMap, as_tilemap
+
+
+class WalkabilityIndex:
+    def __init__(
+        self,
+        matrix: "TileMap | np.ndarray | list",
+        tile_x: int,
+        tile_y: int,
+        bounds: pg.Rect,
+        seed: int | None = None,
+        window: int = 128,
+        max_areas: int = 16,
+    ) -> None:
+        self.map = as_tilemap(matrix, tile_x, tile_y)
+        self.tile_x, self.tile_y = tile_x, tile_y
+        self.bounds = pg.Rect(bounds)
+        self.rng = np.random.default_rng(seed)
+        self.rows, self.cols = self.map.rows, self.map.cols
+
+        self.window = window
+        self.max_areas = max_areas
+        self.tables: OrderedDict[tuple[int, int, int, int], np.ndarray] = (
+            OrderedDict()
+        )
+        self.pools: dict[tuple, dict[str, np.ndarray]] = {}
+
+    def area_of(self, point: Point | None) -> tuple[int, int, int, int]:
+        if self.rows <= self.window and self.cols <= self.window:
+            return 0, 0, self.rows, self.cols
+
+        if point is None:
+            point = self.bounds.center
+
+        size = self.map.chunk_size
+        half = self.window // 2
+        row = int(point[1] // self.tile_y) - half
+        col = int(point[0] // self.tile_x) - half
+        row0 = min(max(row, 0), max(self.rows - self.window, 0))
+        col0 = min(max(col, 0), max(self.cols - self.window, 0))
+        row0, col0 = row0 // size * size, col0 // size * size
+        return (
+            row0,
+            col0,
+            min(row0 + self.window + size, self.rows),
+            min(col0 + self.window + size, self.cols),
+        )
+
+    def table(self, area: tuple[int, int, int, int]) -> np.ndarray:
+        table = self.tables.get(area)
+        if table is not None:
+            self.tables.move_to_end(area)
+            return table
+
+        blocked = (~self.map.region(*area)).astype(np.int32)
+        table = np.zeros(
+            (blocked.shape[0] + 1, blocked.shape[1] + 1), np.int32
+        )
+        table[1:, 1:] = blocked.cumsum(0).cumsum(1)
+
+        self.tables[area] = table
+        if len(self.tables) > self.max_areas:
+            evicted, _ = self.tables.popitem(last=False)
+            self.pools = {
+                key: pool
+                for key, pool in self.pools.items()
+                if key[1] != evicted
+            }
+        return table
+
+    def tile_span(self, rect: pg.Rect) -> tuple[int, int, int, int]:
+        return (
+            max(0, rect.top // self.tile_y),
+            max(0, rect.left // self.tile_x),
+            min(self.rows - 1, (rect.bottom - 1) // self.tile_y),
+            min(self.cols - 1, (rect.right - 1) // self.tile_x),
+        )
+
+    def is_walkable(self, rect: pg.Rect) -> bool:
+        rect = pg.Rect(rect).clamp(self.bounds)
+        if rect.width <= 0 or rect.height <= 0:
+            return True
+
+        row0, col0, row1, col1 = self.tile_span(rect)
+        return bool(self.map.region(row0, col0, row1 + 1, col1 + 1).all())
+
+    def _axis_classes(
+        self,
+        low: int,
+        high: int,
+        length: int,
+        tile: int,
+        start: int,
+        stop: int,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        coords = np.arange(low, high + 1)
+        first = np.clip(coords // tile, start, stop - 1) - start
+        last = np.clip((coords + length - 1) // tile, start, stop - 1) - start
+
+        limit = stop - start
+        keys = first * limit + last
+        change = np.flatnonzero(np.diff(keys)) + 1
+        starts = np.concatenate(([0], change))
+        counts = np.diff(np.concatenate((starts, [len(coords)])))
+
+        return coords[starts], counts, first[starts], last[starts]
+
+    def _pool(
+        self, size: Point, area: tuple[int, int, int, int]
+    ) -> dict[str, np.ndarray]:
+        key = (int(size[0]), int(size[1])), area
+        if key in self.pools:
+            return self.pools[key]
+
+        w, h = key[0]
+        row0, col0, row1, col1 = area
+        bounds = self.bounds.clip(
+            col0 * self.tile_x,
+            row0 * self.tile_y,
+            (col1 - col0) * self.tile_x,
+            (row1 - row0) * self.tile_y,
+        )
+        x_start, x_count, first_col, last_col = self._axis_classes(
+            bounds.left + w, bounds.right - w, w, self.tile_x, col0, col1
+        )
+        y_start, y_count, first_row, last_row = self._axis_classes(
+            bounds.top + h, bounds.bottom - h, h, self.tile_y, row0, row1
+        )
+
+        table = self.table(area)
+        blocked = (
+            table[last_row[:, None] + 1, last_col[None, :] + 1]
+            - table[first_row[:, None], last_col[None, :] + 1]
+            - table[last_row[:, None] + 1, first_col[None, :]]
+            + table[first_row[:, None], first_col[None, :]]
+        )
+        weights = (y_count[:, None] * x_count[None, :]) * (blocked == 0)
+        weights = weights.ravel().astype(np.float64)
+
+        total = weights.sum()
+        if total == 0:
+            raise ValueError(f"No walkable position fits size {key[0]}")
+
+        pool = {
+            "x_start": x_start,
+            "x_count": x_count,
+            "y_start": y_start,
+            "y_count": y_count,
+            "cdf": np.cumsum(weights / total),
+        }
+        self.pools[key] = pool
+        return pool
+
+    def sample(
+        self, size: Point, k: int = 1, point: Point | None = None
+    ) -> np.ndarray:
+        pool = self._pool(size, self.area_of(point))
+        cls = np.searchsorted(pool["cdf"], self.rng.random(k), side="right")
+        cls = np.minimum(cls, len(pool["cdf"]) - 1)
+        y_cls, x_cls = np.divmod(cls, len(pool["x_start"]))
+
+        xs = pool["x_start"][x_cls] + self.rng.integers(
+            0, pool["x_count"][x_cls]
+        )
+        ys = pool["y_start"][y_cls] + self.rng.integers(
+            0, pool["y_count"][y_cls]
+        )
+        return np.stack((xs, ys), axis=1)
+
+    def random_positions(
+        self,
+        point: Point,
+        size: Point,
+        radius: float,
+        k: int = 1,
+        attempts: int = 8,
+    ) -> np.ndarray:
+        found = np.empty((0, 2), np.int64)
+        batch = max(k * 4, 64)
+        for _ in range(attempts):
+            candidates = self.sample(size, batch, point)
+            dist = np.hypot(
+                candidates[:, 0] - point[0], candidates[:, 1] - point[1]
+            )
+            found = np.concatenate((found, candidates[dist >= radius]))
+            if len(found) >= k:
+                return found[:k]
+
+        dist = np.hypot(
+            candidates[:, 0] - point[0], candidates[:, 1] - point[1]
+        )
+        fallback = candidates[np.argsort(-dist)]
+        return np.concatenate((found, fallback))[:k]
+
+    def random_position(
+        self, point: Point, size: Point, radius: float
+    ) -> tuple[int, int]:
+        x, y = self.random_positions(point, size, radius, 1)[0]
+        return int(x), int(y)